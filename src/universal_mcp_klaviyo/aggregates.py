@@ -0,0 +1,166 @@
+from datetime import datetime, timedelta
+from typing import Any
+
+from universal_mcp_klaviyo.reporting import ReportTable
+from universal_mcp_klaviyo.utils import (
+    RateLimiter,
+    call_with_retry,
+    next_cursor,
+    run_concurrently,
+)
+
+MAX_PAGE_SIZE = 500
+MAX_BY_DIMENSIONS = 2
+MAX_TIMEFRAME = timedelta(days=365)
+
+
+def _windows(start: datetime, end: datetime) -> list[tuple[datetime, datetime]]:
+    windows = []
+    while start < end:
+        windows.append((start, min(start + MAX_TIMEFRAME, end)))
+        start = windows[-1][1]
+    return windows
+
+
+class AggregatePlanner:
+    """
+    Answers metrics x groupings x intervals questions with the fewest
+    `query_metric_aggregates` calls.
+
+    One call is planned per metric, grouping, interval and timeframe window of at most a
+    year; all requested measurements share that call. Calls run concurrently under the
+    metric aggregates rate tier and every page of each is collected into a single
+    long-format `ReportTable` with `metric_id`, `interval`, `date` and one grouping
+    column per dimension.
+
+    Args:
+        app: The KlaviyoApp instance to query through.
+        tier: Klaviyo rate tier of the metric aggregates endpoint.
+        max_workers: Maximum number of calls in flight.
+    """
+
+    def __init__(self, app: Any, tier: str = "S", max_workers: int = 4) -> None:
+        self.app = app
+        self.limiter = RateLimiter.for_tier(tier)
+        self.max_workers = max_workers
+
+    def plan(
+        self,
+        metrics: list[str],
+        measurements: list[str],
+        start: datetime,
+        end: datetime,
+        groupings: list[list[str]] | None = None,
+        intervals: list[str] | None = None,
+        filters: list[str] | None = None,
+        timezone: str = "UTC",
+    ) -> list[dict[str, Any]]:
+        """
+        Splits a high-level request into legal `query_metric_aggregates` request bodies.
+
+        Args:
+            metrics: Metric ids to aggregate.
+            measurements: Measurements to compute, e.g. ["count", "unique",
+                "sum_value"].
+            start: Start of the timeframe (inclusive).
+            end: End of the timeframe (exclusive).
+            groupings: Dimension lists to partition by, e.g. [["$attributed_channel"],
+                ["URL"]]. Each list becomes its own call. Defaults to a single ungrouped
+                call.
+            intervals: Bucket sizes, e.g. ["day", "month"]. Defaults to ["day"].
+            filters: Extra filter expressions added to the timeframe filter.
+            timezone: Timezone used to align intervals.
+
+        Returns:
+            list[dict[str, Any]]: The `data` objects to send, one per call.
+
+        Raises:
+            ValueError: If a grouping has more dimensions than a single call accepts.
+        """
+        unique_groupings: list[list[str]] = []
+        for grouping in groupings or [[]]:
+            if len(grouping) > MAX_BY_DIMENSIONS:
+                raise ValueError(
+                    f"Grouping {grouping} exceeds the {MAX_BY_DIMENSIONS} dimensions "
+                    "allowed per call"
+                )
+            if sorted(grouping) not in (sorted(g) for g in unique_groupings):
+                unique_groupings.append(list(grouping))
+        bodies = []
+        for metric_id in dict.fromkeys(metrics):
+            for interval in dict.fromkeys(intervals or ["day"]):
+                for grouping in unique_groupings:
+                    for window_start, window_end in _windows(start, end):
+                        attributes = {
+                            "metric_id": metric_id,
+                            "measurements": list(dict.fromkeys(measurements)),
+                            "interval": interval,
+                            "page_size": MAX_PAGE_SIZE,
+                            "timezone": timezone,
+                            "filter": [
+                                f"greater-or-equal(datetime,{window_start.isoformat()})",
+                                f"less-than(datetime,{window_end.isoformat()})",
+                                *(filters or []),
+                            ],
+                        }
+                        if grouping:
+                            attributes["by"] = grouping
+                        bodies.append(
+                            {"type": "metric-aggregate", "attributes": attributes}
+                        )
+        return bodies
+
+    def run(
+        self,
+        metrics: list[str],
+        measurements: list[str],
+        start: datetime,
+        end: datetime,
+        groupings: list[list[str]] | None = None,
+        intervals: list[str] | None = None,
+        filters: list[str] | None = None,
+        timezone: str = "UTC",
+    ) -> ReportTable:
+        """
+        Plans and executes the request, see `plan` for the arguments.
+
+        Returns:
+            ReportTable: One row per metric, interval, date and dimension combination.
+        """
+        bodies = self.plan(
+            metrics, measurements, start, end, groupings, intervals, filters, timezone
+        )
+        results = run_concurrently(
+            self._execute, bodies, self.max_workers, self.limiter
+        )
+        return ReportTable.concat([ReportTable.from_results(rows) for rows in results])
+
+    def _execute(self, body: dict[str, Any]) -> list[dict[str, Any]]:
+        attributes = body["attributes"]
+        dimensions = attributes.get("by") or []
+        rows = []
+        while True:
+            document = call_with_retry(self.app.query_metric_aggregates, data=body)
+            result = document["data"]["attributes"]
+            dates = result.get("dates") or []
+            for entry in result.get("data") or []:
+                groupings = {
+                    "metric_id": attributes["metric_id"],
+                    "interval": attributes["interval"],
+                    **dict(zip(dimensions, entry.get("dimensions") or [])),
+                }
+                measurements = entry.get("measurements") or {}
+                for i, date in enumerate(dates):
+                    rows.append(
+                        {
+                            "groupings": {**groupings, "date": date},
+                            "statistics": {
+                                name: values[i] for name, values in measurements.items()
+                            },
+                        }
+                    )
+            cursor = next_cursor(document)
+            if cursor is None:
+                return rows
+            body = {**body, "attributes": {**attributes, "page_cursor": cursor}}
+            self.limiter.acquire()
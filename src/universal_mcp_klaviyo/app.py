@@ -1,11 +1,18 @@
+import mimetypes
+import os
+import time
 from typing import Any
 from universal_mcp.applications import APIApplication
 from universal_mcp.integrations import Integration
 
+from universal_mcp_klaviyo.replica import COLLECTIONS, MetadataReplica
+
 class KlaviyoApp(APIApplication):
-    def __init__(self, integration: Integration = None, **kwargs) -> None:
+    def __init__(self, integration: Integration = None, replica_path: str = ":memory:", **kwargs) -> None:
         super().__init__(name='klaviyo', integration=integration, **kwargs)
         self.base_url = "https://a.klaviyo.com"
+        self.replica_path = replica_path
+        self._replica = None
 
 
     def _get_headers(self):
@@ -21,7 +28,27 @@ class KlaviyoApp(APIApplication):
             "Accept": "application/json",
             "revision": "2024-07-15",
         }
-      
+
+    def _delete(self, url, params=None, data=None):
+        """
+        DELETE request that, unlike the base implementation, can carry a JSON body
+        as required by Klaviyo's relationship endpoints.
+        """
+        if data is None:
+            return super()._delete(url, params=params)
+        response = self.client.request("DELETE", url, json=data, params=params, timeout=self.default_timeout)
+        response.raise_for_status()
+        return response
+
+    def _handle_response(self, response):
+        """
+        Decodes a JSON response body. Relationship updates, deletes and bulk job
+        submissions return no content, for which None is returned.
+        """
+        if not response.content:
+            return None
+        return response.json()
+
     def create_client_review(self, company_id=None, data=None) -> Any:
         """
         Creates a new client review, requiring a company ID as a query parameter and a revision in the request header.
@@ -93,7 +120,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('company_id', company_id)] if v is not None}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_accounts(self, fields_account=None) -> dict[str, Any]:
         """
@@ -112,7 +139,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[account]', fields_account)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_account(self, id, fields_account=None) -> dict[str, Any]:
         """
@@ -134,7 +161,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[account]', fields_account)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_campaigns(self, fields_campaign_message=None, fields_campaign=None, fields_tag=None, filter=None, include=None, page_cursor=None, sort=None) -> dict[str, Any]:
         """
@@ -159,7 +186,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[campaign-message]', fields_campaign_message), ('fields[campaign]', fields_campaign), ('fields[tag]', fields_tag), ('filter', filter), ('include', include), ('page[cursor]', page_cursor), ('sort', sort)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def create_campaign(self, data=None) -> dict[str, Any]:
         """
@@ -285,7 +312,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_campaign(self, id, fields_campaign_message=None, fields_campaign=None, fields_tag=None, include=None) -> dict[str, Any]:
         """
@@ -310,7 +337,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[campaign-message]', fields_campaign_message), ('fields[campaign]', fields_campaign), ('fields[tag]', fields_tag), ('include', include)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def delete_campaign(self, id) -> Any:
         """
@@ -331,7 +358,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._delete(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def update_campaign(self, id, data=None) -> dict[str, Any]:
         """
@@ -405,7 +432,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._patch(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_campaign_recipient_estimation(self, id, fields_campaign_recipient_estimation=None) -> dict[str, Any]:
         """
@@ -427,7 +454,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[campaign-recipient-estimation]', fields_campaign_recipient_estimation)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def create_campaign_clone(self, data=None) -> dict[str, Any]:
         """
@@ -462,7 +489,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_tags_for_campaign(self, id, fields_tag=None) -> dict[str, Any]:
         """
@@ -484,7 +511,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[tag]', fields_tag)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_tag_ids_for_campaign(self, id) -> dict[str, Any]:
         """
@@ -505,7 +532,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_messages_for_campaign(self, id, fields_campaign_message=None, fields_campaign=None, fields_image=None, fields_template=None, include=None) -> dict[str, Any]:
         """
@@ -531,7 +558,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[campaign-message]', fields_campaign_message), ('fields[campaign]', fields_campaign), ('fields[image]', fields_image), ('fields[template]', fields_template), ('include', include)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_message_ids_for_campaign(self, id) -> dict[str, Any]:
         """
@@ -552,7 +579,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_campaign_message(self, id, fields_campaign_message=None, fields_campaign=None, fields_image=None, fields_template=None, include=None) -> dict[str, Any]:
         """
@@ -578,7 +605,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[campaign-message]', fields_campaign_message), ('fields[campaign]', fields_campaign), ('fields[image]', fields_image), ('fields[template]', fields_template), ('include', include)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def update_campaign_message(self, id, data=None) -> dict[str, Any]:
         """
@@ -636,7 +663,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._patch(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def assign_template_to_campaign_message(self, data=None) -> dict[str, Any]:
         """
@@ -676,7 +703,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_campaign_for_campaign_message(self, id, fields_campaign=None) -> dict[str, Any]:
         """
@@ -698,7 +725,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[campaign]', fields_campaign)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_campaign_id_for_campaign_message(self, id) -> dict[str, Any]:
         """
@@ -719,7 +746,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_template_for_campaign_message(self, id, fields_template=None) -> dict[str, Any]:
         """
@@ -741,7 +768,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[template]', fields_template)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_template_id_for_campaign_message(self, id) -> dict[str, Any]:
         """
@@ -762,7 +789,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_image_for_campaign_message(self, id, fields_image=None) -> dict[str, Any]:
         """
@@ -784,7 +811,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[image]', fields_image)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_image_id_for_campaign_message(self, id) -> dict[str, Any]:
         """
@@ -805,7 +832,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def update_image_for_campaign_message(self, id, data=None) -> Any:
         """
@@ -840,7 +867,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._patch(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_campaign_send_job(self, id, fields_campaign_send_job=None) -> dict[str, Any]:
         """
@@ -862,7 +889,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[campaign-send-job]', fields_campaign_send_job)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def cancel_campaign_send(self, id, data=None) -> Any:
         """
@@ -900,7 +927,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._patch(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_campaign_recipient_estimation_job(self, id, fields_campaign_recipient_estimation_job=None) -> dict[str, Any]:
         """
@@ -922,7 +949,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[campaign-recipient-estimation-job]', fields_campaign_recipient_estimation_job)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def send_campaign(self, data=None) -> dict[str, Any]:
         """
@@ -954,7 +981,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def refresh_campaign_recipient_estimation(self, data=None) -> dict[str, Any]:
         """
@@ -986,7 +1013,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_catalog_items(self, fields_catalog_item=None, fields_catalog_variant=None, filter=None, include=None, page_cursor=None, sort=None) -> dict[str, Any]:
         """
@@ -1010,7 +1037,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[catalog-item]', fields_catalog_item), ('fields[catalog-variant]', fields_catalog_variant), ('filter', filter), ('include', include), ('page[cursor]', page_cursor), ('sort', sort)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def create_catalog_item(self, data=None) -> dict[str, Any]:
         """
@@ -1072,7 +1099,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_catalog_item(self, id, fields_catalog_item=None, fields_catalog_variant=None, include=None) -> dict[str, Any]:
         """
@@ -1096,7 +1123,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[catalog-item]', fields_catalog_item), ('fields[catalog-variant]', fields_catalog_variant), ('include', include)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def delete_catalog_item(self, id) -> Any:
         """
@@ -1117,7 +1144,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._delete(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def update_catalog_item(self, id, data=None) -> dict[str, Any]:
         """
@@ -1180,7 +1207,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._patch(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_bulk_create_catalog_items_jobs(self, fields_catalog_item_bulk_create_job=None, filter=None, page_cursor=None) -> dict[str, Any]:
         """
@@ -1201,7 +1228,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[catalog-item-bulk-create-job]', fields_catalog_item_bulk_create_job), ('filter', filter), ('page[cursor]', page_cursor)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def bulk_create_catalog_items(self, data=None) -> dict[str, Any]:
         """
@@ -1306,7 +1333,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_bulk_create_catalog_items_job(self, job_id, fields_catalog_item_bulk_create_job=None, fields_catalog_item=None, include=None) -> dict[str, Any]:
         """
@@ -1330,7 +1357,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[catalog-item-bulk-create-job]', fields_catalog_item_bulk_create_job), ('fields[catalog-item]', fields_catalog_item), ('include', include)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_bulk_update_catalog_items_jobs(self, fields_catalog_item_bulk_update_job=None, filter=None, page_cursor=None) -> dict[str, Any]:
         """
@@ -1351,7 +1378,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[catalog-item-bulk-update-job]', fields_catalog_item_bulk_update_job), ('filter', filter), ('page[cursor]', page_cursor)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def bulk_update_catalog_items(self, data=None) -> dict[str, Any]:
         """
@@ -1452,7 +1479,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_bulk_update_catalog_items_job(self, job_id, fields_catalog_item_bulk_update_job=None, fields_catalog_item=None, include=None) -> dict[str, Any]:
         """
@@ -1476,7 +1503,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[catalog-item-bulk-update-job]', fields_catalog_item_bulk_update_job), ('fields[catalog-item]', fields_catalog_item), ('include', include)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_bulk_delete_catalog_items_jobs(self, fields_catalog_item_bulk_delete_job=None, filter=None, page_cursor=None) -> dict[str, Any]:
         """
@@ -1497,7 +1524,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[catalog-item-bulk-delete-job]', fields_catalog_item_bulk_delete_job), ('filter', filter), ('page[cursor]', page_cursor)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def bulk_delete_catalog_items(self, data=None) -> dict[str, Any]:
         """
@@ -1542,7 +1569,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_bulk_delete_catalog_items_job(self, job_id, fields_catalog_item_bulk_delete_job=None) -> dict[str, Any]:
         """
@@ -1564,7 +1591,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[catalog-item-bulk-delete-job]', fields_catalog_item_bulk_delete_job)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_items_for_catalog_category(self, id, fields_catalog_item=None, fields_catalog_variant=None, filter=None, include=None, page_cursor=None, sort=None) -> dict[str, Any]:
         """
@@ -1591,7 +1618,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[catalog-item]', fields_catalog_item), ('fields[catalog-variant]', fields_catalog_variant), ('filter', filter), ('include', include), ('page[cursor]', page_cursor), ('sort', sort)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_category_ids_for_catalog_item(self, id, filter=None, page_cursor=None, sort=None) -> dict[str, Any]:
         """
@@ -1615,7 +1642,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('filter', filter), ('page[cursor]', page_cursor), ('sort', sort)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def add_categories_to_catalog_item(self, id, data=None) -> Any:
         """
@@ -1656,7 +1683,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def remove_categories_from_catalog_item(self, id, data=None) -> Any:
         """
@@ -1695,9 +1722,9 @@ class KlaviyoApp(APIApplication):
         request_body = {k: v for k, v in request_body.items() if v is not None}
         url = f"{self.base_url}/api/catalog-items/{id}/relationships/categories"
         query_params = {}
-        response = self._delete(url, params=query_params)
+        response = self._delete(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def update_categories_for_catalog_item(self, id, data=None) -> Any:
         """
@@ -1738,7 +1765,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._patch(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_catalog_variants(self, fields_catalog_variant=None, filter=None, page_cursor=None, sort=None) -> dict[str, Any]:
         """
@@ -1760,7 +1787,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[catalog-variant]', fields_catalog_variant), ('filter', filter), ('page[cursor]', page_cursor), ('sort', sort)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def create_catalog_variant(self, data=None) -> dict[str, Any]:
         """
@@ -1819,7 +1846,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_catalog_variant(self, id, fields_catalog_variant=None) -> dict[str, Any]:
         """
@@ -1841,7 +1868,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[catalog-variant]', fields_catalog_variant)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def delete_catalog_variant(self, id) -> Any:
         """
@@ -1862,7 +1889,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._delete(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def update_catalog_variant(self, id, data=None) -> dict[str, Any]:
         """
@@ -1914,7 +1941,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._patch(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_create_variants_jobs(self, fields_catalog_variant_bulk_create_job=None, filter=None, page_cursor=None) -> dict[str, Any]:
         """
@@ -1935,7 +1962,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[catalog-variant-bulk-create-job]', fields_catalog_variant_bulk_create_job), ('filter', filter), ('page[cursor]', page_cursor)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def bulk_create_catalog_variants(self, data=None) -> dict[str, Any]:
         """
@@ -2034,7 +2061,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_create_variants_job(self, job_id, fields_catalog_variant_bulk_create_job=None, fields_catalog_variant=None, include=None) -> dict[str, Any]:
         """
@@ -2058,7 +2085,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[catalog-variant-bulk-create-job]', fields_catalog_variant_bulk_create_job), ('fields[catalog-variant]', fields_catalog_variant), ('include', include)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_update_variants_jobs(self, fields_catalog_variant_bulk_update_job=None, filter=None, page_cursor=None) -> dict[str, Any]:
         """
@@ -2079,7 +2106,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[catalog-variant-bulk-update-job]', fields_catalog_variant_bulk_update_job), ('filter', filter), ('page[cursor]', page_cursor)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def bulk_update_catalog_variants(self, data=None) -> dict[str, Any]:
         """
@@ -2158,7 +2185,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_update_variants_job(self, job_id, fields_catalog_variant_bulk_update_job=None, fields_catalog_variant=None, include=None) -> dict[str, Any]:
         """
@@ -2182,7 +2209,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[catalog-variant-bulk-update-job]', fields_catalog_variant_bulk_update_job), ('fields[catalog-variant]', fields_catalog_variant), ('include', include)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_delete_variants_jobs(self, fields_catalog_variant_bulk_delete_job=None, filter=None, page_cursor=None) -> dict[str, Any]:
         """
@@ -2203,7 +2230,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[catalog-variant-bulk-delete-job]', fields_catalog_variant_bulk_delete_job), ('filter', filter), ('page[cursor]', page_cursor)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def bulk_delete_catalog_variants(self, data=None) -> dict[str, Any]:
         """
@@ -2248,7 +2275,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_delete_variants_job(self, job_id, fields_catalog_variant_bulk_delete_job=None) -> dict[str, Any]:
         """
@@ -2270,7 +2297,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[catalog-variant-bulk-delete-job]', fields_catalog_variant_bulk_delete_job)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_variants_for_catalog_item(self, id, fields_catalog_variant=None, filter=None, page_cursor=None, sort=None) -> dict[str, Any]:
         """
@@ -2295,7 +2322,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[catalog-variant]', fields_catalog_variant), ('filter', filter), ('page[cursor]', page_cursor), ('sort', sort)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_variant_ids_for_catalog_item(self, id, filter=None, page_cursor=None, sort=None) -> dict[str, Any]:
         """
@@ -2319,7 +2346,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('filter', filter), ('page[cursor]', page_cursor), ('sort', sort)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_catalog_categories(self, fields_catalog_category=None, filter=None, page_cursor=None, sort=None) -> dict[str, Any]:
         """
@@ -2341,7 +2368,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[catalog-category]', fields_catalog_category), ('filter', filter), ('page[cursor]', page_cursor), ('sort', sort)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def create_catalog_category(self, data=None) -> dict[str, Any]:
         """
@@ -2392,7 +2419,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_catalog_category(self, id, fields_catalog_category=None) -> dict[str, Any]:
         """
@@ -2414,7 +2441,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[catalog-category]', fields_catalog_category)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def delete_catalog_category(self, id) -> Any:
         """
@@ -2435,7 +2462,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._delete(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def update_catalog_category(self, id, data=None) -> dict[str, Any]:
         """
@@ -2487,7 +2514,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._patch(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_create_categories_jobs(self, fields_catalog_category_bulk_create_job=None, filter=None, page_cursor=None) -> dict[str, Any]:
         """
@@ -2508,7 +2535,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[catalog-category-bulk-create-job]', fields_catalog_category_bulk_create_job), ('filter', filter), ('page[cursor]', page_cursor)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def bulk_create_catalog_categories(self, data=None) -> dict[str, Any]:
         """
@@ -2591,7 +2618,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_create_categories_job(self, job_id, fields_catalog_category_bulk_create_job=None, fields_catalog_category=None, include=None) -> dict[str, Any]:
         """
@@ -2615,7 +2642,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[catalog-category-bulk-create-job]', fields_catalog_category_bulk_create_job), ('fields[catalog-category]', fields_catalog_category), ('include', include)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_update_categories_jobs(self, fields_catalog_category_bulk_update_job=None, filter=None, page_cursor=None) -> dict[str, Any]:
         """
@@ -2636,7 +2663,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[catalog-category-bulk-update-job]', fields_catalog_category_bulk_update_job), ('filter', filter), ('page[cursor]', page_cursor)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def bulk_update_catalog_categories(self, data=None) -> dict[str, Any]:
         """
@@ -2715,7 +2742,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_update_categories_job(self, job_id, fields_catalog_category_bulk_update_job=None, fields_catalog_category=None, include=None) -> dict[str, Any]:
         """
@@ -2739,7 +2766,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[catalog-category-bulk-update-job]', fields_catalog_category_bulk_update_job), ('fields[catalog-category]', fields_catalog_category), ('include', include)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_delete_categories_jobs(self, fields_catalog_category_bulk_delete_job=None, filter=None, page_cursor=None) -> dict[str, Any]:
         """
@@ -2760,7 +2787,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[catalog-category-bulk-delete-job]', fields_catalog_category_bulk_delete_job), ('filter', filter), ('page[cursor]', page_cursor)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def bulk_delete_catalog_categories(self, data=None) -> dict[str, Any]:
         """
@@ -2805,7 +2832,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_delete_categories_job(self, job_id, fields_catalog_category_bulk_delete_job=None) -> dict[str, Any]:
         """
@@ -2827,7 +2854,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[catalog-category-bulk-delete-job]', fields_catalog_category_bulk_delete_job)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_item_ids_for_catalog_category(self, id, filter=None, page_cursor=None, sort=None) -> dict[str, Any]:
         """
@@ -2851,7 +2878,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('filter', filter), ('page[cursor]', page_cursor), ('sort', sort)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def add_items_to_catalog_category(self, id, data=None) -> Any:
         """
@@ -2892,7 +2919,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def remove_items_from_catalog_category(self, id, data=None) -> Any:
         """
@@ -2931,9 +2958,9 @@ class KlaviyoApp(APIApplication):
         request_body = {k: v for k, v in request_body.items() if v is not None}
         url = f"{self.base_url}/api/catalog-categories/{id}/relationships/items"
         query_params = {}
-        response = self._delete(url, params=query_params)
+        response = self._delete(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def update_items_for_catalog_category(self, id, data=None) -> Any:
         """
@@ -2974,7 +3001,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._patch(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_categories_for_catalog_item(self, id, fields_catalog_category=None, filter=None, page_cursor=None, sort=None) -> dict[str, Any]:
         """
@@ -2999,7 +3026,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[catalog-category]', fields_catalog_category), ('filter', filter), ('page[cursor]', page_cursor), ('sort', sort)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def create_back_in_stock_subscription(self, data=None) -> Any:
         """
@@ -3056,7 +3083,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def create_client_subscription(self, company_id=None, data=None) -> Any:
         """
@@ -3156,7 +3183,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('company_id', company_id)] if v is not None}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def create_or_update_client_push_token(self, company_id=None, data=None) -> Any:
         """
@@ -3248,7 +3275,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('company_id', company_id)] if v is not None}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def unregister_client_push_token(self, company_id=None, data=None) -> Any:
         """
@@ -3324,7 +3351,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('company_id', company_id)] if v is not None}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def create_client_event(self, company_id=None, data=None) -> Any:
         """
@@ -3411,7 +3438,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('company_id', company_id)] if v is not None}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def create_or_update_client_profile(self, company_id=None, data=None) -> Any:
         """
@@ -3477,7 +3504,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('company_id', company_id)] if v is not None}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def bulk_create_client_events(self, company_id=None, data=None) -> Any:
         """
@@ -3592,7 +3619,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('company_id', company_id)] if v is not None}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def create_client_back_in_stock_subscription(self, company_id=None, data=None) -> Any:
         """
@@ -3650,7 +3677,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('company_id', company_id)] if v is not None}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_coupons(self, fields_coupon=None, page_cursor=None) -> dict[str, Any]:
         """
@@ -3670,7 +3697,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[coupon]', fields_coupon), ('page[cursor]', page_cursor)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def create_coupon(self, data=None) -> dict[str, Any]:
         """
@@ -3705,7 +3732,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_coupon(self, id, fields_coupon=None) -> dict[str, Any]:
         """
@@ -3727,7 +3754,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[coupon]', fields_coupon)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def delete_coupon(self, id) -> Any:
         """
@@ -3748,7 +3775,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._delete(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def update_coupon(self, id, data=None) -> dict[str, Any]:
         """
@@ -3786,7 +3813,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._patch(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_coupon_codes(self, fields_coupon_code=None, fields_coupon=None, filter=None, include=None, page_cursor=None) -> dict[str, Any]:
         """
@@ -3809,7 +3836,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[coupon-code]', fields_coupon_code), ('fields[coupon]', fields_coupon), ('filter', filter), ('include', include), ('page[cursor]', page_cursor)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def create_coupon_code(self, data=None) -> dict[str, Any]:
         """
@@ -3852,7 +3879,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_coupon_code(self, id, fields_coupon_code=None, fields_coupon=None, include=None) -> dict[str, Any]:
         """
@@ -3876,7 +3903,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[coupon-code]', fields_coupon_code), ('fields[coupon]', fields_coupon), ('include', include)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def delete_coupon_code(self, id) -> Any:
         """
@@ -3897,7 +3924,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._delete(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def update_coupon_code(self, id, data=None) -> dict[str, Any]:
         """
@@ -3936,7 +3963,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._patch(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_bulk_create_coupon_code_jobs(self, fields_coupon_code_bulk_create_job=None, filter=None, page_cursor=None) -> dict[str, Any]:
         """
@@ -3957,7 +3984,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[coupon-code-bulk-create-job]', fields_coupon_code_bulk_create_job), ('filter', filter), ('page[cursor]', page_cursor)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def bulk_create_coupon_codes(self, data=None) -> dict[str, Any]:
         """
@@ -4024,7 +4051,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_bulk_create_coupon_codes_job(self, job_id, fields_coupon_code_bulk_create_job=None, fields_coupon_code=None, include=None) -> dict[str, Any]:
         """
@@ -4048,7 +4075,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[coupon-code-bulk-create-job]', fields_coupon_code_bulk_create_job), ('fields[coupon-code]', fields_coupon_code), ('include', include)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_coupon_for_coupon_code(self, id, fields_coupon=None) -> dict[str, Any]:
         """
@@ -4070,7 +4097,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[coupon]', fields_coupon)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_coupon_id_for_coupon_code(self, id) -> dict[str, Any]:
         """
@@ -4091,7 +4118,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_coupon_codes_for_coupon(self, id, fields_coupon_code=None, filter=None, page_cursor=None) -> dict[str, Any]:
         """
@@ -4115,7 +4142,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[coupon-code]', fields_coupon_code), ('filter', filter), ('page[cursor]', page_cursor)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_coupon_code_ids_for_coupon(self, id, filter=None, page_cursor=None) -> dict[str, Any]:
         """
@@ -4138,7 +4165,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('filter', filter), ('page[cursor]', page_cursor)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def request_profile_deletion(self, data=None) -> Any:
         """
@@ -4181,7 +4208,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_events(self, fields_event=None, fields_metric=None, fields_profile=None, filter=None, include=None, page_cursor=None, sort=None) -> dict[str, Any]:
         """
@@ -4206,7 +4233,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[event]', fields_event), ('fields[metric]', fields_metric), ('fields[profile]', fields_profile), ('filter', filter), ('include', include), ('page[cursor]', page_cursor), ('sort', sort)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def create_event(self, data=None) -> Any:
         """
@@ -4292,7 +4319,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_event(self, id, fields_event=None, fields_metric=None, fields_profile=None, include=None) -> dict[str, Any]:
         """
@@ -4317,7 +4344,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[event]', fields_event), ('fields[metric]', fields_metric), ('fields[profile]', fields_profile), ('include', include)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def bulk_create_events(self, data=None) -> Any:
         """
@@ -4526,7 +4553,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_metric_for_event(self, id, fields_metric=None) -> dict[str, Any]:
         """
@@ -4548,7 +4575,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[metric]', fields_metric)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_metric_id_for_event(self, id) -> dict[str, Any]:
         """
@@ -4569,7 +4596,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_profile_for_event(self, id, additional_fields_profile=None, fields_profile=None) -> dict[str, Any]:
         """
@@ -4592,7 +4619,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('additional-fields[profile]', additional_fields_profile), ('fields[profile]', fields_profile)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_profile_id_for_event(self, id) -> dict[str, Any]:
         """
@@ -4613,7 +4640,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_flows(self, fields_flow_action=None, fields_flow=None, fields_tag=None, filter=None, include=None, page_cursor=None, page_size=None, sort=None) -> dict[str, Any]:
         """
@@ -4639,7 +4666,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[flow-action]', fields_flow_action), ('fields[flow]', fields_flow), ('fields[tag]', fields_tag), ('filter', filter), ('include', include), ('page[cursor]', page_cursor), ('page[size]', page_size), ('sort', sort)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def create_flow(self, additional_fields_flow=None, data=None) -> dict[str, Any]:
         """
@@ -4753,7 +4780,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('additional-fields[flow]', additional_fields_flow)] if v is not None}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_flow(self, id, additional_fields_flow=None, fields_flow_action=None, fields_flow=None, fields_tag=None, include=None) -> dict[str, Any]:
         """
@@ -4779,7 +4806,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('additional-fields[flow]', additional_fields_flow), ('fields[flow-action]', fields_flow_action), ('fields[flow]', fields_flow), ('fields[tag]', fields_tag), ('include', include)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def delete_flow(self, id) -> Any:
         """
@@ -4800,7 +4827,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._delete(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def update_flow_status(self, id, data=None) -> dict[str, Any]:
         """
@@ -4838,7 +4865,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._patch(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_flow_action(self, id, fields_flow_action=None, fields_flow_message=None, fields_flow=None, include=None) -> dict[str, Any]:
         """
@@ -4863,7 +4890,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[flow-action]', fields_flow_action), ('fields[flow-message]', fields_flow_message), ('fields[flow]', fields_flow), ('include', include)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_flow_message(self, id, fields_flow_action=None, fields_flow_message=None, fields_template=None, include=None) -> dict[str, Any]:
         """
@@ -4888,7 +4915,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[flow-action]', fields_flow_action), ('fields[flow-message]', fields_flow_message), ('fields[template]', fields_template), ('include', include)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_actions_for_flow(self, id, fields_flow_action=None, filter=None, page_cursor=None, page_size=None, sort=None) -> dict[str, Any]:
         """
@@ -4914,7 +4941,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[flow-action]', fields_flow_action), ('filter', filter), ('page[cursor]', page_cursor), ('page[size]', page_size), ('sort', sort)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_action_ids_for_flow(self, id, filter=None, page_cursor=None, page_size=None, sort=None) -> dict[str, Any]:
         """
@@ -4939,7 +4966,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('filter', filter), ('page[cursor]', page_cursor), ('page[size]', page_size), ('sort', sort)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_tags_for_flow(self, id, fields_tag=None) -> dict[str, Any]:
         """
@@ -4961,7 +4988,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[tag]', fields_tag)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_tag_ids_for_flow(self, id) -> dict[str, Any]:
         """
@@ -4982,7 +5009,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_flow_for_flow_action(self, id, fields_flow=None) -> dict[str, Any]:
         """
@@ -5004,7 +5031,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[flow]', fields_flow)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_flow_id_for_flow_action(self, id) -> dict[str, Any]:
         """
@@ -5025,7 +5052,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_messages_for_flow_action(self, id, fields_flow_message=None, filter=None, page_cursor=None, page_size=None, sort=None) -> dict[str, Any]:
         """
@@ -5051,7 +5078,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[flow-message]', fields_flow_message), ('filter', filter), ('page[cursor]', page_cursor), ('page[size]', page_size), ('sort', sort)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_message_ids_for_flow_action(self, id, filter=None, page_cursor=None, page_size=None, sort=None) -> dict[str, Any]:
         """
@@ -5076,7 +5103,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('filter', filter), ('page[cursor]', page_cursor), ('page[size]', page_size), ('sort', sort)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_action_for_flow_message(self, id, fields_flow_action=None) -> dict[str, Any]:
         """
@@ -5098,7 +5125,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[flow-action]', fields_flow_action)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_action_id_for_flow_message(self, id) -> dict[str, Any]:
         """
@@ -5119,7 +5146,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_template_for_flow_message(self, id, fields_template=None) -> dict[str, Any]:
         """
@@ -5141,7 +5168,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[template]', fields_template)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_template_id_for_flow_message(self, id) -> dict[str, Any]:
         """
@@ -5162,7 +5189,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_forms(self, fields_form=None, filter=None, page_cursor=None, page_size=None, sort=None) -> dict[str, Any]:
         """
@@ -5185,7 +5212,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[form]', fields_form), ('filter', filter), ('page[cursor]', page_cursor), ('page[size]', page_size), ('sort', sort)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_form(self, id, fields_form_version=None, fields_form=None, include=None) -> dict[str, Any]:
         """
@@ -5209,7 +5236,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[form-version]', fields_form_version), ('fields[form]', fields_form), ('include', include)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_form_version(self, id, fields_form_version=None) -> dict[str, Any]:
         """
@@ -5231,7 +5258,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[form-version]', fields_form_version)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_versions_for_form(self, id, fields_form_version=None, filter=None, page_cursor=None, page_size=None, sort=None) -> dict[str, Any]:
         """
@@ -5257,7 +5284,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[form-version]', fields_form_version), ('filter', filter), ('page[cursor]', page_cursor), ('page[size]', page_size), ('sort', sort)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_version_ids_for_form(self, id, filter=None, page_cursor=None, page_size=None, sort=None) -> dict[str, Any]:
         """
@@ -5282,7 +5309,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('filter', filter), ('page[cursor]', page_cursor), ('page[size]', page_size), ('sort', sort)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_form_for_form_version(self, id, fields_form=None) -> dict[str, Any]:
         """
@@ -5304,7 +5331,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[form]', fields_form)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_form_id_for_form_version(self, id) -> dict[str, Any]:
         """
@@ -5325,7 +5352,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_images(self, fields_image=None, filter=None, page_cursor=None, page_size=None, sort=None) -> dict[str, Any]:
         """
@@ -5348,7 +5375,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[image]', fields_image), ('filter', filter), ('page[cursor]', page_cursor), ('page[size]', page_size), ('sort', sort)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def upload_image_from_url(self, data=None) -> dict[str, Any]:
         """
@@ -5384,7 +5411,35 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
+
+    def upload_image_from_file(self, file, name=None, hidden=None) -> dict[str, Any]:
+        """
+        Uploads an image from a local file or binary file-like object as multipart form data, streaming the body from the file instead of reading it into memory.
+
+        Args:
+            file (string): Path of the image file, or an open binary file-like object.
+            name (string): Name for the image. Defaults to the file name.
+            hidden (boolean): If true, the image is not shown in the image library.
+
+        Returns:
+            dict[str, Any]: Success
+
+        Tags:
+            Images
+        """
+        if file is None:
+            raise ValueError("Missing required parameter 'file'")
+        if isinstance(file, (str, os.PathLike)):
+            with open(file, "rb") as f:
+                return self.upload_image_from_file(f, name=name, hidden=hidden)
+        url = f"{self.base_url}/api/image-upload"
+        form = {k: v for k, v in [('name', name), ('hidden', None if hidden is None else str(bool(hidden)).lower())] if v is not None}
+        filename = os.path.basename(getattr(file, "name", None) or "image")
+        content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        response = self._post(url, data=form, files={'file': (filename, file, content_type)}, content_type="multipart/form-data")
+        response.raise_for_status()
+        return self._handle_response(response)
 
     def get_image(self, id, fields_image=None) -> dict[str, Any]:
         """
@@ -5406,7 +5461,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[image]', fields_image)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def update_image(self, id, data=None) -> dict[str, Any]:
         """
@@ -5445,7 +5500,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._patch(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
 
     def get_lists(self, fields_flow=None, fields_list=None, fields_tag=None, filter=None, include=None, page_cursor=None, sort=None) -> dict[str, Any]:
@@ -5471,7 +5526,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[flow]', fields_flow), ('fields[list]', fields_list), ('fields[tag]', fields_tag), ('filter', filter), ('include', include), ('page[cursor]', page_cursor), ('sort', sort)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def create_list(self, data=None) -> dict[str, Any]:
         """
@@ -5505,7 +5560,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_list(self, id, additional_fields_list=None, fields_flow=None, fields_list=None, fields_tag=None, include=None) -> dict[str, Any]:
         """
@@ -5531,7 +5586,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('additional-fields[list]', additional_fields_list), ('fields[flow]', fields_flow), ('fields[list]', fields_list), ('fields[tag]', fields_tag), ('include', include)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def delete_list(self, id) -> Any:
         """
@@ -5552,7 +5607,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._delete(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def update_list(self, id, data=None) -> dict[str, Any]:
         """
@@ -5590,7 +5645,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._patch(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_tags_for_list(self, id, fields_tag=None) -> dict[str, Any]:
         """
@@ -5612,7 +5667,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[tag]', fields_tag)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_tag_ids_for_list(self, id) -> dict[str, Any]:
         """
@@ -5633,7 +5688,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_profiles_for_list(self, id, additional_fields_profile=None, fields_profile=None, filter=None, page_cursor=None, page_size=None, sort=None) -> dict[str, Any]:
         """
@@ -5660,7 +5715,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('additional-fields[profile]', additional_fields_profile), ('fields[profile]', fields_profile), ('filter', filter), ('page[cursor]', page_cursor), ('page[size]', page_size), ('sort', sort)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_profile_ids_for_list(self, id, filter=None, page_cursor=None, page_size=None, sort=None) -> dict[str, Any]:
         """
@@ -5685,7 +5740,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('filter', filter), ('page[cursor]', page_cursor), ('page[size]', page_size), ('sort', sort)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def add_profiles_to_list(self, id, data=None) -> Any:
         """
@@ -5726,7 +5781,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def remove_profiles_from_list(self, id, data=None) -> Any:
         """
@@ -5765,9 +5820,9 @@ class KlaviyoApp(APIApplication):
         request_body = {k: v for k, v in request_body.items() if v is not None}
         url = f"{self.base_url}/api/lists/{id}/relationships/profiles"
         query_params = {}
-        response = self._delete(url, params=query_params)
+        response = self._delete(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_flows_triggered_by_list(self, id, fields_flow=None) -> dict[str, Any]:
         """
@@ -5789,7 +5844,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[flow]', fields_flow)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_ids_for_flows_triggered_by_list(self, id) -> dict[str, Any]:
         """
@@ -5810,7 +5865,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_metrics(self, fields_flow=None, fields_metric=None, filter=None, include=None, page_cursor=None) -> dict[str, Any]:
         """
@@ -5833,7 +5888,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[flow]', fields_flow), ('fields[metric]', fields_metric), ('filter', filter), ('include', include), ('page[cursor]', page_cursor)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_metric(self, id, fields_flow=None, fields_metric=None, include=None) -> dict[str, Any]:
         """
@@ -5857,7 +5912,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[flow]', fields_flow), ('fields[metric]', fields_metric), ('include', include)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_metric_property(self, id, additional_fields_metric_property=None, fields_metric_property=None, fields_metric=None, include=None) -> dict[str, Any]:
         """
@@ -5882,7 +5937,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('additional-fields[metric-property]', additional_fields_metric_property), ('fields[metric-property]', fields_metric_property), ('fields[metric]', fields_metric), ('include', include)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def query_metric_aggregates(self, data=None) -> dict[str, Any]:
         """
@@ -5937,7 +5992,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_flows_triggered_by_metric(self, id, fields_flow=None) -> dict[str, Any]:
         """
@@ -5959,7 +6014,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[flow]', fields_flow)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_ids_for_flows_triggered_by_metric(self, id) -> dict[str, Any]:
         """
@@ -5980,7 +6035,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_properties_for_metric(self, id, additional_fields_metric_property=None, fields_metric_property=None) -> dict[str, Any]:
         """
@@ -6003,7 +6058,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('additional-fields[metric-property]', additional_fields_metric_property), ('fields[metric-property]', fields_metric_property)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_property_ids_for_metric(self, id) -> dict[str, Any]:
         """
@@ -6024,7 +6079,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_metric_for_metric_property(self, id, fields_metric=None) -> dict[str, Any]:
         """
@@ -6046,7 +6101,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[metric]', fields_metric)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_metric_id_for_metric_property(self, id) -> dict[str, Any]:
         """
@@ -6067,7 +6122,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_profiles(self, additional_fields_profile=None, fields_profile=None, filter=None, page_cursor=None, page_size=None, sort=None) -> dict[str, Any]:
         """
@@ -6091,7 +6146,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('additional-fields[profile]', additional_fields_profile), ('fields[profile]', fields_profile), ('filter', filter), ('page[cursor]', page_cursor), ('page[size]', page_size), ('sort', sort)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def create_profile(self, additional_fields_profile=None, data=None) -> dict[str, Any]:
         """
@@ -6147,7 +6202,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('additional-fields[profile]', additional_fields_profile)] if v is not None}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_profile(self, id, additional_fields_profile=None, fields_list=None, fields_profile=None, fields_segment=None, include=None) -> dict[str, Any]:
         """
@@ -6173,7 +6228,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('additional-fields[profile]', additional_fields_profile), ('fields[list]', fields_list), ('fields[profile]', fields_profile), ('fields[segment]', fields_segment), ('include', include)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def update_profile(self, id, additional_fields_profile=None, data=None) -> dict[str, Any]:
         """
@@ -6241,7 +6296,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('additional-fields[profile]', additional_fields_profile)] if v is not None}
         response = self._patch(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_bulk_suppress_profiles_jobs(self, fields_profile_suppression_bulk_create_job=None, filter=None, page_cursor=None, sort=None) -> dict[str, Any]:
         """
@@ -6263,7 +6318,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[profile-suppression-bulk-create-job]', fields_profile_suppression_bulk_create_job), ('filter', filter), ('page[cursor]', page_cursor), ('sort', sort)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def bulk_suppress_profiles(self, data=None) -> dict[str, Any]:
         """
@@ -6326,7 +6381,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_bulk_suppress_profiles_job(self, job_id, fields_profile_suppression_bulk_create_job=None) -> dict[str, Any]:
         """
@@ -6348,7 +6403,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[profile-suppression-bulk-create-job]', fields_profile_suppression_bulk_create_job)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_bulk_unsuppress_profiles_jobs(self, fields_profile_suppression_bulk_delete_job=None, filter=None, page_cursor=None, sort=None) -> dict[str, Any]:
         """
@@ -6370,7 +6425,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[profile-suppression-bulk-delete-job]', fields_profile_suppression_bulk_delete_job), ('filter', filter), ('page[cursor]', page_cursor), ('sort', sort)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def bulk_unsuppress_profiles(self, data=None) -> dict[str, Any]:
         """
@@ -6433,7 +6488,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_bulk_unsuppress_profiles_job(self, job_id, fields_profile_suppression_bulk_delete_job=None) -> dict[str, Any]:
         """
@@ -6455,7 +6510,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[profile-suppression-bulk-delete-job]', fields_profile_suppression_bulk_delete_job)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def create_or_update_profile(self, additional_fields_profile=None, data=None) -> dict[str, Any]:
         """
@@ -6521,7 +6576,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('additional-fields[profile]', additional_fields_profile)] if v is not None}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def merge_profiles(self, data=None) -> dict[str, Any]:
         """
@@ -6567,7 +6622,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def create_or_update_push_token(self, data=None) -> Any:
         """
@@ -6658,7 +6713,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_lists_for_profile(self, id, fields_list=None) -> dict[str, Any]:
         """
@@ -6680,7 +6735,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[list]', fields_list)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_list_ids_for_profile(self, id) -> dict[str, Any]:
         """
@@ -6701,7 +6756,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_segments_for_profile(self, id, fields_segment=None) -> dict[str, Any]:
         """
@@ -6723,7 +6778,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[segment]', fields_segment)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_segment_ids_for_profile(self, id) -> dict[str, Any]:
         """
@@ -6744,7 +6799,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_bulk_import_profiles_jobs(self, fields_profile_bulk_import_job=None, filter=None, page_cursor=None, page_size=None, sort=None) -> dict[str, Any]:
         """
@@ -6767,7 +6822,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[profile-bulk-import-job]', fields_profile_bulk_import_job), ('filter', filter), ('page[cursor]', page_cursor), ('page[size]', page_size), ('sort', sort)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def bulk_import_profiles(self, data=None) -> dict[str, Any]:
         """
@@ -6892,7 +6947,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_bulk_import_profiles_job(self, job_id, fields_list=None, fields_profile_bulk_import_job=None, include=None) -> dict[str, Any]:
         """
@@ -6916,7 +6971,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[list]', fields_list), ('fields[profile-bulk-import-job]', fields_profile_bulk_import_job), ('include', include)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_list_for_bulk_import_profiles_job(self, id, fields_list=None) -> dict[str, Any]:
         """
@@ -6938,7 +6993,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[list]', fields_list)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_list_ids_for_bulk_import_profiles_job(self, id) -> dict[str, Any]:
         """
@@ -6959,7 +7014,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_profiles_for_bulk_import_profiles_job(self, id, additional_fields_profile=None, fields_profile=None, page_cursor=None, page_size=None) -> dict[str, Any]:
         """
@@ -6984,7 +7039,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('additional-fields[profile]', additional_fields_profile), ('fields[profile]', fields_profile), ('page[cursor]', page_cursor), ('page[size]', page_size)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_profile_ids_for_bulk_import_profiles_job(self, id, page_cursor=None, page_size=None) -> dict[str, Any]:
         """
@@ -7007,7 +7062,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('page[cursor]', page_cursor), ('page[size]', page_size)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_errors_for_bulk_import_profiles_job(self, id, fields_import_error=None, page_cursor=None, page_size=None) -> dict[str, Any]:
         """
@@ -7031,7 +7086,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[import-error]', fields_import_error), ('page[cursor]', page_cursor), ('page[size]', page_size)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def bulk_subscribe_profiles(self, data=None) -> Any:
         """
@@ -7132,7 +7187,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def bulk_unsubscribe_profiles(self, data=None) -> Any:
         """
@@ -7221,7 +7276,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def query_campaign_values(self, page_cursor=None, data=None) -> dict[str, Any]:
         """
@@ -7264,7 +7319,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('page_cursor', page_cursor)] if v is not None}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def query_flow_values(self, page_cursor=None, data=None) -> dict[str, Any]:
         """
@@ -7307,7 +7362,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('page_cursor', page_cursor)] if v is not None}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def query_flow_series(self, page_cursor=None, data=None) -> dict[str, Any]:
         """
@@ -7351,7 +7406,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('page_cursor', page_cursor)] if v is not None}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def query_form_values(self, data=None) -> dict[str, Any]:
         """
@@ -7396,7 +7451,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def query_form_series(self, data=None) -> dict[str, Any]:
         """
@@ -7442,7 +7497,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def query_segment_values(self, data=None) -> dict[str, Any]:
         """
@@ -7483,7 +7538,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def query_segment_series(self, data=None) -> dict[str, Any]:
         """
@@ -7525,7 +7580,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_reviews(self, fields_event=None, fields_review=None, filter=None, include=None, page_cursor=None, page_size=None, sort=None) -> dict[str, Any]:
         """
@@ -7550,7 +7605,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[event]', fields_event), ('fields[review]', fields_review), ('filter', filter), ('include', include), ('page[cursor]', page_cursor), ('page[size]', page_size), ('sort', sort)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_review(self, id, fields_event=None, fields_review=None, include=None) -> dict[str, Any]:
         """
@@ -7574,7 +7629,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[event]', fields_event), ('fields[review]', fields_review), ('include', include)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def update_review(self, id, data=None) -> dict[str, Any]:
         """
@@ -7618,7 +7673,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._patch(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_segments(self, fields_flow=None, fields_segment=None, fields_tag=None, filter=None, include=None, page_cursor=None, sort=None) -> dict[str, Any]:
         """
@@ -7643,7 +7698,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[flow]', fields_flow), ('fields[segment]', fields_segment), ('fields[tag]', fields_tag), ('filter', filter), ('include', include), ('page[cursor]', page_cursor), ('sort', sort)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def create_segment(self, data=None) -> dict[str, Any]:
         """
@@ -7742,7 +7797,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_segment(self, id, additional_fields_segment=None, fields_flow=None, fields_segment=None, fields_tag=None, include=None) -> dict[str, Any]:
         """
@@ -7768,7 +7823,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('additional-fields[segment]', additional_fields_segment), ('fields[flow]', fields_flow), ('fields[segment]', fields_segment), ('fields[tag]', fields_tag), ('include', include)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def delete_segment(self, id) -> Any:
         """
@@ -7789,7 +7844,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._delete(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def update_segment(self, id, data=None) -> dict[str, Any]:
         """
@@ -7892,7 +7947,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._patch(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_tags_for_segment(self, id, fields_tag=None) -> dict[str, Any]:
         """
@@ -7914,7 +7969,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[tag]', fields_tag)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_tag_ids_for_segment(self, id) -> dict[str, Any]:
         """
@@ -7935,7 +7990,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_profiles_for_segment(self, id, additional_fields_profile=None, fields_profile=None, filter=None, page_cursor=None, page_size=None, sort=None) -> dict[str, Any]:
         """
@@ -7962,7 +8017,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('additional-fields[profile]', additional_fields_profile), ('fields[profile]', fields_profile), ('filter', filter), ('page[cursor]', page_cursor), ('page[size]', page_size), ('sort', sort)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_profile_ids_for_segment(self, id, filter=None, page_cursor=None, page_size=None, sort=None) -> dict[str, Any]:
         """
@@ -7987,7 +8042,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('filter', filter), ('page[cursor]', page_cursor), ('page[size]', page_size), ('sort', sort)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_flows_triggered_by_segment(self, id, fields_flow=None) -> dict[str, Any]:
         """
@@ -8009,7 +8064,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[flow]', fields_flow)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_ids_for_flows_triggered_by_segment(self, id) -> dict[str, Any]:
         """
@@ -8030,7 +8085,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_tags(self, fields_tag_group=None, fields_tag=None, filter=None, include=None, page_cursor=None, sort=None) -> dict[str, Any]:
         """
@@ -8054,7 +8109,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[tag-group]', fields_tag_group), ('fields[tag]', fields_tag), ('filter', filter), ('include', include), ('page[cursor]', page_cursor), ('sort', sort)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def create_tag(self, data=None) -> dict[str, Any]:
         """
@@ -8096,7 +8151,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_tag(self, id, fields_tag_group=None, fields_tag=None, include=None) -> dict[str, Any]:
         """
@@ -8120,7 +8175,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[tag-group]', fields_tag_group), ('fields[tag]', fields_tag), ('include', include)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def delete_tag(self, id) -> Any:
         """
@@ -8141,7 +8196,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._delete(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def update_tag(self, id, data=None) -> Any:
         """
@@ -8179,7 +8234,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._patch(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_flow_ids_for_tag(self, id) -> dict[str, Any]:
         """
@@ -8200,7 +8255,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def tag_flows(self, id, data=None) -> Any:
         """
@@ -8241,7 +8296,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def remove_tag_from_flows(self, id, data=None) -> Any:
         """
@@ -8280,9 +8335,9 @@ class KlaviyoApp(APIApplication):
         request_body = {k: v for k, v in request_body.items() if v is not None}
         url = f"{self.base_url}/api/tags/{id}/relationships/flows"
         query_params = {}
-        response = self._delete(url, params=query_params)
+        response = self._delete(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_campaign_ids_for_tag(self, id) -> dict[str, Any]:
         """
@@ -8303,7 +8358,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def tag_campaigns(self, id, data=None) -> Any:
         """
@@ -8344,7 +8399,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def remove_tag_from_campaigns(self, id, data=None) -> Any:
         """
@@ -8383,9 +8438,9 @@ class KlaviyoApp(APIApplication):
         request_body = {k: v for k, v in request_body.items() if v is not None}
         url = f"{self.base_url}/api/tags/{id}/relationships/campaigns"
         query_params = {}
-        response = self._delete(url, params=query_params)
+        response = self._delete(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_list_ids_for_tag(self, id) -> dict[str, Any]:
         """
@@ -8406,7 +8461,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def tag_lists(self, id, data=None) -> Any:
         """
@@ -8447,7 +8502,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def remove_tag_from_lists(self, id, data=None) -> Any:
         """
@@ -8486,9 +8541,9 @@ class KlaviyoApp(APIApplication):
         request_body = {k: v for k, v in request_body.items() if v is not None}
         url = f"{self.base_url}/api/tags/{id}/relationships/lists"
         query_params = {}
-        response = self._delete(url, params=query_params)
+        response = self._delete(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_segment_ids_for_tag(self, id) -> dict[str, Any]:
         """
@@ -8509,7 +8564,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def tag_segments(self, id, data=None) -> Any:
         """
@@ -8550,7 +8605,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def remove_tag_from_segments(self, id, data=None) -> Any:
         """
@@ -8589,9 +8644,9 @@ class KlaviyoApp(APIApplication):
         request_body = {k: v for k, v in request_body.items() if v is not None}
         url = f"{self.base_url}/api/tags/{id}/relationships/segments"
         query_params = {}
-        response = self._delete(url, params=query_params)
+        response = self._delete(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_tag_group_for_tag(self, id, fields_tag_group=None) -> dict[str, Any]:
         """
@@ -8613,7 +8668,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[tag-group]', fields_tag_group)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_tag_group_id_for_tag(self, id) -> dict[str, Any]:
         """
@@ -8634,7 +8689,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_tag_groups(self, fields_tag_group=None, filter=None, page_cursor=None, sort=None) -> dict[str, Any]:
         """
@@ -8656,7 +8711,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[tag-group]', fields_tag_group), ('filter', filter), ('page[cursor]', page_cursor), ('sort', sort)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def create_tag_group(self, data=None) -> dict[str, Any]:
         """
@@ -8691,7 +8746,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_tag_group(self, id, fields_tag_group=None) -> dict[str, Any]:
         """
@@ -8713,7 +8768,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[tag-group]', fields_tag_group)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def delete_tag_group(self, id) -> dict[str, Any]:
         """
@@ -8734,7 +8789,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._delete(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def update_tag_group(self, id, data=None) -> dict[str, Any]:
         """
@@ -8776,7 +8831,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._patch(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_tags_for_tag_group(self, id, fields_tag=None) -> dict[str, Any]:
         """
@@ -8798,7 +8853,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[tag]', fields_tag)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_tag_ids_for_tag_group(self, id) -> dict[str, Any]:
         """
@@ -8819,7 +8874,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_templates(self, fields_template=None, filter=None, page_cursor=None, sort=None) -> dict[str, Any]:
         """
@@ -8841,7 +8896,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[template]', fields_template), ('filter', filter), ('page[cursor]', page_cursor), ('sort', sort)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def create_template(self, data=None) -> dict[str, Any]:
         """
@@ -8878,7 +8933,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_template(self, id, fields_template=None) -> dict[str, Any]:
         """
@@ -8900,7 +8955,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[template]', fields_template)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def delete_template(self, id) -> Any:
         """
@@ -8921,7 +8976,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._delete(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def update_template(self, id, data=None) -> dict[str, Any]:
         """
@@ -8961,7 +9016,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._patch(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def render_template(self, data=None) -> dict[str, Any]:
         """
@@ -8996,7 +9051,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def clone_template(self, data=None) -> dict[str, Any]:
         """
@@ -9031,7 +9086,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_all_universal_content(self, fields_template_universal_content=None, filter=None, page_cursor=None, page_size=None, sort=None) -> dict[str, Any]:
         """
@@ -9054,7 +9109,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[template-universal-content]', fields_template_universal_content), ('filter', filter), ('page[cursor]', page_cursor), ('page[size]', page_size), ('sort', sort)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def create_universal_content(self, data=None) -> dict[str, Any]:
         """
@@ -9103,7 +9158,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_universal_content(self, id, fields_template_universal_content=None) -> dict[str, Any]:
         """
@@ -9125,7 +9180,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[template-universal-content]', fields_template_universal_content)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def delete_universal_content(self, id) -> Any:
         """
@@ -9146,7 +9201,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._delete(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def update_universal_content(self, id, data=None) -> dict[str, Any]:
         """
@@ -9199,7 +9254,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._patch(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_tracking_settings(self, fields_tracking_setting=None, page_cursor=None, page_size=None) -> dict[str, Any]:
         """
@@ -9220,7 +9275,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[tracking-setting]', fields_tracking_setting), ('page[cursor]', page_cursor), ('page[size]', page_size)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_tracking_setting(self, id, fields_tracking_setting=None) -> dict[str, Any]:
         """
@@ -9242,7 +9297,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[tracking-setting]', fields_tracking_setting)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def update_tracking_setting(self, id, data=None) -> dict[str, Any]:
         """
@@ -9354,7 +9409,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._patch(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_webhooks(self, fields_webhook=None, include=None) -> dict[str, Any]:
         """
@@ -9374,7 +9429,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[webhook]', fields_webhook), ('include', include)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def create_webhook(self, data=None) -> dict[str, Any]:
         """
@@ -9425,7 +9480,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._post(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_webhook(self, id, fields_webhook=None, include=None) -> dict[str, Any]:
         """
@@ -9448,7 +9503,7 @@ class KlaviyoApp(APIApplication):
         query_params = {k: v for k, v in [('fields[webhook]', fields_webhook), ('include', include)] if v is not None}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def delete_webhook(self, id) -> Any:
         """
@@ -9469,7 +9524,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._delete(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def update_webhook(self, id, data=None) -> dict[str, Any]:
         """
@@ -9525,7 +9580,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._patch(url, data=request_body, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_webhook_topics(self) -> dict[str, Any]:
         """
@@ -9541,7 +9596,7 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
 
     def get_webhook_topic(self, id) -> dict[str, Any]:
         """
@@ -9562,7 +9617,43 @@ class KlaviyoApp(APIApplication):
         query_params = {}
         response = self._get(url, params=query_params)
         response.raise_for_status()
-        return response.json()
+        return self._handle_response(response)
+
+    def query_local_metadata(self, resource_type, tag=None, status=None, name_contains=None, created_after=None, created_before=None, updated_after=None, updated_before=None, limit=100, max_age=300, full_max_age=3600, refresh=False) -> list[dict[str, Any]]:
+        """
+        Answers questions about flows, lists, segments, campaigns, templates and tags from a local SQLite replica instead of the API, e.g. live flows tagged "Onboarding" or segments created last month. The replica is fully synced on first use and every `full_max_age` seconds, and incrementally once it is older than `max_age` seconds. Incremental syncs do not see deletions or tag changes, so results may miss those for up to `full_max_age` seconds; pass `refresh` to re-sync fully first.
+
+        Args:
+            resource_type (string): One of 'flow', 'list', 'segment', 'campaign', 'template' or 'tag'.
+            tag (string): Tag id or tag name the resources must carry.
+            status (string): Exact status, e.g. 'live' for flows or 'Sent' for campaigns.
+            name_contains (string): Case-insensitive substring of the name.
+            created_after (string): Inclusive lower bound on the created timestamp (ISO 8601). Example: '2024-01-01T00:00:00Z'.
+            created_before (string): Exclusive upper bound on the created timestamp (ISO 8601).
+            updated_after (string): Inclusive lower bound on the updated timestamp (ISO 8601).
+            updated_before (string): Exclusive upper bound on the updated timestamp (ISO 8601).
+            limit (integer): Maximum number of results.
+            max_age (number): Seconds since the last sync after which the replica is refreshed first.
+            full_max_age (number): Seconds since the last full sync after which the replica is re-synced fully first.
+            refresh (boolean): Re-sync the replica fully before answering.
+
+        Returns:
+            list[dict[str, Any]]: Matching resources with their attributes and tag ids, most recently updated first.
+
+        Tags:
+            Local
+        """
+        if resource_type not in COLLECTIONS:
+            raise ValueError(f"Unsupported resource type: {resource_type}")
+        if self._replica is None:
+            self._replica = MetadataReplica(self, path=self.replica_path)
+        replica = self._replica
+        now = time.monotonic()
+        if refresh or replica.full_synced_at is None or now - replica.full_synced_at > full_max_age:
+            replica.sync(full=True)
+        elif now - replica.synced_at > max_age:
+            replica.sync()
+        return replica.query(resource_type, tag=tag, status=status, name_contains=name_contains, created_after=created_after, created_before=created_before, updated_after=updated_after, updated_before=updated_before, limit=limit)
 
     def list_tools(self):
         return [
@@ -9711,6 +9802,7 @@ class KlaviyoApp(APIApplication):
             self.get_form_id_for_form_version,
             self.get_images,
             self.upload_image_from_url,
+            self.upload_image_from_file,
             self.get_image,
             self.update_image,
             self.get_lists,
@@ -9831,5 +9923,6 @@ class KlaviyoApp(APIApplication):
             self.delete_webhook,
             self.update_webhook,
             self.get_webhook_topics,
-            self.get_webhook_topic
+            self.get_webhook_topic,
+            self.query_local_metadata,
         ]
@@ -0,0 +1,265 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from universal_mcp_klaviyo.flows import Node
+from universal_mcp_klaviyo.utils import RateLimiter, call_with_retry, run_concurrently
+
+# Resource type -> single-resource getter served through the cache.
+GETTERS = {
+    "profile": "get_profile",
+    "campaign": "get_campaign",
+    "flow": "get_flow",
+    "list": "get_list",
+    "segment": "get_segment",
+    "template": "get_template",
+    "catalog-item": "get_catalog_item",
+    "tag": "get_tag",
+    "coupon": "get_coupon",
+}
+
+CacheKey = tuple[str, str, str]
+
+
+def changed_resources(event: dict[str, Any]) -> set[Node]:
+    """
+    Cacheable (type, id) pairs a webhook event refers to: the event itself and its
+    relationships.
+    """
+    nodes = set()
+    if event.get("type") in GETTERS and event.get("id"):
+        nodes.add((event["type"], event["id"]))
+    for value in (event.get("relationships") or {}).values():
+        data = (value or {}).get("data")
+        for item in data if isinstance(data, list) else [data] if data else []:
+            if item.get("type") in GETTERS and item.get("id"):
+                nodes.add((item["type"], item["id"]))
+    return nodes
+
+
+def register_webhook(
+    app: Any, name: str, endpoint_url: str, secret: str, topics: Iterable[str]
+) -> str:
+    """
+    Creates a webhook delivering `topics` to `endpoint_url` with `create_webhook`.
+
+    Returns:
+        str: The webhook id.
+    """
+    data = {
+        "type": "webhook",
+        "attributes": {
+            "name": name,
+            "endpoint_url": endpoint_url,
+            "secret_key": secret,
+        },
+        "relationships": {
+            "webhook-topics": {
+                "data": [{"type": "webhook-topic", "id": topic} for topic in topics]
+            }
+        },
+    }
+    return call_with_retry(app.create_webhook, data=data)["data"]["id"]
+
+
+class ResourceCache:
+    """
+    Read-through cache for single-resource getters such as `get_profile`, `get_campaign`
+    and `get_flow`.
+
+    Entries are keyed by resource type, id and the getter's keyword arguments, so
+    different `fields_*` or `include` selections of the same resource are cached
+    separately and evicted together. Without a change feed `ttl` must stay short; paired
+    with a `WebhookInvalidator` it can be hours, since changed resources are evicted as
+    soon as Klaviyo reports them. A read still in flight when its resource is
+    invalidated or refreshed returns its document but does not cache it, since it may
+    predate the change.
+
+    Args:
+        app: The KlaviyoApp instance to read through.
+        ttl: Seconds an entry is served before it is re-read.
+        max_entries: Maximum number of entries kept, least recently used first out.
+    """
+
+    def __init__(self, app: Any, ttl: float = 3600.0, max_entries: int = 10000) -> None:
+        self.app = app
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[CacheKey, tuple[float, dict[str, Any]]] = (
+            OrderedDict()
+        )
+        # (type, id) -> [reads in flight, generation bumped by each invalidation]
+        self._in_flight: dict[Node, list[int]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, kind: str, id: str, **kwargs: Any) -> dict[str, Any]:
+        """
+        Returns a resource document, calling the getter only on a miss or an expired
+        entry.
+
+        Args:
+            kind: Resource type, a key of `GETTERS`.
+            id: The resource id.
+            **kwargs: Keyword arguments for the getter, e.g. `include="tags"`.
+
+        Returns:
+            dict[str, Any]: The getter's response document.
+
+        Raises:
+            ValueError: If `kind` has no cached getter.
+        """
+        if kind not in GETTERS:
+            raise ValueError(f"Unsupported resource type: {kind}")
+        key = (kind, id, json.dumps(kwargs, sort_keys=True, default=str))
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and now - entry[0] < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        return self._fetch(key)
+
+    def cached_keys(self, kind: str, id: str) -> list[CacheKey]:
+        with self._lock:
+            return [key for key in self._entries if key[0] == kind and key[1] == id]
+
+    def invalidate(self, kind: str | None = None, id: str | None = None) -> int:
+        """
+        Drops every cached selection of one resource, of one type, or everything.
+
+        Returns:
+            int: Number of entries dropped.
+        """
+        with self._lock:
+            keys = [
+                key
+                for key in self._entries
+                if kind in (None, key[0]) and id in (None, key[1])
+            ]
+            for key in keys:
+                del self._entries[key]
+            self._supersede(kind, id)
+        return len(keys)
+
+    def supersede(self, kind: str | None = None, id: str | None = None) -> None:
+        """
+        Keeps reads of one resource, of one type, or of everything that are already in
+        flight from caching their documents, without dropping cached entries. Call it
+        before `refresh` so an older read cannot land after the refreshed one.
+        """
+        with self._lock:
+            self._supersede(kind, id)
+
+    def refresh(self, key: CacheKey) -> dict[str, Any]:
+        """
+        Re-reads one cached entry with the arguments it was cached with.
+        """
+        return self._fetch(key)
+
+    def _fetch(self, key: CacheKey) -> dict[str, Any]:
+        kind, id, kwargs = key
+        with self._lock:
+            flight = self._in_flight.setdefault((kind, id), [0, 0])
+            flight[0] += 1
+            generation = flight[1]
+        try:
+            document = call_with_retry(
+                getattr(self.app, GETTERS[kind]), id, **json.loads(kwargs)
+            )
+        except BaseException:
+            with self._lock:
+                self._land((kind, id), flight)
+            raise
+        with self._lock:
+            self._land((kind, id), flight)
+            if flight[1] != generation:
+                return document
+            self._entries[key] = (time.monotonic(), document)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return document
+
+    def _supersede(self, kind: str | None, id: str | None) -> None:
+        for node, flight in self._in_flight.items():
+            if kind in (None, node[0]) and id in (None, node[1]):
+                flight[1] += 1
+
+    def _land(self, node: Node, flight: list[int]) -> None:
+        flight[0] -= 1
+        if not flight[0]:
+            del self._in_flight[node]
+
+
+class WebhookInvalidator:
+    """
+    Webhook handler that evicts or refreshes `ResourceCache` entries for resources named
+    in deliveries.
+
+    Every event in a batch is mapped to the cacheable resources it refers to, by default
+    its own type and id plus those of its relationships (an event's `profile`, for
+    instance); `resolver` can add more, e.g. from event properties. Each resource is
+    handled once per batch. Evicted entries are re-read lazily on the next `get`; with
+    `refresh` the entries that were cached are re-read at once, concurrently, so hot
+    resources never miss. Pass the instance as the `handler` of a `WebhookReceiver`.
+
+    Args:
+        cache: The cache to keep current.
+        refresh: Re-read changed entries instead of evicting them.
+        resolver: Optional function returning extra (type, id) pairs for an event.
+        max_workers: Maximum number of refreshes in flight.
+        tier: Klaviyo rate tier of the cached getters.
+    """
+
+    def __init__(
+        self,
+        cache: ResourceCache,
+        refresh: bool = False,
+        resolver: Callable[[dict[str, Any]], Iterable[Node]] | None = None,
+        max_workers: int = 4,
+        tier: str = "M",
+    ) -> None:
+        self.cache = cache
+        self.refresh = refresh
+        self.resolver = resolver
+        self.max_workers = max_workers
+        self.limiter = RateLimiter.for_tier(tier)
+
+    def __call__(self, events: list[dict[str, Any]]) -> dict[str, int]:
+        """
+        Applies a batch of webhook events to the cache.
+
+        Returns:
+            dict[str, int]: Number of cache entries `evicted` and `refreshed`.
+        """
+        nodes: set[Node] = set()
+        for event in events:
+            nodes |= changed_resources(event)
+            if self.resolver is not None:
+                nodes.update(
+                    node for node in self.resolver(event) if node[0] in GETTERS
+                )
+        if not self.refresh:
+            return {
+                "evicted": sum(
+                    self.cache.invalidate(kind, id) for kind, id in sorted(nodes)
+                ),
+                "refreshed": 0,
+            }
+        keys = []
+        for kind, id in sorted(nodes):
+            self.cache.supersede(kind, id)
+            keys.extend(self.cache.cached_keys(kind, id))
+        run_concurrently(self.cache.refresh, keys, self.max_workers, self.limiter)
+        return {"evicted": 0, "refreshed": len(keys)}
@@ -0,0 +1,299 @@
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any
+
+import httpx
+from loguru import logger
+
+from universal_mcp_klaviyo.jobs import JobPoller
+from universal_mcp_klaviyo.utils import RateLimiter, call_with_retry, retry_after
+
+MAX_SEND_ATTEMPTS = 3
+
+FINAL_STAGES = {"sent", "cancelled", "failed"}
+
+CampaignListener = Callable[[str, str, dict[str, Any]], None]
+
+
+class _Launch:
+    def __init__(self, campaign_id: str) -> None:
+        self.campaign_id = campaign_id
+        self.stage = "pending"
+        self.cancel_requested = False
+        self.done: Future = Future()
+
+
+class CampaignLauncher:
+    """
+    Sends many campaigns concurrently, each through its estimate -> send -> track state
+    machine.
+
+    Every campaign first has its recipient estimation refreshed with
+    `refresh_campaign_recipient_estimation`, waits for that job, is submitted with
+    `send_campaign` and then tracked through `get_campaign_send_job` until the send
+    completes. No thread waits on a job: all jobs are polled by one shared `JobPoller`
+    whose callbacks advance each campaign, and requests run on a small worker pool under
+    the campaign endpoints' rate tier. Listeners receive an event at every stage
+    (`estimating`, `estimated`, `sending`, `progress`, `sent`, `cancelled`, `failed`),
+    and `cancel` stops a campaign before its send or cancels a running send with
+    `cancel_campaign_send`. Sends are never repeated after an unknown outcome: a send
+    that times out or hits a server error is looked up with `get_campaign_send_job`
+    and tracked if Klaviyo accepted it.
+
+    Args:
+        app: The KlaviyoApp instance to send through.
+        poller: Job poller to share. Defaults to a new one owned by the launcher and
+            stopped by `close`.
+        max_workers: Maximum number of campaign requests in flight.
+        tier: Klaviyo rate tier of the campaign job endpoints.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        poller: JobPoller | None = None,
+        max_workers: int = 8,
+        tier: str = "M",
+    ) -> None:
+        self.app = app
+        self.poller = poller or JobPoller(app, tier=tier)
+        self._owns_poller = poller is None
+        self._closed = False
+        self.max_workers = max_workers
+        self.limiter = RateLimiter.for_tier(tier)
+        self._listeners: list[CampaignListener] = []
+        self._launches: dict[str, _Launch] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="klaviyo-campaigns"
+        )
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "CampaignLauncher":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Shuts the launcher down. Campaigns still running are no longer tracked and their
+        futures are cancelled.
+        """
+        with self._lock:
+            self._closed = True
+            unfinished = [
+                launch for launch in self._launches.values() if not launch.done.done()
+            ]
+        self._executor.shutdown(wait=True)
+        if self._owns_poller:
+            self.poller.stop()
+        for launch in unfinished:
+            launch.done.cancel()
+
+    def on_event(self, listener: CampaignListener) -> None:
+        """
+        Registers a listener called as `listener(campaign_id, stage, detail)`; `detail`
+        holds the job attributes or the error.
+        """
+        self._listeners.append(listener)
+
+    def stages(self) -> dict[str, str]:
+        with self._lock:
+            return {
+                campaign_id: launch.stage
+                for campaign_id, launch in self._launches.items()
+            }
+
+    def launch(
+        self, campaign_ids: Iterable[str], timeout: float | None = None
+    ) -> dict[str, str]:
+        """
+        Estimates and sends campaigns concurrently and waits for them to finish.
+
+        Args:
+            campaign_ids: Campaigns to send. Campaigns already launched by this instance
+                are not sent again.
+            timeout: Seconds to wait; campaigns still running afterwards keep going and
+                report their current stage.
+
+        Returns:
+            dict[str, str]: The stage each campaign reached: `sent`, `cancelled`,
+                `failed`, or an intermediate stage on timeout.
+        """
+        futures = {
+            campaign_id: self.submit(campaign_id)
+            for campaign_id in dict.fromkeys(campaign_ids)
+        }
+        wait(futures.values(), timeout=timeout)
+        stages = self.stages()
+        return {campaign_id: stages[campaign_id] for campaign_id in futures}
+
+    def submit(self, campaign_id: str) -> Future:
+        """
+        Starts one campaign without waiting.
+
+        Returns:
+            Future: Resolves to the campaign's final stage.
+        """
+        with self._lock:
+            launch = self._launches.get(campaign_id)
+            if launch is not None:
+                return launch.done
+            launch = self._launches[campaign_id] = _Launch(campaign_id)
+        self._executor.submit(self._estimate, launch)
+        return launch.done
+
+    def cancel(self, campaign_id: str) -> None:
+        """
+        Cancels a campaign: before its send is submitted it is never sent, afterwards
+        the send job is cancelled.
+        """
+        with self._lock:
+            launch = self._launches.get(campaign_id)
+            if launch is None or launch.stage in FINAL_STAGES:
+                return
+            launch.cancel_requested = True
+            sending = launch.stage == "sending"
+        if sending:
+            self._cancel_send(launch)
+
+    def _estimate(self, launch: _Launch) -> None:
+        campaign_id = launch.campaign_id
+        try:
+            self._advance(launch, "estimating", {})
+            self.limiter.acquire()
+            data = {"type": "campaign-recipient-estimation-job", "id": campaign_id}
+            job_id = call_with_retry(
+                self.app.refresh_campaign_recipient_estimation, data=data
+            )["data"]["id"]
+        except Exception as e:
+            self._finish(launch, "failed", {"error": e})
+            return
+        future = self.poller.watch("get_campaign_recipient_estimation_job", job_id)
+        future.add_done_callback(lambda done: self._schedule(self._send, launch, done))
+
+    def _send(self, launch: _Launch, estimation: Future) -> None:
+        campaign_id = launch.campaign_id
+        try:
+            job = estimation.result()
+            self._advance(launch, "estimated", job.get("attributes") or {})
+            with self._lock:
+                if launch.cancel_requested:
+                    cancelled = True
+                else:
+                    cancelled = False
+                    launch.stage = "submitting"
+            if cancelled:
+                self._finish(launch, "cancelled", {})
+                return
+            job_id = self._submit_send(campaign_id)
+        except Exception as e:
+            self._finish(launch, "failed", {"error": e})
+            return
+        with self._lock:
+            # A cancel that arrived while the send was being submitted is carried out
+            # here.
+            launch.stage = "sending"
+            cancel_now = launch.cancel_requested
+        self._emit(campaign_id, "sending", {"job_id": job_id})
+        if cancel_now:
+            self._cancel_send(launch)
+        future = self.poller.watch(
+            "get_campaign_send_job",
+            job_id,
+            on_update=lambda job: self._emit(
+                campaign_id, "progress", job.get("attributes") or {}
+            ),
+        )
+        future.add_done_callback(lambda done: self._track(launch, done))
+
+    def _submit_send(self, campaign_id: str) -> str:
+        # Sending is not idempotent: only throttled requests, which Klaviyo did not
+        # process, are sent again. After a timeout or server error the send may still
+        # have been accepted, in which case its job exists under the campaign id.
+        data = {"type": "campaign-send-job", "id": campaign_id}
+        for attempt in range(MAX_SEND_ATTEMPTS):
+            self.limiter.acquire()
+            try:
+                job = call_with_retry(self.app.send_campaign, max_retries=0, data=data)
+                return job["data"]["id"]
+            except httpx.HTTPStatusError as e:
+                status = e.response.status_code
+                if (
+                    status == httpx.codes.TOO_MANY_REQUESTS
+                    and attempt + 1 < MAX_SEND_ATTEMPTS
+                ):
+                    time.sleep(retry_after(e.response, 2**attempt))
+                    continue
+                if status < httpx.codes.INTERNAL_SERVER_ERROR:
+                    raise
+                error = e
+            except httpx.TransportError as e:
+                error = e
+            try:
+                self.limiter.acquire()
+                job = call_with_retry(self.app.get_campaign_send_job, campaign_id)
+            except Exception:
+                raise error from None
+            logger.warning(
+                f"Sending campaign {campaign_id} failed with {error!r} but its send "
+                "job exists; tracking it"
+            )
+            return job["data"]["id"]
+        raise AssertionError("unreachable")
+
+    def _schedule(self, func: Callable[..., None], *args: Any) -> None:
+        # Jobs finishing after `close` have nowhere to run.
+        with self._lock:
+            if self._closed:
+                return
+            self._executor.submit(func, *args)
+
+    def _track(self, launch: _Launch, send: Future) -> None:
+        try:
+            attributes = send.result().get("attributes") or {}
+        except Exception as e:
+            self._finish(launch, "failed", {"error": e})
+            return
+        stage = {"complete": "sent", "cancelled": "cancelled"}.get(
+            attributes.get("status"), "failed"
+        )
+        self._finish(launch, stage, attributes)
+
+    def _cancel_send(self, launch: _Launch) -> None:
+        data = {
+            "type": "campaign-send-job",
+            "id": launch.campaign_id,
+            "attributes": {"action": "cancel"},
+        }
+        try:
+            self.limiter.acquire()
+            call_with_retry(
+                self.app.cancel_campaign_send, launch.campaign_id, data=data
+            )
+        except Exception:
+            logger.exception(
+                f"Cancelling the send of campaign {launch.campaign_id} failed"
+            )
+
+    def _advance(self, launch: _Launch, stage: str, detail: dict[str, Any]) -> None:
+        with self._lock:
+            launch.stage = stage
+        self._emit(launch.campaign_id, stage, detail)
+
+    def _finish(self, launch: _Launch, stage: str, detail: dict[str, Any]) -> None:
+        if launch.done.done():
+            return
+        self._advance(launch, stage, detail)
+        launch.done.set_result(stage)
+
+    def _emit(self, campaign_id: str, stage: str, detail: dict[str, Any]) -> None:
+        for listener in list(self._listeners):
+            try:
+                listener(campaign_id, stage, detail)
+            except Exception:
+                logger.exception(
+                    f"Campaign listener failed on {stage} of campaign {campaign_id}"
+                )
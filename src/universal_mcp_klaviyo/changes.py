@@ -0,0 +1,311 @@
+import functools
+import inspect
+import sqlite3
+import threading
+from collections.abc import Callable, Iterable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from loguru import logger
+
+from universal_mcp_klaviyo.utils import RateLimiter, iter_pages, run_concurrently
+
+# Resource type -> (listing method, updated timestamp field, base filters polled
+# separately).
+SOURCES = {
+    "campaign": (
+        "get_campaigns",
+        "updated_at",
+        ('equals(messages.channel,"email")', 'equals(messages.channel,"sms")'),
+    ),
+    "profile": ("get_profiles", "updated", (None,)),
+    "segment": ("get_segments", "updated", (None,)),
+    "template": ("get_templates", "updated", (None,)),
+    "catalog-item": ("get_catalog_items", "updated", (None,)),
+}
+# Types whose listing cannot filter on the updated field: they are listed in full and
+# compared against the mark locally.
+UNFILTERED_SOURCES = {"catalog-item"}
+
+
+def shift_timestamp(timestamp: str, seconds: float) -> str:
+    """
+    Moves an ISO 8601 timestamp back by `seconds`, floored to whole seconds in UTC.
+    """
+    moment = datetime.fromisoformat(timestamp)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=UTC)
+    return (
+        (moment - timedelta(seconds=seconds))
+        .astimezone(UTC)
+        .strftime("%Y-%m-%dT%H:%M:%SZ")
+    )
+
+
+class Change:
+    """
+    One observed version of a resource.
+
+    Args:
+        kind: Resource type, a key of `SOURCES`.
+        id: The resource id.
+        updated: The resource's updated timestamp.
+        resource: The resource as returned by the listing endpoint.
+    """
+
+    def __init__(
+        self, kind: str, id: str, updated: str, resource: dict[str, Any]
+    ) -> None:
+        self.kind = kind
+        self.id = id
+        self.updated = updated
+        self.resource = resource
+
+    def __repr__(self) -> str:
+        return f"Change({self.kind!r}, {self.id!r}, {self.updated!r})"
+
+
+class ChangePoller:
+    """
+    Change-data-capture over the updated timestamps of Klaviyo list endpoints.
+
+    For each resource type the poller keeps a high-water mark, the newest updated
+    timestamp delivered, and asks only for resources updated after it, so a poll costs
+    one request per page of changes. Marks are persisted in SQLite and advance only once
+    every consumer has accepted a poll's changes, so delivery is at least once across
+    crashes. Klaviyo timestamps have second resolution, so each poll reaches back
+    `overlap` seconds to catch writes that landed on the mark's own second, and (id,
+    updated) pairs already delivered in that window are dropped. Resource types are
+    polled concurrently. Catalog items cannot be filtered on their updated timestamp, so
+    they are listed in full and compared locally.
+
+    Args:
+        app: The KlaviyoApp instance to poll through.
+        path: SQLite database path for marks, or ":memory:".
+        kinds: Resource types to poll. Defaults to every type in `SOURCES`.
+        interval: Seconds between polls of the background thread.
+        overlap: Seconds each poll reaches back before the mark.
+        page_size: Page size requested from the listing endpoints that accept one.
+        max_workers: Maximum number of resource types polled at once.
+        tier: Klaviyo rate tier of the listing endpoints.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        path: str = ":memory:",
+        kinds: Iterable[str] | None = None,
+        interval: float = 60.0,
+        overlap: float = 1.0,
+        page_size: int | None = 100,
+        max_workers: int = 4,
+        tier: str = "M",
+    ) -> None:
+        self.app = app
+        self.kinds = list(kinds) if kinds is not None else list(SOURCES)
+        unknown = set(self.kinds) - set(SOURCES)
+        if unknown:
+            raise ValueError(f"Unsupported resource types: {sorted(unknown)}")
+        self.interval = interval
+        self.overlap = overlap
+        self.page_size = page_size
+        self.max_workers = max_workers
+        self.limiter = RateLimiter.for_tier(tier)
+        self._consumers: list[tuple[Callable[[list[Change]], None], set[str]]] = []
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        # Types are polled concurrently but consumers are called one at a time.
+        self._deliver_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        with self._lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS marks (kind TEXT PRIMARY KEY, mark TEXT "
+                "NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS delivered ("
+                "kind TEXT NOT NULL, id TEXT NOT NULL, updated TEXT NOT NULL, PRIMARY "
+                "KEY (kind, id, updated)) WITHOUT ROWID"
+            )
+
+    def __enter__(self) -> "ChangePoller":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def subscribe(
+        self,
+        consumer: Callable[[list[Change]], None],
+        kinds: Iterable[str] | None = None,
+    ) -> None:
+        """
+        Registers a consumer, called with each poll's changes of the given types
+        (default all).
+        """
+        self._consumers.append(
+            (consumer, set(kinds) if kinds is not None else set(self.kinds))
+        )
+
+    def marks(self) -> dict[str, str]:
+        with self._lock:
+            return dict(self._db.execute("SELECT kind, mark FROM marks").fetchall())
+
+    def reset(self, kind: str | None = None, mark: str | None = None) -> None:
+        """
+        Moves the high-water mark of one or every type; without `mark` the next poll
+        starts from scratch.
+        """
+        kinds = [kind] if kind is not None else self.kinds
+        with self._lock, self._db:
+            self._db.executemany(
+                "DELETE FROM delivered WHERE kind = ?", [(kind,) for kind in kinds]
+            )
+            if mark is None:
+                self._db.executemany(
+                    "DELETE FROM marks WHERE kind = ?", [(kind,) for kind in kinds]
+                )
+            else:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO marks (kind, mark) VALUES (?, ?)",
+                    [(kind, mark) for kind in kinds],
+                )
+
+    def poll(self) -> dict[str, int]:
+        """
+        Polls every resource type once and delivers new changes to the consumers.
+
+        Returns:
+            dict[str, int]: Number of changes delivered per type.
+
+        Raises:
+            Exception: The first error raised by a listing call or consumer; marks of
+                other types still advance.
+        """
+        results = run_concurrently(self._poll_safely, self.kinds, self.max_workers)
+        errors = [result for result in results if isinstance(result, Exception)]
+        if errors:
+            raise errors[0]
+        return dict(zip(self.kinds, results))
+
+    def start(self) -> None:
+        """
+        Starts the background thread that polls on the interval.
+        """
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="klaviyo-change-poller", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops the background thread after its current poll.
+        """
+        if self._thread is not None:
+            self._stopped.set()
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self.poll()
+            except Exception:
+                logger.exception("Polling Klaviyo for changes failed")
+            self._stopped.wait(self.interval)
+
+    def _poll_safely(self, kind: str) -> int | Exception:
+        try:
+            return self._poll(kind)
+        except Exception as e:
+            return e
+
+    def _poll(self, kind: str) -> int:
+        method, field, scopes = SOURCES[kind]
+        with self._lock:
+            row = self._db.execute(
+                "SELECT mark FROM marks WHERE kind = ?", (kind,)
+            ).fetchone()
+        mark = row[0] if row else None
+        floor = shift_timestamp(mark, self.overlap) if mark else None
+        since = (
+            f"greater-than({field},{floor})"
+            if floor and kind not in UNFILTERED_SOURCES
+            else None
+        )
+
+        listing = self._listing(method)
+        changes: dict[tuple[str, str], Change] = {}
+        for scope in scopes:
+            kwargs = {}
+            if scope or since:
+                kwargs["filter"] = ",".join(term for term in (scope, since) if term)
+            if (
+                self.page_size is not None
+                and "page_size" in inspect.signature(listing).parameters
+            ):
+                kwargs["page_size"] = self.page_size
+            for document in iter_pages(listing, **kwargs):
+                for resource in document.get("data") or []:
+                    updated = (resource.get("attributes") or {}).get(field)
+                    if updated and (
+                        since
+                        or not floor
+                        or datetime.fromisoformat(updated)
+                        > datetime.fromisoformat(floor)
+                    ):
+                        changes[(resource["id"], updated)] = Change(
+                            kind, resource["id"], updated, resource
+                        )
+
+        with self._lock:
+            delivered = {
+                (id, updated)
+                for id, updated in self._db.execute(
+                    "SELECT id, updated FROM delivered WHERE kind = ?", (kind,)
+                )
+            }
+        fresh = sorted(
+            (change for key, change in changes.items() if key not in delivered),
+            key=lambda change: change.updated,
+        )
+        if fresh:
+            with self._deliver_lock:
+                for consumer, kinds in list(self._consumers):
+                    if kind in kinds:
+                        consumer(fresh)
+        new_mark = max([mark or "", *(change.updated for change in fresh)])
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR IGNORE INTO delivered (kind, id, updated) VALUES (?, ?, ?)",
+                [(kind, change.id, change.updated) for change in fresh],
+            )
+            if new_mark:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO marks (kind, mark) VALUES (?, ?)",
+                    (kind, new_mark),
+                )
+                # Only pairs inside the overlap window can be seen again.
+                self._db.execute(
+                    "DELETE FROM delivered WHERE kind = ? AND updated < ?",
+                    (kind, shift_timestamp(new_mark, self.overlap)),
+                )
+        return len(fresh)
+
+    def _listing(self, method: str) -> Callable[..., dict[str, Any]]:
+        func = getattr(self.app, method)
+
+        @functools.wraps(func)
+        def call(*args: Any, **kwargs: Any) -> dict[str, Any]:
+            self.limiter.acquire()
+            return func(*args, **kwargs)
+
+        return call
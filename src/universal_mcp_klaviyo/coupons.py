@@ -0,0 +1,217 @@
+import re
+import secrets
+import string
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any
+
+from loguru import logger
+
+from universal_mcp_klaviyo.jobs import JobPoller
+from universal_mcp_klaviyo.list_sync import IdSet
+from universal_mcp_klaviyo.utils import (
+    RateLimiter,
+    call_with_retry,
+    chunked,
+    iter_resources,
+)
+
+MAX_COUPON_CODE_BATCH = 1000
+CODE_ALPHABET = string.ascii_uppercase + string.digits
+# Error pointer naming the position of a code in a bulk create job's payload.
+_CODE_POINTER = re.compile(r"/coupon-codes/data/(\d+)(?:/|$)")
+
+
+def generate_codes(
+    count: int, length: int = 10, prefix: str = "", alphabet: str = CODE_ALPHABET
+) -> Iterator[str]:
+    """
+    Yields `count` random coupon codes. Collisions are possible and are dropped by the
+    pipeline.
+    """
+    for _ in range(count):
+        yield prefix + "".join(secrets.choice(alphabet) for _ in range(length))
+
+
+def attribute_errors(codes: list[str], errors: list[dict[str, Any]]) -> dict[str, str]:
+    """
+    Maps a bulk create job's errors to the codes they concern, by source pointer or by
+    the code appearing in the detail.
+    """
+    details = {}
+    for error in errors:
+        detail = error.get("detail")
+        if not detail:
+            continue
+        match = _CODE_POINTER.search((error.get("source") or {}).get("pointer") or "")
+        if match and int(match.group(1)) < len(codes):
+            details.setdefault(codes[int(match.group(1))], detail)
+            continue
+        for code in codes:
+            if re.search(rf"(?<![\w-]){re.escape(code)}(?![\w-])", detail):
+                details.setdefault(code, detail)
+    return details
+
+
+class CouponCodePipeline:
+    """
+    Streams unique coupon codes into Klaviyo through `bulk_create_coupon_codes`.
+
+    Codes already on the coupon are paged from `get_coupon_codes_for_coupon` into a
+    compact `IdSet`; incoming codes that exist there or repeat earlier in the stream are
+    skipped. The rest are chunked into jobs of up to 1000 codes, and up to `max_workers`
+    jobs are submitted at once, reading the input lazily, and tracked by a shared
+    `JobPoller`. Per-code failures are yielded as each job finishes; a job that cannot
+    be submitted or tracked fails every code in it.
+
+    Args:
+        app: The KlaviyoApp instance to call through.
+        max_workers: Maximum number of jobs in flight.
+        poll_interval: Shortest delay between status checks of a running job.
+        tier: Klaviyo rate tier of the coupon code job endpoints.
+        poller: Job poller to share. Defaults to a new one.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        max_workers: int = 4,
+        poll_interval: float = 1.0,
+        tier: str = "M",
+        poller: JobPoller | None = None,
+    ) -> None:
+        self.app = app
+        self.max_workers = max_workers
+        self.poll_interval = poll_interval
+        self.limiter = RateLimiter.for_tier(tier)
+        self.poller = poller or JobPoller(app, min_interval=poll_interval, tier=tier)
+        self.stats: dict[str, int] = {}
+
+    def existing_codes(self, coupon_id: str) -> IdSet:
+        """
+        Streams every code already created for the coupon into a compact set.
+        """
+        codes = iter_resources(
+            self.app.get_coupon_codes_for_coupon,
+            coupon_id,
+            fields_coupon_code="unique_code",
+        )
+        return IdSet.from_iterable(code["attributes"]["unique_code"] for code in codes)
+
+    def create(
+        self, coupon_id: str, codes: Iterable[str], expires_at: str | None = None
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Creates the given codes on a coupon, yielding each code that could not be
+        created.
+
+        Args:
+            coupon_id: The coupon the codes belong to.
+            codes: Codes to create, e.g. from `generate_codes`. Read lazily.
+            expires_at: Optional expiry datetime applied to every code.
+
+        Yields:
+            dict[str, Any]: `code`, the `job_id` it was submitted in (None if the job
+                could not be created or tracked) and the error `detail`, if Klaviyo gave
+                one. Counts of codes `submitted`, `skipped`, `created` and `failed` are
+                kept in `stats`.
+        """
+        self.stats = {"submitted": 0, "skipped": 0, "created": 0, "failed": 0}
+        existing = self.existing_codes(coupon_id)
+        batches = chunked(self._unique(codes, existing), MAX_COUPON_CODE_BATCH)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running: dict[Future, list[str]] = {}
+            while True:
+                for batch in batches:
+                    self.stats["submitted"] += len(batch)
+                    future = executor.submit(
+                        self._run_job, coupon_id, batch, expires_at
+                    )
+                    running[future] = batch
+                    if len(running) >= self.max_workers:
+                        break
+                if not running:
+                    return
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    batch = running.pop(future)
+                    try:
+                        created, failures = future.result()
+                    except Exception as e:
+                        logger.exception(
+                            f"Bulk creating {len(batch)} codes on coupon {coupon_id} "
+                            "failed"
+                        )
+                        created = 0
+                        failures = [
+                            {"code": code, "job_id": None, "detail": str(e)}
+                            for code in batch
+                        ]
+                    self.stats["created"] += created
+                    self.stats["failed"] += len(failures)
+                    yield from failures
+
+    def _unique(self, codes: Iterable[str], existing: IdSet) -> Iterator[str]:
+        seen: set[str] = set()
+        for code in codes:
+            if code in seen or code in existing:
+                self.stats["skipped"] += 1
+                continue
+            seen.add(code)
+            yield code
+
+    def _run_job(
+        self, coupon_id: str, codes: list[str], expires_at: str | None
+    ) -> tuple[int, list[dict[str, Any]]]:
+        extra = {"expires_at": expires_at} if expires_at else {}
+        data = {
+            "type": "coupon-code-bulk-create-job",
+            "attributes": {
+                "coupon-codes": {
+                    "data": [
+                        {
+                            "type": "coupon-code",
+                            "attributes": {"unique_code": code, **extra},
+                            "relationships": {
+                                "coupon": {"data": {"type": "coupon", "id": coupon_id}}
+                            },
+                        }
+                        for code in codes
+                    ]
+                }
+            },
+        }
+        self.limiter.acquire()
+        job_id = call_with_retry(self.app.bulk_create_coupon_codes, data=data)["data"][
+            "id"
+        ]
+        job = self.poller.watch("get_bulk_create_coupon_codes_job", job_id).result()[
+            "attributes"
+        ]
+        if not job.get("failed_count") and job.get("status") == "complete":
+            return len(codes), []
+
+        # Only pay for the per-code listing when something went wrong.
+        self.limiter.acquire()
+        document = call_with_retry(
+            self.app.get_bulk_create_coupon_codes_job,
+            job_id,
+            fields_coupon_code="unique_code",
+            include="coupon-codes",
+        )
+        created = {
+            code["attributes"]["unique_code"]
+            for code in document.get("included") or []
+            if code.get("type") == "coupon-code"
+        }
+        details = attribute_errors(
+            codes, document["data"]["attributes"].get("errors") or []
+        )
+        failures = []
+        for code in codes:
+            if code not in created:
+                detail = details.get(code)
+                if detail is None and job.get("status") != "complete":
+                    detail = f"Job {job_id} was {job.get('status')}"
+                failures.append({"code": code, "job_id": job_id, "detail": detail})
+        return len(codes) - len(failures), failures
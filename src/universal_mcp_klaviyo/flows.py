@@ -0,0 +1,159 @@
+from collections.abc import Iterable
+from typing import Any
+
+from universal_mcp_klaviyo.profiles import any_filter
+from universal_mcp_klaviyo.utils import (
+    RateLimiter,
+    call_with_retry,
+    chunked,
+    iter_pages,
+    run_concurrently,
+)
+
+Node = tuple[str, str]
+
+MAX_FLOWS_PER_PAGE = 50
+# Nested resources fetched one by one: (getter, relationship pulled in with include=).
+EXPANSIONS = {
+    "flow-action": ("get_flow_action", "flow-messages"),
+    "flow-message": ("get_flow_message", "template"),
+}
+
+
+def related_ids(resource: dict[str, Any], relation: str) -> list[Node]:
+    """
+    (type, id) pairs of a resource's relationship, in the order the API returned them.
+    """
+    data = ((resource.get("relationships") or {}).get(relation) or {}).get("data")
+    return [
+        (item["type"], item["id"])
+        for item in (data if isinstance(data, list) else [data] if data else [])
+    ]
+
+
+class FlowCrawler:
+    """
+    Fetches complete flow trees (flow -> actions -> messages -> template) breadth-first.
+
+    Flows are read 50 at a time with `get_flows` and `include=flow-actions`, then every
+    action of every flow is read concurrently with `include=flow-messages`, then every
+    message with `include=template`. Each level is one batch of concurrent requests, so
+    any number of flows costs three round-trip times plus listing pages, bounded by
+    `max_workers` and the flow endpoints' rate tier.
+
+    Args:
+        app: The KlaviyoApp instance to crawl through.
+        max_workers: Maximum number of requests in flight.
+        tier: Klaviyo rate tier of the flow endpoints.
+    """
+
+    def __init__(self, app: Any, max_workers: int = 8, tier: str = "M") -> None:
+        self.app = app
+        self.max_workers = max_workers
+        self.limiter = RateLimiter.for_tier(tier)
+
+    def fetch_level(self, nodes: Iterable[Node]) -> list[dict[str, Any]]:
+        """
+        Reads flow actions and messages concurrently, each with its children included.
+
+        Returns:
+            list[dict[str, Any]]: The response document of each node, in input order.
+        """
+
+        def fetch(node: Node) -> dict[str, Any]:
+            method, include = EXPANSIONS[node[0]]
+            return call_with_retry(getattr(self.app, method), node[1], include=include)
+
+        return run_concurrently(fetch, nodes, self.max_workers, self.limiter)
+
+    def crawl(
+        self, flow_ids: Iterable[str] | None = None, filter: str | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Fetches flow trees.
+
+        Args:
+            flow_ids: Flows to fetch. Defaults to every flow matching `filter`.
+            filter: `get_flows` filter used when `flow_ids` is not given, e.g.
+                `equals(status,"live")`.
+
+        Returns:
+            list[dict[str, Any]]: Flow resources, each with an `actions` list of action
+                resources, each with a `messages` list of message resources, each with
+                its `template` resource (or None).
+        """
+        if flow_ids is not None:
+            filters = [
+                any_filter("id", batch)
+                for batch in chunked(dict.fromkeys(flow_ids), MAX_FLOWS_PER_PAGE)
+            ]
+        else:
+            filters = [filter]
+
+        def list_flows(filter: str | None) -> list[dict[str, Any]]:
+            kwargs = {"include": "flow-actions", "page_size": MAX_FLOWS_PER_PAGE}
+            if filter is not None:
+                kwargs["filter"] = filter
+            return list(iter_pages(self.app.get_flows, **kwargs))
+
+        resources: dict[Node, dict[str, Any]] = {}
+        flows: list[Node] = []
+        for documents in run_concurrently(
+            list_flows, filters, self.max_workers, self.limiter
+        ):
+            for document in documents:
+                for flow in document.get("data") or []:
+                    flows.append((flow["type"], flow["id"]))
+                self._collect(resources, document)
+
+        frontier = [
+            node
+            for flow in flows
+            for node in related_ids(resources[flow], "flow-actions")
+        ]
+        while frontier:
+            level = list(
+                dict.fromkeys(node for node in frontier if node[0] in EXPANSIONS)
+            )
+            frontier = []
+            for node, document in zip(level, self.fetch_level(level)):
+                self._collect(resources, document)
+                frontier += related_ids(resources[node], EXPANSIONS[node[0]][1])
+
+        def message_tree(node: Node) -> dict[str, Any]:
+            template = next(iter(related_ids(resources[node], "template")), None)
+            return {
+                **resources[node],
+                "template": resources.get(template) if template else None,
+            }
+
+        def action_tree(node: Node) -> dict[str, Any]:
+            return {
+                **resources[node],
+                "messages": [
+                    message_tree(child)
+                    for child in related_ids(resources[node], "flow-messages")
+                ],
+            }
+
+        return [
+            {
+                **resources[flow],
+                "actions": [
+                    action_tree(child)
+                    for child in related_ids(resources[flow], "flow-actions")
+                ],
+            }
+            for flow in flows
+        ]
+
+    @staticmethod
+    def _collect(
+        resources: dict[Node, dict[str, Any]], document: dict[str, Any]
+    ) -> None:
+        data = document.get("data") or []
+        for resource in data if isinstance(data, list) else [data]:
+            resources[(resource["type"], resource["id"])] = resource
+        for resource in document.get("included") or []:
+            # Primary data carries relationship ids that included copies may lack.
+            resources.setdefault((resource["type"], resource["id"]), resource)
@@ -0,0 +1,279 @@
+import json
+import threading
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any
+
+from universal_mcp_klaviyo.flows import EXPANSIONS, FlowCrawler, Node
+from universal_mcp_klaviyo.utils import iter_pages, run_concurrently
+
+# Top-level collections: (listing method, relationships requested through include=).
+LISTINGS = {
+    "flow": ("get_flows", "tags,flow-actions"),
+    "list": ("get_lists", "flow-triggers,tags"),
+    "segment": ("get_segments", "flow-triggers,tags"),
+    "template": ("get_templates", None),
+    "tag": ("get_tags", None),
+}
+NODE_FIELDS = ("name", "status", "updated", "action_type", "trigger_type", "archived")
+
+
+class AccountGraph:
+    """
+    In-memory snapshot of how flows, actions, messages, templates, tags, lists and
+    segments relate.
+
+    `build` lists every top-level collection concurrently, asking for related ids with
+    `include=`, then walks flow actions and messages breadth-first with `FlowCrawler`,
+    one concurrent level at a time, fetching each node once. Edges are kept in both
+    directions so questions like "which flows use this template" are answered locally by
+    `reachable`. `refresh` re-reads only resources whose `updated` timestamp moved past
+    the last one seen, and `save` / `load` persist a snapshot as JSON.
+
+    Args:
+        app: The KlaviyoApp instance to crawl through.
+        max_workers: Maximum number of requests in flight.
+        tier: Klaviyo rate tier of the flow endpoints.
+    """
+
+    def __init__(self, app: Any, max_workers: int = 8, tier: str = "M") -> None:
+        self.app = app
+        self.max_workers = max_workers
+        self.crawler = FlowCrawler(app, max_workers, tier)
+        self.limiter = self.crawler.limiter
+        self.nodes: dict[Node, dict[str, Any]] = {}
+        self.marks: dict[str, str] = {}
+        self._out: dict[Node, dict[str, set[Node]]] = defaultdict(dict)
+        self._in: dict[Node, dict[str, set[Node]]] = defaultdict(
+            lambda: defaultdict(set)
+        )
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def build(self) -> "AccountGraph":
+        """
+        Crawls the whole account into the graph.
+        """
+        self._crawl({kind: None for kind in LISTINGS})
+        return self
+
+    def refresh(self) -> dict[str, int]:
+        """
+        Re-reads resources updated since the last build or refresh.
+
+        Flows that changed have their actions and messages re-crawled. Tags have no
+        `updated` timestamp and are always re-listed. Deleted resources are not
+        detected; remove them with `discard` or rebuild.
+
+        Returns:
+            dict[str, int]: Number of changed resources re-read per type.
+        """
+        filters = {
+            kind: f"greater-than(updated,{self.marks[kind]})"
+            if kind in self.marks
+            else None
+            for kind in LISTINGS
+        }
+        filters["tag"] = None
+        return self._crawl(filters)
+
+    def discard(self, kind: str, id: str) -> None:
+        """
+        Removes a resource, its edges and, for flows and actions, the nodes beneath it.
+        """
+        with self._lock:
+            self._drop_subtree((kind, id))
+            self._remove((kind, id))
+
+    def related(self, kind: str, id: str, relation: str | None = None) -> set[Node]:
+        """
+        Nodes this resource points to, e.g. `related("flow", id, "tags")`.
+        """
+        with self._lock:
+            edges = self._out.get((kind, id), {})
+            return {
+                node
+                for name, targets in edges.items()
+                if relation in (None, name)
+                for node in targets
+            }
+
+    def referrers(self, kind: str, id: str, relation: str | None = None) -> set[Node]:
+        """
+        Nodes pointing to this resource, e.g. `referrers("tag", id, "tags")` for
+        everything tagged with it.
+        """
+        with self._lock:
+            edges = self._in.get((kind, id), {})
+            return {
+                node
+                for name, sources in edges.items()
+                if relation in (None, name)
+                for node in sources
+            }
+
+    def reachable(
+        self, kind: str, id: str, target_kind: str, reverse: bool = False
+    ) -> set[str]:
+        """
+        Ids of every `target_kind` node reachable from a resource, following edges
+        backwards when `reverse`.
+        """
+        start = (kind, id)
+        seen, queue, found = {start}, deque([start]), set()
+        with self._lock:
+            while queue:
+                node = queue.popleft()
+                edges = (self._in if reverse else self._out).get(node, {})
+                for targets in list(edges.values()):
+                    for target in targets - seen:
+                        seen.add(target)
+                        if target[0] == target_kind:
+                            found.add(target[1])
+                        queue.append(target)
+        return found
+
+    def flows_using_template(self, template_id: str) -> set[str]:
+        return self.reachable("template", template_id, "flow", reverse=True)
+
+    def flow_triggers(self, flow_id: str) -> set[Node]:
+        """
+        Lists and segments whose membership triggers the flow.
+        """
+        return self.referrers("flow", flow_id, "flow-triggers")
+
+    def save(self, path: str | Path) -> None:
+        """
+        Writes the snapshot to a JSON file.
+        """
+        with self._lock:
+            snapshot = {
+                "marks": self.marks,
+                "nodes": [
+                    [kind, id, attributes]
+                    for (kind, id), attributes in self.nodes.items()
+                ],
+                "edges": [
+                    [*source, relation, *target]
+                    for source, edges in self._out.items()
+                    for relation, targets in edges.items()
+                    for target in sorted(targets)
+                ],
+            }
+        Path(path).write_text(json.dumps(snapshot, separators=(",", ":")))
+
+    @classmethod
+    def load(cls, app: Any, path: str | Path, **kwargs: Any) -> "AccountGraph":
+        """
+        Reads a snapshot written by `save`; call `refresh` to catch up with changes
+        since.
+        """
+        snapshot = json.loads(Path(path).read_text())
+        graph = cls(app, **kwargs)
+        graph.marks = snapshot["marks"]
+        graph.nodes = {
+            (kind, id): attributes for kind, id, attributes in snapshot["nodes"]
+        }
+        edges: dict[tuple[Node, str], set[Node]] = defaultdict(set)
+        for source_kind, source_id, relation, target_kind, target_id in snapshot[
+            "edges"
+        ]:
+            edges[((source_kind, source_id), relation)].add((target_kind, target_id))
+        for (source, relation), targets in edges.items():
+            graph._set_edges(source, relation, targets)
+        return graph
+
+    def _crawl(self, filters: dict[str, str | None]) -> dict[str, int]:
+        def list_collection(kind: str) -> list[dict[str, Any]]:
+            method, include = LISTINGS[kind]
+            kwargs = {
+                k: v
+                for k, v in (("include", include), ("filter", filters[kind]))
+                if v is not None
+            }
+            return list(iter_pages(getattr(self.app, method), **kwargs))
+
+        kinds = list(filters)
+        counts, frontier = {}, set()
+        for kind, documents in zip(
+            kinds,
+            run_concurrently(list_collection, kinds, self.max_workers, self.limiter),
+        ):
+            counts[kind] = 0
+            with self._lock:
+                for document in documents:
+                    for resource in document.get("data") or []:
+                        if kind == "flow":
+                            self._drop_subtree(("flow", resource["id"]))
+                        self._ingest(resource)
+                        counts[kind] += 1
+                        if kind == "flow":
+                            frontier |= self._out[("flow", resource["id"])].get(
+                                "flow-actions", set()
+                            )
+                    for resource in document.get("included") or []:
+                        self._ingest(resource, relations=False)
+        self._expand(frontier)
+        return counts
+
+    def _expand(self, frontier: set[Node]) -> None:
+        done: set[Node] = set()
+        while frontier:
+            level = sorted(node for node in frontier if node[0] in EXPANSIONS)
+            documents = self.crawler.fetch_level(level)
+            done.update(level)
+            frontier = set()
+            with self._lock:
+                for node, document in zip(level, documents):
+                    self._ingest(document["data"])
+                    for resource in document.get("included") or []:
+                        self._ingest(resource, relations=False)
+                    frontier |= self._out[node].get(EXPANSIONS[node[0]][1], set())
+            frontier -= done
+
+    def _ingest(self, resource: dict[str, Any], relations: bool = True) -> None:
+        node = (resource["type"], resource["id"])
+        attributes = resource.get("attributes") or {}
+        self.nodes[node] = {
+            field: attributes[field] for field in NODE_FIELDS if field in attributes
+        }
+        if relations and resource["type"] in LISTINGS and attributes.get("updated"):
+            self.marks[resource["type"]] = max(
+                self.marks.get(resource["type"], ""), attributes["updated"]
+            )
+        if not relations:
+            return
+        for relation, value in (resource.get("relationships") or {}).items():
+            if "data" not in value:
+                continue
+            data = value["data"]
+            targets = data if isinstance(data, list) else [data] if data else []
+            self._set_edges(
+                node, relation, {(target["type"], target["id"]) for target in targets}
+            )
+
+    def _set_edges(self, source: Node, relation: str, targets: set[Node]) -> None:
+        previous = self._out[source].get(relation, set())
+        for target in previous - targets:
+            self._in[target][relation].discard(source)
+        for target in targets - previous:
+            self._in[target][relation].add(source)
+        self._out[source][relation] = set(targets)
+
+    def _drop_subtree(self, node: Node) -> None:
+        # Actions and messages belong to exactly one flow, so they go with it.
+        for relation in ("flow-actions", "flow-messages"):
+            for child in list(self._out.get(node, {}).get(relation, ())):
+                self._drop_subtree(child)
+                self._remove(child)
+
+    def _remove(self, node: Node) -> None:
+        self.nodes.pop(node, None)
+        for relation in list(self._out.get(node, {})):
+            self._set_edges(node, relation, set())
+        self._out.pop(node, None)
+        for relation, sources in self._in.pop(node, {}).items():
+            for source in sources:
+                self._out[source][relation].discard(node)
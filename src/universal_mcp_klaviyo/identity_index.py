@@ -0,0 +1,177 @@
+import sqlite3
+import threading
+from collections.abc import Iterable
+from typing import Any
+
+from universal_mcp_klaviyo.profiles import normalize_identifier, resolve_profiles
+from universal_mcp_klaviyo.utils import chunked, iter_resources
+
+IDENTIFIER_KINDS = ("email", "phone_number", "external_id")
+
+
+class ProfileIdentityIndex:
+    """
+    Local email / phone number / external id -> profile id index backed by SQLite.
+
+    The index is filled by streaming `get_profiles`, kept fresh by feeding it the
+    profile documents returned by create and update calls (`observe`), and resolves
+    misses through `resolve_profiles`. Passing a file path makes it persistent and
+    memory-mapped; the default is an in-memory database.
+
+    Args:
+        app: The KlaviyoApp instance used to resolve misses.
+        path: SQLite database path, or ":memory:".
+    """
+
+    def __init__(self, app: Any, path: str = ":memory:") -> None:
+        self.app = app
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA mmap_size=268435456")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS identities ("
+                "kind TEXT NOT NULL, value TEXT NOT NULL, profile_id TEXT NOT NULL, "
+                "PRIMARY KEY (kind, value)) WITHOUT ROWID"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS identities_profile ON identities "
+                "(profile_id)"
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(DISTINCT profile_id) FROM identities"
+            ).fetchone()[0]
+
+    def close(self) -> None:
+        self._db.close()
+
+    def load(self, filter: str | None = None) -> int:
+        """
+        Streams profiles from `get_profiles` into the index.
+
+        Args:
+            filter: Optional `get_profiles` filter, e.g.
+                `greater-than(updated,2024-01-01T00:00:00Z)` to refresh only recently
+                changed profiles.
+
+        Returns:
+            int: Number of profiles indexed.
+        """
+        profiles = iter_resources(
+            self.app.get_profiles,
+            fields_profile=",".join(IDENTIFIER_KINDS),
+            filter=filter,
+            page_size=100,
+        )
+        count = 0
+        for batch in chunked(profiles, 1000):
+            self.add(batch)
+            count += len(batch)
+        return count
+
+    def add(self, profiles: Iterable[dict[str, Any]]) -> None:
+        """
+        Indexes profile resources, replacing any identifiers they previously mapped to.
+        """
+        rows, profile_ids = [], []
+        for profile in profiles:
+            if (
+                not profile
+                or profile.get("type", "profile") != "profile"
+                or not profile.get("id")
+            ):
+                continue
+            profile_ids.append((profile["id"],))
+            attributes = profile.get("attributes") or {}
+            for kind in IDENTIFIER_KINDS:
+                if attributes.get(kind):
+                    rows.append(
+                        (
+                            kind,
+                            normalize_identifier(kind, attributes[kind]),
+                            profile["id"],
+                        )
+                    )
+        with self._lock, self._db:
+            self._db.executemany(
+                "DELETE FROM identities WHERE profile_id = ?", profile_ids
+            )
+            self._db.executemany(
+                "INSERT OR REPLACE INTO identities VALUES (?, ?, ?)", rows
+            )
+
+    def observe(self, document: dict[str, Any] | None) -> None:
+        """
+        Indexes the profile(s) in a response document from `create_profile`,
+        `update_profile`, `create_or_update_profile` or `get_profiles`.
+        """
+        if not document:
+            return
+        data = document.get("data")
+        self.add(data if isinstance(data, list) else [data])
+
+    def forget(self, profile_ids: Iterable[str]) -> None:
+        """
+        Drops deleted or merged-away profiles from the index.
+        """
+        with self._lock, self._db:
+            self._db.executemany(
+                "DELETE FROM identities WHERE profile_id = ?",
+                [(id,) for id in profile_ids],
+            )
+
+    def lookup(self, kind: str, values: Iterable[str]) -> dict[str, str]:
+        """
+        Returns the indexed profile id of each value, omitting unknown values. No
+        requests are made.
+        """
+        keys = {normalize_identifier(kind, value): value for value in values}
+        found = {}
+        with self._lock:
+            for batch in chunked(keys, 500):
+                placeholders = ",".join("?" * len(batch))
+                query = (
+                    "SELECT value, profile_id FROM identities "
+                    f"WHERE kind = ? AND value IN ({placeholders})"
+                )
+                for value, profile_id in self._db.execute(query, [kind, *batch]):
+                    found[keys[value]] = profile_id
+        return found
+
+    def resolve(self, kind: str, values: Iterable[str]) -> dict[str, str]:
+        """
+        Returns profile ids for the given identifiers, fetching index misses from
+        Klaviyo.
+
+        Args:
+            kind: One of "email", "phone_number" or "external_id".
+            values: Identifiers to resolve.
+
+        Returns:
+            dict[str, str]: Identifier -> profile id. Identifiers with no profile are
+                omitted.
+        """
+        if kind not in IDENTIFIER_KINDS:
+            raise ValueError(
+                f"Unsupported identifier kind '{kind}', expected one of: "
+                f"{', '.join(IDENTIFIER_KINDS)}"
+            )
+        values = list(dict.fromkeys(values))
+        found = self.lookup(kind, values)
+        misses = [value for value in values if value not in found]
+        if misses:
+            resolution = resolve_profiles(
+                self.app, fields=",".join(IDENTIFIER_KINDS), **{f"{kind}s": misses}
+            )
+            self.add(resolution["found"][kind].values())
+            found.update(
+                {
+                    value: profile["id"]
+                    for value, profile in resolution["found"][kind].items()
+                }
+            )
+        return found
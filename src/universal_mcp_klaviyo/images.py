@@ -0,0 +1,404 @@
+import hashlib
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+from collections.abc import Iterable
+from typing import Any, BinaryIO
+
+import httpx
+
+from universal_mcp_klaviyo.utils import (
+    RateLimiter,
+    call_with_retry,
+    chunked,
+    iter_resources,
+    run_concurrently,
+)
+
+CHUNK_SIZE = 1 << 16
+# Files above this size are spooled to disk rather than memory when a stream has to be
+# replayed.
+SPOOL_SIZE = 8 << 20
+
+ImageSource = str | os.PathLike | BinaryIO
+
+
+def content_hash(file: ImageSource) -> str:
+    """
+    SHA-256 of a file's contents, read in chunks. File-like objects are rewound
+    afterwards.
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "rb") as f:
+            return content_hash(f)
+    start = file.tell()
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+        digest.update(chunk)
+    file.seek(start)
+    return digest.hexdigest()
+
+
+class ImageIndex:
+    """
+    Local index of the image library by name, URL and content hash, backed by SQLite.
+
+    The index is filled by streaming `get_images` and kept current by the upload
+    helpers, so repeated uploads of the same URL or content and image id lookups for
+    `update_image_for_campaign_message` are answered without any request. URLs match
+    both Klaviyo's hosted `image_url` and the source URL an image was imported from.
+    Content hashes of existing images are learned by downloading them, on request.
+    Passing a file path makes the index persistent.
+
+    Args:
+        app: The KlaviyoApp instance to call through.
+        path: SQLite database path, or ":memory:".
+        downloader: HTTP client used to fetch images from their public URLs. Klaviyo
+            credentials are never sent to it.
+        max_workers: Maximum number of downloads or uploads in flight.
+        tier: Klaviyo rate tier of the image upload endpoints.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        path: str = ":memory:",
+        downloader: httpx.Client | None = None,
+        max_workers: int = 4,
+        tier: str = "S",
+    ) -> None:
+        self.app = app
+        self.downloader = downloader or httpx.Client(
+            follow_redirects=True, timeout=60.0
+        )
+        self.max_workers = max_workers
+        self.limiter = RateLimiter.for_tier(tier)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS images ("
+                "id TEXT PRIMARY KEY, name TEXT, image_url TEXT, source_url TEXT, "
+                "sha256 TEXT, updated_at TEXT)"
+            )
+            for column in ("name", "image_url", "source_url", "sha256"):
+                self._db.execute(
+                    f"CREATE INDEX IF NOT EXISTS images_{column} ON images ({column})"
+                )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM images").fetchone()[0]
+
+    def close(self) -> None:
+        self._db.close()
+
+    def load(self, filter: str | None = None, hash_content: bool = False) -> int:
+        """
+        Streams images from `get_images` into the index.
+
+        Args:
+            filter: Optional `get_images` filter, e.g.
+                `greater-than(updated_at,2024-01-01T00:00:00Z)` to refresh only recently
+                changed images.
+            hash_content: Also download and hash indexed images whose content hash is
+                unknown.
+
+        Returns:
+            int: Number of images indexed.
+        """
+        images = iter_resources(
+            self.app.get_images,
+            fields_image="name,image_url,updated_at",
+            filter=filter,
+            page_size=100,
+        )
+        count = 0
+        for batch in chunked(images, 1000):
+            for image in batch:
+                self.add(image)
+            count += len(batch)
+        if hash_content:
+            self.hash_missing()
+        return count
+
+    def hash_missing(self) -> int:
+        """
+        Downloads every indexed image without a content hash and records its SHA-256.
+
+        Returns:
+            int: Number of images hashed.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, image_url FROM images WHERE sha256 IS NULL AND image_url "
+                "IS NOT NULL"
+            ).fetchall()
+
+        def download(row: tuple[str, str]) -> str:
+            digest = hashlib.sha256()
+            with self.downloader.stream("GET", row[1]) as response:
+                response.raise_for_status()
+                for chunk in response.iter_bytes(CHUNK_SIZE):
+                    digest.update(chunk)
+            return digest.hexdigest()
+
+        hashes = run_concurrently(download, rows, self.max_workers)
+        with self._lock, self._db:
+            self._db.executemany(
+                "UPDATE images SET sha256 = ? WHERE id = ?",
+                [(sha256, row[0]) for row, sha256 in zip(rows, hashes)],
+            )
+        return len(rows)
+
+    def add(
+        self,
+        image: dict[str, Any],
+        sha256: str | None = None,
+        source_url: str | None = None,
+    ) -> None:
+        """
+        Indexes an image resource, keeping previously learned hashes and source URLs
+        unless new ones are given.
+        """
+        attributes = image.get("attributes") or {}
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO images (id, name, image_url, source_url, sha256, "
+                "updated_at) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET name = excluded.name, image_url = "
+                "excluded.image_url, "
+                "source_url = COALESCE(excluded.source_url, source_url), sha256 = "
+                "COALESCE(excluded.sha256, sha256), "
+                "updated_at = excluded.updated_at",
+                (
+                    image["id"],
+                    attributes.get("name"),
+                    attributes.get("image_url"),
+                    source_url,
+                    sha256,
+                    attributes.get("updated_at"),
+                ),
+            )
+
+    def forget(self, image_ids: Iterable[str]) -> None:
+        with self._lock, self._db:
+            self._db.executemany(
+                "DELETE FROM images WHERE id = ?", [(id,) for id in image_ids]
+            )
+
+    def find(
+        self, name: str | None = None, url: str | None = None, sha256: str | None = None
+    ) -> str | None:
+        """
+        Returns the id of an indexed image matching the content hash, URL or name, tried
+        in that order. No requests are made.
+        """
+        queries = [
+            ("sha256 = ?", sha256),
+            ("image_url = ? OR source_url = ?", url),
+            ("name = ?", name),
+        ]
+        with self._lock:
+            for condition, value in queries:
+                if value is None:
+                    continue
+                row = self._db.execute(
+                    f"SELECT id FROM images WHERE {condition} ORDER BY updated_at DESC "
+                    "LIMIT 1",
+                    [value] * condition.count("?"),
+                ).fetchone()
+                if row:
+                    return row[0]
+        return None
+
+    def upload_from_url(
+        self, url: str, name: str | None = None, hidden: bool | None = None
+    ) -> dict[str, Any]:
+        """
+        Imports an image with `upload_image_from_url` unless the URL is already in the
+        library.
+
+        Returns:
+            dict[str, Any]: The image `id` and whether it was `uploaded`.
+        """
+        image_id = self.find(url=url)
+        if image_id is not None:
+            return {"id": image_id, "uploaded": False}
+        attributes = {
+            k: v
+            for k, v in (("import_from_url", url), ("name", name), ("hidden", hidden))
+            if v is not None
+        }
+        self.limiter.acquire()
+        document = call_with_retry(
+            self.app.upload_image_from_url,
+            data={"type": "image", "attributes": attributes},
+        )
+        self.add(document["data"], source_url=url)
+        return {"id": document["data"]["id"], "uploaded": True}
+
+    def set_campaign_message_image(
+        self,
+        message_id: str,
+        name: str | None = None,
+        url: str | None = None,
+        sha256: str | None = None,
+    ) -> str:
+        """
+        Points a campaign message at an image found in the index, via
+        `update_image_for_campaign_message`.
+
+        Returns:
+            str: The image id used.
+
+        Raises:
+            LookupError: If no indexed image matches.
+        """
+        image_id = self.find(name=name, url=url, sha256=sha256)
+        if image_id is None:
+            raise LookupError(
+                f"No indexed image matches name={name!r}, url={url!r}, "
+                f"sha256={sha256!r}"
+            )
+        call_with_retry(
+            self.app.update_image_for_campaign_message,
+            message_id,
+            data={"type": "image", "id": image_id},
+        )
+        return image_id
+
+
+class ImageUploader:
+    """
+    Uploads local image files to Klaviyo concurrently, skipping content it already has.
+
+    Each file is hashed in a streaming pass and uploaded in a second one through
+    `upload_image_from_file`, so files are never held in memory whole. Files whose
+    SHA-256 is already in the `ImageIndex`, or matches an earlier file of the same
+    batch, are not uploaded again and resolve to the existing image id.
+
+    Args:
+        app: The KlaviyoApp instance to upload through.
+        index: Image index consulted and updated by uploads. Defaults to an empty
+            in-memory index.
+        max_workers: Maximum number of uploads in flight.
+        tier: Klaviyo rate tier of the image upload endpoint.
+        downloader: HTTP client for the default index, see `ImageIndex`.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        index: ImageIndex | None = None,
+        max_workers: int = 4,
+        tier: str = "S",
+        downloader: httpx.Client | None = None,
+    ) -> None:
+        self.app = app
+        self.index = index or ImageIndex(
+            app, downloader=downloader, max_workers=max_workers, tier=tier
+        )
+        self.max_workers = max_workers
+        self.limiter = self.index.limiter
+
+    def load_existing(self, filter: str | None = None) -> int:
+        """
+        Indexes and hashes the images already in the library so uploads of the same
+        content are skipped.
+        """
+        return self.index.load(filter=filter, hash_content=True)
+
+    def upload(
+        self, file: ImageSource, name: str | None = None, hidden: bool | None = None
+    ) -> dict[str, Any]:
+        """
+        Uploads one image unless its content is already known.
+
+        Returns:
+            dict[str, Any]: The image `id`, its `sha256` and whether it was `uploaded`.
+        """
+        return self.upload_many([file], names=[name], hidden=hidden)[0]
+
+    def upload_many(
+        self,
+        files: Iterable[ImageSource],
+        names: Iterable[str | None] | None = None,
+        hidden: bool | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Uploads a batch of images concurrently, once per distinct content.
+
+        Args:
+            files: Paths or binary file-like objects. Unseekable streams are spooled to
+                a temporary file.
+            names: Optional image name per file. Defaults to the file names.
+            hidden: If true, the images are not shown in the image library.
+
+        Returns:
+            list[dict[str, Any]]: For each input, in order, the image `id`, its `sha256`
+                and whether it was `uploaded`.
+        """
+        files = list(files)
+        names = list(names) if names is not None else [None] * len(files)
+        sources = [self._replayable(file) for file in files]
+        for index, (file, source) in enumerate(zip(files, sources)):
+            if names[index] is None and source is not file:
+                # Spooled copies lose the original file name.
+                names[index] = (
+                    os.path.basename(getattr(file, "name", None) or "") or None
+                )
+        hashes = run_concurrently(content_hash, sources, self.max_workers)
+        ids = {
+            sha256: self.index.find(sha256=sha256) for sha256 in dict.fromkeys(hashes)
+        }
+        pending = {}
+        for index, sha256 in enumerate(hashes):
+            if ids[sha256] is None:
+                pending.setdefault(sha256, index)
+
+        def send(item: tuple[str, int]) -> dict[str, Any]:
+            _, index = item
+            source = sources[index]
+            start = None if isinstance(source, (str, os.PathLike)) else source.tell()
+
+            def attempt() -> dict[str, Any]:
+                # A failed attempt may have consumed part of the stream.
+                if start is not None:
+                    source.seek(start)
+                return self.app.upload_image_from_file(
+                    source, name=names[index], hidden=hidden
+                )
+
+            return call_with_retry(attempt)["data"]
+
+        try:
+            for sha256, image in zip(
+                pending,
+                run_concurrently(send, pending.items(), self.max_workers, self.limiter),
+            ):
+                self.index.add(image, sha256=sha256)
+                ids[sha256] = image["id"]
+        finally:
+            for file, source in zip(files, sources):
+                if source is not file:
+                    source.close()
+        uploaded = set(pending.values())
+        return [
+            {"id": ids[sha256], "sha256": sha256, "uploaded": index in uploaded}
+            for index, sha256 in enumerate(hashes)
+        ]
+
+    @staticmethod
+    def _replayable(file: ImageSource) -> ImageSource:
+        if isinstance(file, (str, os.PathLike)) or (
+            hasattr(file, "seekable") and file.seekable()
+        ):
+            return file
+        spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+        shutil.copyfileobj(file, spool, CHUNK_SIZE)
+        spool.seek(0)
+        return spool
@@ -0,0 +1,379 @@
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import Any
+
+import httpx
+from loguru import logger
+
+from universal_mcp_klaviyo.utils import (
+    RETRYABLE_STATUS_CODES,
+    RateLimiter,
+    iter_pages,
+    retry_after,
+    run_concurrently,
+)
+
+TERMINAL_JOB_STATUSES = {"complete", "cancelled", "failed"}
+_PROCESSING = 'equals(status,"processing")'
+# Status getter -> (list variant, filter selecting unfinished jobs). Most list variants
+# only filter on one status, so queued jobs are still read one by one.
+BATCH_LISTINGS = {
+    "get_bulk_import_profiles_job": (
+        "get_bulk_import_profiles_jobs",
+        'any(status,["queued","processing"])',
+    ),
+    "get_bulk_suppress_profiles_job": ("get_bulk_suppress_profiles_jobs", _PROCESSING),
+    "get_bulk_unsuppress_profiles_job": (
+        "get_bulk_unsuppress_profiles_jobs",
+        _PROCESSING,
+    ),
+    "get_bulk_create_catalog_items_job": (
+        "get_bulk_create_catalog_items_jobs",
+        _PROCESSING,
+    ),
+    "get_bulk_update_catalog_items_job": (
+        "get_bulk_update_catalog_items_jobs",
+        _PROCESSING,
+    ),
+    "get_bulk_delete_catalog_items_job": (
+        "get_bulk_delete_catalog_items_jobs",
+        _PROCESSING,
+    ),
+    "get_create_variants_job": ("get_create_variants_jobs", _PROCESSING),
+    "get_update_variants_job": ("get_update_variants_jobs", _PROCESSING),
+    "get_delete_variants_job": ("get_delete_variants_jobs", _PROCESSING),
+    "get_create_categories_job": ("get_create_categories_jobs", _PROCESSING),
+    "get_update_categories_job": ("get_update_categories_jobs", _PROCESSING),
+    "get_delete_categories_job": ("get_delete_categories_jobs", _PROCESSING),
+    "get_bulk_create_coupon_codes_job": (
+        "get_bulk_create_coupon_code_jobs",
+        _PROCESSING,
+    ),
+}
+
+JobCallback = Callable[[dict[str, Any]], None]
+
+
+def job_progress(attributes: dict[str, Any]) -> tuple[Any, ...]:
+    """
+    Comparable snapshot of a job's progress: its status and every `*_count` attribute.
+    """
+    counts = tuple(
+        sorted(
+            (key, value) for key, value in attributes.items() if key.endswith("_count")
+        )
+    )
+    return (attributes.get("status"), counts)
+
+
+class _Watch:
+    def __init__(self, getter: str, job_id: str, interval: float) -> None:
+        self.getter = getter
+        self.job_id = job_id
+        self.future: Future = Future()
+        self.callbacks: list[JobCallback] = []
+        self.interval = interval
+        self.due = time.monotonic() + interval
+        self.progress: tuple[Any, ...] | None = None
+        self.checked: float | None = None
+        self.completed: int | None = None
+        self.errors = 0
+
+
+class JobPoller:
+    """
+    Polls any number of asynchronous Klaviyo jobs from one background thread.
+
+    Jobs are registered with `watch` together with the name of their status getter
+    (`get_campaign_send_job`, `get_bulk_import_profiles_job`, ...). Each job has its own
+    check interval: it starts at `min_interval`, is re-aimed at half the estimated time
+    to completion while `completed_count` advances, drops back to `min_interval` on any
+    other change, and grows by `backoff` up to `max_interval` while nothing moves.
+    Checks that fall due together are sent concurrently under one rate limiter, so many
+    waiting jobs cost few requests and one thread. When several jobs of a type in
+    `BATCH_LISTINGS` are watched, a due check is made with one call to the type's list
+    variant, which refreshes all of them, and only due jobs missing from it, typically
+    finished ones, are read individually. Server hints are honoured: a 429 pauses all
+    checks for its Retry-After, and other transient failures push the job's next check
+    back instead of failing it until `max_errors` in a row.
+
+    Args:
+        app: The KlaviyoApp instance to poll through.
+        min_interval: Shortest delay between two checks of a job, in seconds.
+        max_interval: Longest delay between two checks of a job, in seconds.
+        backoff: Factor the delay grows by after a check that saw no progress.
+        max_errors: Consecutive transient failures tolerated per job before its future
+            fails.
+        max_workers: Maximum number of checks in flight.
+        tier: Klaviyo rate tier of the job endpoints.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        min_interval: float = 0.5,
+        max_interval: float = 30.0,
+        backoff: float = 2.0,
+        max_errors: int = 5,
+        max_workers: int = 4,
+        tier: str = "M",
+    ) -> None:
+        self.app = app
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.max_errors = max_errors
+        self.max_workers = max_workers
+        self.limiter = RateLimiter.for_tier(tier)
+        self.checks = 0
+        self.listings = 0
+        self._paused_until = 0.0
+        self._watches: dict[tuple[str, str], _Watch] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._watches)
+
+    def __enter__(self) -> "JobPoller":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def watch(
+        self, getter: str, job_id: str, on_update: JobCallback | None = None
+    ) -> Future:
+        """
+        Starts polling a job until it reaches a terminal status, starting the background
+        thread if needed.
+
+        Args:
+            getter: Name of the KlaviyoApp status getter, e.g. "get_campaign_send_job".
+            job_id: The job id.
+            on_update: Called with the job resource whenever its progress changes.
+
+        Returns:
+            Future: Resolves to the job resource once its status is terminal, or to the
+                error that stopped polling. Watching a job twice returns the same
+                future.
+        """
+        with self._lock:
+            watch = self._watches.get((getter, job_id))
+            if watch is None:
+                watch = self._watches[(getter, job_id)] = _Watch(
+                    getter, job_id, self.min_interval
+                )
+            if on_update is not None:
+                watch.callbacks.append(on_update)
+        self.start()
+        self._wake.set()
+        return watch.future
+
+    def unwatch(self, getter: str, job_id: str) -> None:
+        """
+        Stops polling a job and cancels its future.
+        """
+        with self._lock:
+            watch = self._watches.pop((getter, job_id), None)
+        if watch is not None:
+            watch.future.cancel()
+
+    def start(self) -> None:
+        """
+        Starts the background thread.
+        """
+        with self._lock:
+            if self._thread is None:
+                self._stopped.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name="klaviyo-job-poller", daemon=True
+                )
+                self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops the background thread; jobs still watched keep their state for a later
+        `start`.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stopped.set()
+            self._wake.set()
+            thread.join()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            now = time.monotonic()
+            with self._lock:
+                due = [watch for watch in self._watches.values() if watch.due <= now]
+                upcoming = min(
+                    (watch.due for watch in self._watches.values()), default=None
+                )
+            if now < self._paused_until:
+                self._wake.wait(self._paused_until - now)
+                self._wake.clear()
+                continue
+            if not due:
+                self._wake.wait(None if upcoming is None else upcoming - now)
+                self._wake.clear()
+                continue
+            try:
+                self._check_due(due)
+            except Exception:
+                logger.exception("Checking Klaviyo jobs failed")
+                # Push the failed round back so the loop does not spin on it.
+                for watch in due:
+                    watch.due = max(watch.due, time.monotonic() + watch.interval)
+
+    def _check_due(self, due: list[_Watch]) -> None:
+        groups: dict[str, list[_Watch]] = defaultdict(list)
+        for watch in due:
+            groups[watch.getter].append(watch)
+        with self._lock:
+            watched = defaultdict(int)
+            for getter, _ in self._watches:
+                watched[getter] += 1
+        batched = {
+            getter
+            for getter in groups
+            if getter in BATCH_LISTINGS and watched[getter] > 1
+        }
+        batches = [groups[getter] for getter in batched]
+        singles = [
+            watch
+            for getter, watches in groups.items()
+            if getter not in batched
+            for watch in watches
+        ]
+        for missing in run_concurrently(
+            self._check_listing, batches, self.max_workers, self.limiter
+        ):
+            singles += missing
+        run_concurrently(self._check, singles, self.max_workers, self.limiter)
+
+    def _check_listing(self, watches: list[_Watch]) -> list[_Watch]:
+        # One listing refreshes every watched job of the type; due jobs missing from it
+        # are returned.
+        getter = watches[0].getter
+        method, filter = BATCH_LISTINGS[getter]
+        try:
+            jobs = {
+                job["id"]: job
+                for document in iter_pages(
+                    getattr(self.app, method), max_retries=0, filter=filter
+                )
+                for job in document.get("data") or []
+            }
+        except (httpx.HTTPStatusError, httpx.TransportError) as e:
+            delay = self._hint(e)
+            if delay is None:
+                # The list variant rejected the request, e.g. an unsupported filter:
+                # read the jobs one by one.
+                return watches
+            for watch in watches:
+                watch.due = time.monotonic() + max(delay, watch.interval)
+            return []
+        except Exception:
+            # A malformed listing must not stall the jobs: read them one by one.
+            logger.exception(f"Listing {method} failed")
+            return watches
+        self.listings += 1
+        with self._lock:
+            listed = [
+                watch
+                for (kind, job_id), watch in self._watches.items()
+                if kind == getter and job_id in jobs
+            ]
+        for watch in listed:
+            self._observe(watch, jobs[watch.job_id])
+        return [watch for watch in watches if watch.job_id not in jobs]
+
+    def _check(self, watch: _Watch) -> None:
+        try:
+            job = getattr(self.app, watch.getter)(watch.job_id)["data"]
+        except (httpx.HTTPStatusError, httpx.TransportError) as e:
+            delay = self._hint(e)
+            watch.errors += 1
+            if delay is None or watch.errors > self.max_errors:
+                self._finish(watch, error=e)
+            else:
+                watch.due = time.monotonic() + max(delay, watch.interval * self.backoff)
+            return
+        except Exception as e:
+            self._finish(watch, error=e)
+            return
+        self.checks += 1
+        watch.errors = 0
+        self._observe(watch, job)
+
+    def _hint(self, error: Exception) -> float | None:
+        # Seconds to wait after a transient failure, or None if it is permanent.
+        if isinstance(error, httpx.TransportError):
+            return self.min_interval
+        status = error.response.status_code
+        if status not in RETRYABLE_STATUS_CODES:
+            return None
+        delay = retry_after(error.response, self.min_interval)
+        if status == httpx.codes.TOO_MANY_REQUESTS:
+            # Throttling applies to every job of the tier, so all checks pause.
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        return delay
+
+    def _observe(self, watch: _Watch, job: dict[str, Any]) -> None:
+        attributes = job.get("attributes") or {}
+        now = time.monotonic()
+        progress = job_progress(attributes)
+        completed, total = (
+            attributes.get("completed_count"),
+            attributes.get("total_count"),
+        )
+        if progress != watch.progress:
+            if (
+                watch.completed is not None
+                and completed is not None
+                and total
+                and completed > watch.completed
+            ):
+                # Aim the next check at half the remaining time at the observed rate.
+                rate = (completed - watch.completed) / (now - watch.checked)
+                watch.interval = (total - completed) / rate / 2
+            else:
+                watch.interval = self.min_interval
+            for callback in list(watch.callbacks):
+                try:
+                    callback(job)
+                except Exception:
+                    logger.exception(
+                        f"Job update callback failed for {watch.getter}({watch.job_id})"
+                    )
+        else:
+            watch.interval *= self.backoff
+        watch.interval = min(self.max_interval, max(self.min_interval, watch.interval))
+        watch.progress, watch.checked, watch.completed = progress, now, completed
+        watch.due = now + watch.interval
+        if attributes.get("status") in TERMINAL_JOB_STATUSES:
+            self._finish(watch, job=job)
+
+    def _finish(
+        self,
+        watch: _Watch,
+        job: dict[str, Any] | None = None,
+        error: Exception | None = None,
+    ) -> None:
+        with self._lock:
+            self._watches.pop((watch.getter, watch.job_id), None)
+        if watch.future.done():
+            return
+        if error is not None:
+            watch.future.set_exception(error)
+        else:
+            watch.future.set_result(job)
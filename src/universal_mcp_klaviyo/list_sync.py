@@ -0,0 +1,155 @@
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+import numpy as np
+
+from universal_mcp_klaviyo.utils import (
+    RateLimiter,
+    call_with_retry,
+    chunked,
+    iter_resources,
+    run_concurrently,
+)
+
+MAX_RELATIONSHIP_BATCH = 1000
+MAX_PAGE_SIZE = 100
+
+
+class IdSet:
+    """
+    Sorted, de-duplicated set of ids stored as one fixed-width byte array.
+
+    Klaviyo ids are 26-character ULIDs, so a million members take ~26 MB instead of the
+    ~100 MB a Python set of strings would. Membership tests are binary searches and set
+    differences are vectorized merges.
+    """
+
+    def __init__(self, ids: np.ndarray | None = None) -> None:
+        self.ids = ids if ids is not None else np.array([], dtype="S1")
+
+    @classmethod
+    def from_iterable(cls, ids: Iterable[str], chunk_size: int = 100_000) -> "IdSet":
+        """
+        Builds a set from a stream of ids without holding them all as Python strings.
+        """
+        chunks, pending = [], []
+        for id in ids:
+            pending.append(id.encode())
+            if len(pending) == chunk_size:
+                chunks.append(np.unique(np.array(pending, dtype=bytes)))
+                pending = []
+        if pending:
+            chunks.append(np.unique(np.array(pending, dtype=bytes)))
+        if not chunks:
+            return cls()
+        return cls(np.unique(np.concatenate(chunks)))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, id: str) -> bool:
+        key = id.encode()
+        index = np.searchsorted(self.ids, key)
+        return bool(index < len(self.ids) and self.ids[index] == key)
+
+    def __iter__(self) -> Iterator[str]:
+        return (id.decode() for id in self.ids)
+
+    def __sub__(self, other: "IdSet") -> "IdSet":
+        return IdSet(np.setdiff1d(self.ids, other.ids, assume_unique=True))
+
+    def __or__(self, other: "IdSet") -> "IdSet":
+        return IdSet(np.union1d(self.ids, other.ids))
+
+    def __and__(self, other: "IdSet") -> "IdSet":
+        return IdSet(np.intersect1d(self.ids, other.ids, assume_unique=True))
+
+
+class ListSynchronizer:
+    """
+    Reconciles a Klaviyo list's membership with a target set of profile ids.
+
+    The current membership is streamed from `get_profile_ids_for_list` into an `IdSet`,
+    diffed against the target, and the differences are submitted through
+    `add_profiles_to_list` / `remove_profiles_from_list` in batches of the maximum
+    relationship size, concurrently under the endpoint's rate tier.
+
+    Args:
+        app: The KlaviyoApp instance to call through.
+        batch_size: Profiles per relationship request (Klaviyo allows up to 1000).
+        max_workers: Maximum number of requests in flight.
+        tier: Klaviyo rate tier of the list relationship endpoints.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        batch_size: int = MAX_RELATIONSHIP_BATCH,
+        max_workers: int = 4,
+        tier: str = "M",
+    ) -> None:
+        self.app = app
+        self.batch_size = min(batch_size, MAX_RELATIONSHIP_BATCH)
+        self.max_workers = max_workers
+        self.limiter = RateLimiter.for_tier(tier)
+
+    def current_members(self, list_id: str) -> IdSet:
+        """
+        Streams every profile id currently in the list into a compact set.
+        """
+        profiles = iter_resources(
+            self.app.get_profile_ids_for_list, list_id, page_size=MAX_PAGE_SIZE
+        )
+        return IdSet.from_iterable(profile["id"] for profile in profiles)
+
+    def plan(
+        self, list_id: str, target_ids: Iterable[str] | IdSet
+    ) -> tuple[IdSet, IdSet]:
+        """
+        Computes the profiles to add to and remove from the list.
+
+        Returns:
+            tuple[IdSet, IdSet]: (ids to add, ids to remove).
+        """
+        target = (
+            target_ids
+            if isinstance(target_ids, IdSet)
+            else IdSet.from_iterable(target_ids)
+        )
+        current = self.current_members(list_id)
+        return target - current, current - target
+
+    def sync(
+        self, list_id: str, target_ids: Iterable[str] | IdSet, remove: bool = True
+    ) -> dict[str, int]:
+        """
+        Makes the list's membership equal to `target_ids`.
+
+        Args:
+            list_id: The list to reconcile.
+            target_ids: Profile ids that should be members.
+            remove: When False, members missing from the target are left in place.
+
+        Returns:
+            dict[str, int]: Number of profiles `added` and `removed`.
+        """
+        to_add, to_remove = self.plan(list_id, target_ids)
+        if not remove:
+            to_remove = IdSet()
+        batches = [
+            (self.app.add_profiles_to_list, batch)
+            for batch in chunked(to_add, self.batch_size)
+        ]
+        batches += [
+            (self.app.remove_profiles_from_list, batch)
+            for batch in chunked(to_remove, self.batch_size)
+        ]
+
+        def submit(job: tuple[Any, list[str]]) -> None:
+            method, ids = job
+            call_with_retry(
+                method, list_id, data=[{"type": "profile", "id": id} for id in ids]
+            )
+
+        run_concurrently(submit, batches, self.max_workers, self.limiter)
+        return {"added": len(to_add), "removed": len(to_remove)}
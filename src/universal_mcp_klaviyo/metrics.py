@@ -0,0 +1,353 @@
+import sys
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+import httpx
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# httpcore trace events delimiting each transport phase. Name resolution happens inside
+# connect_tcp, so DNS time is reported as part of "connect".
+_PHASE_EVENTS = {
+    "connect": ("connection.connect_tcp.started", "connection.connect_tcp.complete"),
+    "tls": ("connection.start_tls.started", "connection.start_tls.complete"),
+    "server": ("send_request_headers.started", "receive_response_headers.complete"),
+    "download": ("receive_response_body.started", "receive_response_body.complete"),
+}
+# "decode" times `response.json()` once the body has been received.
+PHASES = (*_PHASE_EVENTS, "decode")
+
+
+class Histogram:
+    """
+    Cumulative latency histogram with Prometheus-style upper bounds.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        cumulative, running = {}, 0
+        for bound, count in zip((*self.buckets, float("inf")), self.counts):
+            running += count
+            cumulative[str(bound)] = running
+        return {"buckets": cumulative, "sum": self.sum, "count": self.count}
+
+
+class OperationStats:
+    """
+    Everything recorded for one KlaviyoApp method.
+    """
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.latency = Histogram(buckets)
+        self.phases: dict[str, Histogram] = {
+            phase: Histogram(buckets) for phase in PHASES
+        }
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.status_codes: dict[int, int] = {}
+        self.retries = 0
+        self.rate_limit_limit: int | None = None
+        self.rate_limit_remaining: int | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "latency": self.latency.as_dict(),
+            "phases": {
+                name: hist.as_dict() for name, hist in self.phases.items() if hist.count
+            },
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+            "status_codes": dict(self.status_codes),
+            "retries": self.retries,
+            "rate_limit_limit": self.rate_limit_limit,
+            "rate_limit_remaining": self.rate_limit_remaining,
+        }
+
+
+class MetricsRegistry:
+    """
+    Thread-safe in-memory store of per-operation request metrics.
+
+    Listeners registered with `add_listener` receive every observation as it is
+    recorded, which is how external backends such as OpenTelemetry are fed.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self._operations: dict[str, OperationStats] = {}
+        self._listeners: list[Callable[[str, dict[str, Any]], None]] = []
+        self._lock = threading.Lock()
+
+    def _stats(self, operation: str) -> OperationStats:
+        stats = self._operations.get(operation)
+        if stats is None:
+            stats = self._operations[operation] = OperationStats(self.buckets)
+        return stats
+
+    def add_listener(self, listener: Callable[[str, dict[str, Any]], None]) -> None:
+        self._listeners.append(listener)
+
+    def record_request(
+        self,
+        operation: str,
+        latency: float,
+        status_code: int,
+        request_bytes: int = 0,
+        response_bytes: int = 0,
+        phases: dict[str, float] | None = None,
+        rate_limit_limit: int | None = None,
+        rate_limit_remaining: int | None = None,
+    ) -> None:
+        with self._lock:
+            stats = self._stats(operation)
+            stats.latency.observe(latency)
+            for phase, seconds in (phases or {}).items():
+                stats.phases[phase].observe(seconds)
+            stats.request_bytes += request_bytes
+            stats.response_bytes += response_bytes
+            stats.status_codes[status_code] = stats.status_codes.get(status_code, 0) + 1
+            if rate_limit_remaining is not None:
+                stats.rate_limit_limit = rate_limit_limit
+                stats.rate_limit_remaining = rate_limit_remaining
+        observation = {
+            "latency": latency,
+            "status_code": status_code,
+            "request_bytes": request_bytes,
+            "response_bytes": response_bytes,
+            "phases": phases or {},
+            "rate_limit_remaining": rate_limit_remaining,
+        }
+        for listener in self._listeners:
+            listener(operation, observation)
+
+    def record_phase(self, operation: str, phase: str, seconds: float) -> None:
+        """
+        Records a phase measured after the request itself was recorded, such as
+        decoding.
+        """
+        with self._lock:
+            self._stats(operation).phases[phase].observe(seconds)
+        for listener in self._listeners:
+            listener(operation, {"phase": phase, "seconds": seconds})
+
+    def record_retry(self, operation: str) -> None:
+        with self._lock:
+            self._stats(operation).retries += 1
+        for listener in self._listeners:
+            listener(operation, {"retry": True})
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            return {name: stats.as_dict() for name, stats in self._operations.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._operations.clear()
+
+
+def _header_int(headers: httpx.Headers, name: str) -> int | None:
+    value = headers.get(name)
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _body_size(message: httpx.Request | httpx.Response) -> int:
+    try:
+        return len(message.content)
+    except (httpx.RequestNotRead, httpx.ResponseNotRead):
+        return 0
+
+
+def _operation_name(app: Any, request: httpx.Request) -> str:
+    """
+    Finds the public KlaviyoApp method that issued the request by walking the stack.
+    """
+    frame = sys._getframe(2)
+    while frame is not None:
+        if frame.f_locals.get("self") is app and not frame.f_code.co_name.startswith(
+            "_"
+        ):
+            return frame.f_code.co_name
+        frame = frame.f_back
+    return f"{request.method} {request.url.path}"
+
+
+def instrument(app: Any, registry: MetricsRegistry | None = None) -> MetricsRegistry:
+    """
+    Records metrics for every request sent through the app's HTTP client.
+
+    Args:
+        app: The KlaviyoApp instance to instrument.
+        registry: Registry to record into. A new one is created when omitted.
+
+    Returns:
+        MetricsRegistry: The registry, also available afterwards as `app.metrics`.
+    """
+    registry = registry or MetricsRegistry()
+    client = app.client
+    send = client.send
+
+    def instrumented_send(request: httpx.Request, **kwargs: Any) -> httpx.Response:
+        operation = _operation_name(app, request)
+        marks: dict[str, float] = {}
+
+        def trace(event_name: str, info: dict[str, Any]) -> None:
+            # HTTP/1.1 and HTTP/2 events differ only in their "http11."/"http2." prefix.
+            if event_name.startswith("http"):
+                event_name = event_name.split(".", 1)[1]
+            marks[event_name] = time.perf_counter()
+
+        request.extensions = {**request.extensions, "trace": trace}
+        started = time.perf_counter()
+        response = send(request, **kwargs)
+        latency = time.perf_counter() - started
+        phases = {
+            phase: marks[end] - marks[start]
+            for phase, (start, end) in _PHASE_EVENTS.items()
+            if start in marks and end in marks
+        }
+        registry.record_request(
+            operation,
+            latency,
+            response.status_code,
+            request_bytes=_body_size(request),
+            response_bytes=_body_size(response),
+            phases=phases,
+            rate_limit_limit=_header_int(response.headers, "RateLimit-Limit"),
+            rate_limit_remaining=_header_int(response.headers, "RateLimit-Remaining"),
+        )
+        decode = response.json
+
+        def timed_json(**kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                return decode(**kwargs)
+            finally:
+                registry.record_phase(
+                    operation, "decode", time.perf_counter() - started
+                )
+
+        response.json = timed_json
+        return response
+
+    client.send = instrumented_send
+    app.metrics = registry
+    return registry
+
+
+def render_prometheus(registry: MetricsRegistry, prefix: str = "klaviyo") -> str:
+    """
+    Renders the registry in the Prometheus text exposition format.
+    """
+    lines = [
+        f"# TYPE {prefix}_request_duration_seconds histogram",
+        f"# TYPE {prefix}_request_phase_seconds histogram",
+        f"# TYPE {prefix}_request_bytes_total counter",
+        f"# TYPE {prefix}_response_bytes_total counter",
+        f"# TYPE {prefix}_responses_total counter",
+        f"# TYPE {prefix}_retries_total counter",
+        f"# TYPE {prefix}_rate_limit_remaining gauge",
+    ]
+
+    def histogram(name: str, labels: str, data: dict[str, Any]) -> None:
+        for bound, count in data["buckets"].items():
+            le = "+Inf" if bound == "inf" else bound
+            lines.append(f'{name}_bucket{{{labels},le="{le}"}} {count}')
+        lines.append(f"{name}_sum{{{labels}}} {data['sum']}")
+        lines.append(f"{name}_count{{{labels}}} {data['count']}")
+
+    for operation, stats in sorted(registry.snapshot().items()):
+        labels = f'operation="{operation}"'
+        histogram(f"{prefix}_request_duration_seconds", labels, stats["latency"])
+        for phase, data in stats["phases"].items():
+            histogram(
+                f"{prefix}_request_phase_seconds", f'{labels},phase="{phase}"', data
+            )
+        lines.append(
+            f"{prefix}_request_bytes_total{{{labels}}} {stats['request_bytes']}"
+        )
+        lines.append(
+            f"{prefix}_response_bytes_total{{{labels}}} {stats['response_bytes']}"
+        )
+        for code, count in sorted(stats["status_codes"].items()):
+            lines.append(
+                f'{prefix}_responses_total{{{labels},status="{code}"}} {count}'
+            )
+        lines.append(f"{prefix}_retries_total{{{labels}}} {stats['retries']}")
+        if stats["rate_limit_remaining"] is not None:
+            lines.append(
+                f"{prefix}_rate_limit_remaining{{{labels}}} "
+                f"{stats['rate_limit_remaining']}"
+            )
+    return "\n".join(lines) + "\n"
+
+
+def export_to_opentelemetry(registry: MetricsRegistry, meter: Any = None) -> None:
+    """
+    Forwards every observation recorded in the registry to OpenTelemetry instruments.
+
+    Requires the optional `opentelemetry-api` package.
+
+    Args:
+        registry: The registry to forward from.
+        meter: An OpenTelemetry meter. Defaults to the global meter provider's.
+    """
+    try:
+        # Imported on use: opentelemetry-api is an optional extra.
+        from opentelemetry import metrics as otel_metrics  # noqa: PLC0415
+    except ImportError as e:
+        raise ImportError(
+            "OpenTelemetry export requires 'opentelemetry-api'. Install with: pip "
+            "install universal-mcp-klaviyo[otel]"
+        ) from e
+    meter = meter or otel_metrics.get_meter("universal_mcp_klaviyo")
+    duration = meter.create_histogram("klaviyo.request.duration", unit="s")
+    phase_duration = meter.create_histogram("klaviyo.request.phase.duration", unit="s")
+    request_bytes = meter.create_counter("klaviyo.request.bytes", unit="By")
+    response_bytes = meter.create_counter("klaviyo.response.bytes", unit="By")
+    retries = meter.create_counter("klaviyo.request.retries")
+    remaining = meter.create_up_down_counter("klaviyo.rate_limit.remaining")
+    last_remaining: dict[str, int] = {}
+
+    def forward(operation: str, observation: dict[str, Any]) -> None:
+        attributes = {"operation": operation}
+        if observation.get("retry"):
+            retries.add(1, attributes)
+            return
+        if "phase" in observation:
+            phase_duration.record(
+                observation["seconds"], {**attributes, "phase": observation["phase"]}
+            )
+            return
+        duration.record(
+            observation["latency"], {**attributes, "status": observation["status_code"]}
+        )
+        for phase, seconds in observation["phases"].items():
+            phase_duration.record(seconds, {**attributes, "phase": phase})
+        request_bytes.add(observation["request_bytes"], attributes)
+        response_bytes.add(observation["response_bytes"], attributes)
+        if observation["rate_limit_remaining"] is not None:
+            value = observation["rate_limit_remaining"]
+            remaining.add(value - last_remaining.get(operation, 0), attributes)
+            last_remaining[operation] = value
+
+    registry.add_listener(forward)
@@ -0,0 +1,337 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from typing import Any
+
+import httpx
+from loguru import logger
+
+from universal_mcp_klaviyo.identity_index import ProfileIdentityIndex
+from universal_mcp_klaviyo.profiles import (
+    IDENTIFIER_KINDS,
+    normalize_identifier,
+    resolve_profiles,
+)
+from universal_mcp_klaviyo.utils import (
+    RateLimiter,
+    call_with_retry,
+    chunked,
+    run_concurrently,
+)
+
+# Ledger statuses: recorded but unresolved, resolved to a profile, no such profile,
+# deletion requested, profile confirmed gone, request failed (retried on resume).
+LEDGER_STATUSES = (
+    "pending",
+    "resolved",
+    "not_found",
+    "submitted",
+    "confirmed",
+    "failed",
+)
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+class ProfileDeletionPipeline:
+    """
+    Processes privacy deletion requests for large batches of identifiers through
+    `request_profile_deletion`.
+
+    Every identifier is first written to a SQLite ledger, then resolved to a profile id
+    in batches (through a `ProfileIdentityIndex` when given, else with batched
+    `resolve_profiles` lookups), so identifiers without a profile cost no deletion call
+    and several identifiers of one person cost one. Deletions are requested concurrently
+    under the data privacy endpoint's rate tier and each outcome is committed as it
+    lands. Re-running with the same identifiers, or calling `resume` after a crash,
+    skips everything already submitted. `confirm` later checks in bulk that submitted
+    profiles are gone.
+
+    The ledger is keyed on a SHA-256 digest of each normalized identifier. The raw
+    identifier is kept only while it may still be needed to resolve or audit the
+    request and is erased once its row is `confirmed` or `not_found`; from then on the
+    ledger holds only the digest, the profile id and the outcome.
+
+    Args:
+        app: The KlaviyoApp instance to call through.
+        path: SQLite ledger path, or ":memory:".
+        index: Optional identity index used to resolve identifiers and forget deleted
+            profiles.
+        batch_size: Number of identifiers resolved and submitted per round.
+        max_workers: Maximum number of deletion requests in flight.
+        tier: Klaviyo rate tier of `request_profile_deletion`.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        path: str = ":memory:",
+        index: ProfileIdentityIndex | None = None,
+        batch_size: int = 1000,
+        max_workers: int = 4,
+        tier: str = "S",
+    ) -> None:
+        self.app = app
+        self.index = index
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.limiter = RateLimiter.for_tier(tier)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS deletions ("
+                "kind TEXT NOT NULL, digest TEXT NOT NULL, value TEXT, "
+                "profile_id TEXT, status TEXT NOT NULL, error TEXT, "
+                "updated_at REAL NOT NULL, "
+                "PRIMARY KEY (kind, digest)) WITHOUT ROWID"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS deletions_status ON deletions (status)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS deletions_profile ON deletions (profile_id)"
+            )
+
+    def close(self) -> None:
+        self._db.close()
+
+    def summary(self) -> dict[str, int]:
+        """
+        Number of ledger entries per status.
+        """
+        with self._lock:
+            counts = dict(
+                self._db.execute(
+                    "SELECT status, COUNT(*) FROM deletions GROUP BY status"
+                ).fetchall()
+            )
+        return {status: counts.get(status, 0) for status in LEDGER_STATUSES}
+
+    def status(self, kind: str, value: str) -> str | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status FROM deletions WHERE kind = ? AND digest = ?",
+                (kind, _digest(normalize_identifier(kind, value))),
+            ).fetchone()
+        return row[0] if row else None
+
+    def process(
+        self,
+        emails: Iterable[str] | None = None,
+        phone_numbers: Iterable[str] | None = None,
+        external_ids: Iterable[str] | None = None,
+        ids: Iterable[str] | None = None,
+    ) -> dict[str, int]:
+        """
+        Records identifiers in the ledger and requests deletion of every profile they
+        resolve to.
+
+        Inputs are read lazily and recorded in batches; identifiers already in the
+        ledger are not recorded twice.
+
+        Returns:
+            dict[str, int]: The ledger `summary` afterwards.
+        """
+        for kind, values in zip(
+            IDENTIFIER_KINDS, (ids, emails, phone_numbers, external_ids)
+        ):
+            for batch in chunked(values or (), self.batch_size):
+                self.record(kind, batch)
+        return self.resume()
+
+    def record(self, kind: str, values: Iterable[str]) -> None:
+        """
+        Adds identifiers to the ledger without processing them.
+
+        Raises:
+            ValueError: If `kind` is not an identifier kind.
+        """
+        if kind not in IDENTIFIER_KINDS:
+            raise ValueError(
+                f"Unsupported identifier kind '{kind}', expected one of: "
+                f"{', '.join(IDENTIFIER_KINDS)}"
+            )
+        now = time.time()
+        rows = [
+            (
+                kind,
+                _digest(value),
+                value,
+                value if kind == "id" else None,
+                "resolved" if kind == "id" else "pending",
+                now,
+            )
+            for value in dict.fromkeys(
+                normalize_identifier(kind, value) for value in values
+            )
+        ]
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR IGNORE INTO deletions (kind, digest, value, profile_id, "
+                "status, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def resume(self) -> dict[str, int]:
+        """
+        Resolves pending identifiers and submits every resolved or failed deletion in
+        the ledger.
+
+        Returns:
+            dict[str, int]: The ledger `summary` afterwards.
+        """
+        while True:
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT kind, value FROM deletions WHERE status = 'pending' "
+                    "ORDER BY kind LIMIT ?",
+                    (self.batch_size,),
+                ).fetchall()
+            if not rows:
+                break
+            self._resolve(rows)
+        last = ""
+        while True:
+            with self._lock:
+                profile_ids = [
+                    row[0]
+                    for row in self._db.execute(
+                        "SELECT DISTINCT profile_id FROM deletions WHERE status IN "
+                        "('resolved', 'failed') AND profile_id > ? "
+                        "AND profile_id NOT IN (SELECT profile_id FROM deletions WHERE "
+                        "status IN ('submitted', 'confirmed')) "
+                        "ORDER BY profile_id LIMIT ?",
+                        (last, self.batch_size),
+                    )
+                ]
+            if not profile_ids:
+                break
+            # Walking forward by id leaves profiles that fail in this run for the next
+            # one.
+            last = profile_ids[-1]
+            self._submit(profile_ids)
+        self._settle_duplicates()
+        return self.summary()
+
+    def confirm(self) -> dict[str, int]:
+        """
+        Checks in bulk which submitted profiles no longer exist and marks them
+        confirmed.
+
+        Returns:
+            dict[str, int]: The ledger `summary` afterwards.
+        """
+        with self._lock:
+            profile_ids = [
+                row[0]
+                for row in self._db.execute(
+                    "SELECT DISTINCT profile_id FROM deletions WHERE status = "
+                    "'submitted'"
+                )
+            ]
+        for batch in chunked(profile_ids, self.batch_size):
+            resolution = resolve_profiles(
+                self.app,
+                ids=batch,
+                fields="email",
+                max_workers=self.max_workers,
+                tier="M",
+            )
+            gone = resolution["missing"]["id"]
+            with self._lock, self._db:
+                self._db.executemany(
+                    "UPDATE deletions SET status = 'confirmed', value = NULL, "
+                    "updated_at = ? WHERE profile_id = ? AND status = 'submitted'",
+                    [(time.time(), profile_id) for profile_id in gone],
+                )
+            if self.index is not None:
+                self.index.forget(gone)
+        return self.summary()
+
+    def _resolve(self, rows: list[tuple[str, str]]) -> None:
+        by_kind: dict[str, list[str]] = {}
+        for kind, value in rows:
+            by_kind.setdefault(kind, []).append(value)
+        updates = []
+        for kind, values in by_kind.items():
+            if self.index is not None:
+                found = self.index.resolve(kind, values)
+            else:
+                resolution = resolve_profiles(
+                    self.app,
+                    fields="email",
+                    max_workers=self.max_workers,
+                    tier="M",
+                    **{f"{kind}s": values},
+                )
+                found = {
+                    value: profile["id"]
+                    for value, profile in resolution["found"][kind].items()
+                }
+            now = time.time()
+            for value in values:
+                profile_id = found.get(value)
+                updates.append(
+                    (
+                        profile_id,
+                        "resolved" if profile_id else "not_found",
+                        value if profile_id else None,
+                        now,
+                        kind,
+                        _digest(value),
+                    )
+                )
+        with self._lock, self._db:
+            self._db.executemany(
+                "UPDATE deletions SET profile_id = ?, status = ?, value = ?, "
+                "updated_at = ? WHERE kind = ? AND digest = ?",
+                updates,
+            )
+
+    def _submit(self, profile_ids: list[str]) -> None:
+        def delete(profile_id: str) -> None:
+            data = {
+                "type": "data-privacy-deletion-job",
+                "attributes": {
+                    "profile": {"data": {"type": "profile", "id": profile_id}}
+                },
+            }
+            try:
+                call_with_retry(self.app.request_profile_deletion, data=data)
+                status, error = "submitted", None
+            except httpx.HTTPError as e:
+                logger.warning(f"Deletion request for profile {profile_id} failed: {e}")
+                status, error = "failed", str(e)
+            # Each outcome is committed on its own so an interrupted run loses nothing.
+            with self._lock, self._db:
+                self._db.execute(
+                    "UPDATE deletions SET status = ?, error = ?, updated_at = ? "
+                    "WHERE profile_id = ? AND status IN ('resolved', 'failed')",
+                    (status, error, time.time(), profile_id),
+                )
+
+        run_concurrently(delete, profile_ids, self.max_workers, self.limiter)
+
+    def _settle_duplicates(self) -> None:
+        # Identifiers resolved to a profile whose deletion another identifier already
+        # requested.
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE deletions SET status = (SELECT MIN(other.status) FROM "
+                "deletions other "
+                "WHERE other.profile_id = deletions.profile_id AND other.status IN "
+                "('submitted', 'confirmed')) "
+                "WHERE status IN ('resolved', 'failed') AND profile_id IN "
+                "(SELECT profile_id FROM deletions WHERE status IN ('submitted', "
+                "'confirmed'))"
+            )
+            self._db.execute(
+                "UPDATE deletions SET value = NULL WHERE status = 'confirmed' "
+                "AND value IS NOT NULL"
+            )
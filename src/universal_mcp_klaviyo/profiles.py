@@ -0,0 +1,132 @@
+import json
+from collections.abc import Iterable, Iterator
+from typing import Any
+from urllib.parse import quote
+
+from universal_mcp_klaviyo.utils import RateLimiter, iter_resources, run_concurrently
+
+IDENTIFIER_KINDS = ("id", "email", "phone_number", "external_id")
+MAX_FILTER_VALUES = 100
+# Budget for the URL-encoded filter parameter, leaving headroom under common 8 KB URL
+# limits.
+MAX_FILTER_LENGTH = 6000
+
+
+def normalize_identifier(kind: str, value: str) -> str:
+    """
+    Canonical form of an identifier. Klaviyo matches emails case-insensitively.
+    """
+    value = value.strip()
+    return value.lower() if kind == "email" else value
+
+
+def any_filter(kind: str, values: list[str]) -> str:
+    return f"any({kind},{json.dumps(values, separators=(',', ':'))})"
+
+
+def pack_filters(kind: str, values: Iterable[str]) -> Iterator[str]:
+    """
+    Packs values into as few `any(kind,[...])` filters as fit the value count and URL
+    length limits.
+    """
+    batch: list[str] = []
+    length = len(quote(any_filter(kind, [])))
+    for value in values:
+        cost = len(quote(json.dumps(value))) + len(quote(","))
+        if batch and (
+            len(batch) == MAX_FILTER_VALUES or length + cost > MAX_FILTER_LENGTH
+        ):
+            yield any_filter(kind, batch)
+            batch, length = [], len(quote(any_filter(kind, [])))
+        batch.append(value)
+        length += cost
+    if batch:
+        yield any_filter(kind, batch)
+
+
+def resolve_profiles(
+    app: Any,
+    emails: Iterable[str] | None = None,
+    phone_numbers: Iterable[str] | None = None,
+    external_ids: Iterable[str] | None = None,
+    ids: Iterable[str] | None = None,
+    fields: str | None = None,
+    max_workers: int = 4,
+    tier: str = "M",
+) -> dict[str, dict[str, Any]]:
+    """
+    Looks up many profiles by identifier with batched `any(...)` filters on
+    `get_profiles`.
+
+    Identifiers are de-duplicated, packed into the largest filters that stay URL-safe
+    and fetched concurrently under the endpoint's rate tier, so 100k emails take about a
+    thousand requests.
+
+    Args:
+        app: The KlaviyoApp instance to query through.
+        emails: Email addresses to resolve.
+        phone_numbers: Phone numbers in E.164 format to resolve.
+        external_ids: External ids to resolve.
+        ids: Profile ids to fetch.
+        fields: Sparse fieldset for `fields[profile]`. The identifier fields are always
+            included.
+        max_workers: Maximum number of requests in flight.
+        tier: Klaviyo rate tier of `get_profiles`.
+
+    Returns:
+        dict[str, dict[str, Any]]: `found` maps each identifier kind to {input value:
+            profile resource}, `missing` maps each kind to the input values with no
+            matching profile.
+    """
+    requested = {
+        kind: list(dict.fromkeys(values))
+        for kind, values in zip(
+            IDENTIFIER_KINDS, (ids, emails, phone_numbers, external_ids)
+        )
+        if values is not None
+    }
+    if fields:
+        fields = ",".join(dict.fromkeys([*fields.split(","), *IDENTIFIER_KINDS[1:]]))
+    jobs = [
+        (kind, filter)
+        for kind, values in requested.items()
+        for filter in pack_filters(
+            kind, dict.fromkeys(normalize_identifier(kind, v) for v in values)
+        )
+    ]
+
+    def fetch(job: tuple[str, str]) -> tuple[str, list[dict[str, Any]]]:
+        kind, filter = job
+        return kind, list(
+            iter_resources(
+                app.get_profiles,
+                fields_profile=fields,
+                filter=filter,
+                page_size=MAX_FILTER_VALUES,
+            )
+        )
+
+    by_key: dict[str, dict[str, dict[str, Any]]] = {kind: {} for kind in requested}
+    for kind, profiles in run_concurrently(
+        fetch, jobs, max_workers, RateLimiter.for_tier(tier)
+    ):
+        for profile in profiles:
+            value = (
+                profile["id"]
+                if kind == "id"
+                else (profile.get("attributes") or {}).get(kind)
+            )
+            if value:
+                by_key[kind][normalize_identifier(kind, value)] = profile
+
+    found: dict[str, dict[str, Any]] = {}
+    missing: dict[str, list[str]] = {}
+    for kind, values in requested.items():
+        found[kind], missing[kind] = {}, []
+        for value in values:
+            profile = by_key[kind].get(normalize_identifier(kind, value))
+            if profile is None:
+                missing[kind].append(value)
+            else:
+                found[kind][value] = profile
+    return {"found": found, "missing": missing}
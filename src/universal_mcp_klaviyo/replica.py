@@ -0,0 +1,297 @@
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from typing import Any
+
+from universal_mcp_klaviyo.changes import SOURCES, shift_timestamp
+from universal_mcp_klaviyo.utils import RateLimiter, iter_pages, run_concurrently
+
+# Replicated collections: (listing method, updated timestamp field, created timestamp
+# field, include, base filters).
+COLLECTIONS = {
+    "flow": ("get_flows", "updated", "created", "tags", (None,)),
+    "list": ("get_lists", "updated", "created", "tags", (None,)),
+    "segment": ("get_segments", "updated", "created", "tags", (None,)),
+    "campaign": (
+        "get_campaigns",
+        "updated_at",
+        "created_at",
+        "tags",
+        SOURCES["campaign"][2],
+    ),
+    "template": ("get_templates", "updated", "created", None, (None,)),
+    "tag": ("get_tags", None, None, None, (None,)),
+}
+STATUS_FIELDS = ("status", "archived")
+
+
+def _like_escape(value: str | None) -> str | None:
+    # Wildcards in a search term match literally under `ESCAPE '\'`.
+    if value is None:
+        return None
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class MetadataReplica:
+    """
+    Local SQLite copy of flows, lists, segments, campaigns, templates and tags for fast
+    ad-hoc queries.
+
+    `sync` streams every collection concurrently, with tag ids pulled in through
+    `include=tags`, into indexed tables; later syncs ask only for resources updated
+    after the newest timestamp stored per collection. Questions such as "live flows
+    tagged Onboarding" or "segments created last month" are then answered by `query`
+    without any request or rate-limit cost, including combinations the API filters do
+    not support. Incremental syncs see neither deletions nor tag changes, which do not
+    bump the updated timestamp; a `full` sync replaces each collection wholesale.
+    `observe` takes resources from elsewhere, e.g. a `ChangePoller` consumer.
+
+    Args:
+        app: The KlaviyoApp instance to sync through.
+        path: SQLite database path, or ":memory:".
+        max_workers: Maximum number of collections listed at once.
+        tier: Klaviyo rate tier of the listing endpoints.
+    """
+
+    def __init__(
+        self, app: Any, path: str = ":memory:", max_workers: int = 4, tier: str = "M"
+    ) -> None:
+        self.app = app
+        self.max_workers = max_workers
+        self.limiter = RateLimiter.for_tier(tier)
+        self.synced_at: float | None = None
+        self.full_synced_at: float | None = None
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS resources ("
+                "kind TEXT NOT NULL, id TEXT NOT NULL, name TEXT, status TEXT, created "
+                "TEXT, updated TEXT, "
+                "attributes TEXT NOT NULL, PRIMARY KEY (kind, id)) WITHOUT ROWID"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS tagged ("
+                "kind TEXT NOT NULL, id TEXT NOT NULL, tag_id TEXT NOT NULL, PRIMARY "
+                "KEY (kind, id, tag_id)) WITHOUT ROWID"
+            )
+            for column in ("name", "status", "created", "updated"):
+                self._db.execute(
+                    f"CREATE INDEX IF NOT EXISTS resources_{column} ON resources "
+                    f"(kind, {column})"
+                )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS tagged_tag ON tagged (tag_id, kind)"
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM resources").fetchone()[0]
+
+    def close(self) -> None:
+        self._db.close()
+
+    def sync(
+        self, kinds: Iterable[str] | None = None, full: bool = False
+    ) -> dict[str, int]:
+        """
+        Brings the replica up to date.
+
+        Args:
+            kinds: Collections to sync. Defaults to all of `COLLECTIONS`.
+            full: Re-list every resource and drop those no longer returned, instead of
+                fetching only resources updated since the last sync.
+
+        Returns:
+            dict[str, int]: Number of resources stored per collection.
+        """
+        kinds = list(kinds) if kinds is not None else list(COLLECTIONS)
+        unknown = set(kinds) - set(COLLECTIONS)
+        if unknown:
+            raise ValueError(f"Unsupported resource types: {sorted(unknown)}")
+        marks = {} if full else self.marks()
+
+        def list_collection(kind: str) -> list[dict[str, Any]]:
+            method, updated, _, include, scopes = COLLECTIONS[kind]
+            # Reaching back a second catches writes sharing the mark's second; storing
+            # is idempotent.
+            since = (
+                f"greater-than({updated},{shift_timestamp(marks[kind], 1)})"
+                if updated and kind in marks
+                else None
+            )
+            documents = []
+            for scope in scopes:
+                kwargs = {
+                    k: v
+                    for k, v in (
+                        ("include", include),
+                        ("filter", ",".join(t for t in (scope, since) if t)),
+                    )
+                    if v
+                }
+                for document in iter_pages(getattr(self.app, method), **kwargs):
+                    documents.append(document)
+            return documents
+
+        counts = {}
+        for kind, documents in zip(
+            kinds,
+            run_concurrently(list_collection, kinds, self.max_workers, self.limiter),
+        ):
+            resources = [
+                resource
+                for document in documents
+                for resource in document.get("data") or []
+            ]
+            with self._lock, self._db:
+                if full or not COLLECTIONS[kind][1]:
+                    self._db.execute("DELETE FROM tagged WHERE kind = ?", (kind,))
+                    self._db.execute("DELETE FROM resources WHERE kind = ?", (kind,))
+                self._store(kind, resources)
+            counts[kind] = len(resources)
+        self.synced_at = time.monotonic()
+        if full and set(kinds) == set(COLLECTIONS):
+            self.full_synced_at = self.synced_at
+        return counts
+
+    def observe(self, kind: str, resources: Iterable[dict[str, Any]]) -> None:
+        """
+        Stores resources of one collection, e.g. documents returned by create and update
+        calls.
+        """
+        with self._lock, self._db:
+            self._store(kind, list(resources))
+
+    def forget(self, kind: str, ids: Iterable[str]) -> None:
+        keys = [(kind, id) for id in ids]
+        with self._lock, self._db:
+            self._db.executemany("DELETE FROM tagged WHERE kind = ? AND id = ?", keys)
+            self._db.executemany(
+                "DELETE FROM resources WHERE kind = ? AND id = ?", keys
+            )
+
+    def marks(self) -> dict[str, str]:
+        """
+        Newest updated timestamp stored per collection.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT kind, MAX(updated) FROM resources WHERE updated IS NOT NULL "
+                "GROUP BY kind"
+            ).fetchall()
+        return dict(rows)
+
+    def query(
+        self,
+        kind: str,
+        tag: str | None = None,
+        status: str | None = None,
+        name_contains: str | None = None,
+        created_after: str | None = None,
+        created_before: str | None = None,
+        updated_after: str | None = None,
+        updated_before: str | None = None,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Finds replicated resources; all given conditions must hold.
+
+        Args:
+            kind: Collection to search, a key of `COLLECTIONS`.
+            tag: Tag id or tag name the resource must carry.
+            status: Exact status, e.g. "live" for flows or "Sent" for campaigns.
+            name_contains: Case-insensitive substring of the name.
+            created_after: Inclusive lower bound on the created timestamp (ISO 8601).
+            created_before: Exclusive upper bound on the created timestamp.
+            updated_after: Inclusive lower bound on the updated timestamp.
+            updated_before: Exclusive upper bound on the updated timestamp.
+            limit: Maximum number of results.
+
+        Returns:
+            list[dict[str, Any]]: Resources as `{"type", "id", "attributes", "tags"}`,
+                newest first.
+        """
+        if kind not in COLLECTIONS:
+            raise ValueError(f"Unsupported resource type: {kind}")
+        conditions, params = ["r.kind = ?"], [kind]
+        if tag is not None:
+            conditions.append(
+                "EXISTS (SELECT 1 FROM tagged t WHERE t.kind = r.kind AND t.id = r.id "
+                "AND (t.tag_id = ? "
+                "OR t.tag_id IN (SELECT id FROM resources WHERE kind = 'tag' AND name "
+                "= ?)))"
+            )
+            params += [tag, tag]
+        for condition, value in [
+            ("r.status = ?", status),
+            ("r.name LIKE '%' || ? || '%' ESCAPE '\\'", _like_escape(name_contains)),
+            ("r.created >= ?", created_after),
+            ("r.created < ?", created_before),
+            ("r.updated >= ?", updated_after),
+            ("r.updated < ?", updated_before),
+        ]:
+            if value is not None:
+                conditions.append(condition)
+                params.append(value)
+        sql = (
+            "SELECT r.id, r.attributes FROM resources r "
+            f"WHERE {' AND '.join(conditions)} ORDER BY r.updated DESC, r.id"
+        )
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+            tags: dict[str, list[str]] = {}
+            for id, tag_id in self._db.execute(
+                "SELECT id, tag_id FROM tagged WHERE kind = ? ORDER BY tag_id", (kind,)
+            ):
+                tags.setdefault(id, []).append(tag_id)
+        return [
+            {
+                "type": kind,
+                "id": id,
+                "attributes": json.loads(attributes),
+                "tags": tags.get(id, []),
+            }
+            for id, attributes in rows
+        ]
+
+    def _store(self, kind: str, resources: list[dict[str, Any]]) -> None:
+        _, updated, created, _, _ = COLLECTIONS[kind]
+        rows, tagged = [], []
+        for resource in resources:
+            attributes = resource.get("attributes") or {}
+            status = next(
+                (attributes[field] for field in STATUS_FIELDS if field in attributes),
+                None,
+            )
+            rows.append(
+                (
+                    kind,
+                    resource["id"],
+                    attributes.get("name"),
+                    str(status).lower() if isinstance(status, bool) else status,
+                    attributes.get(created) if created else None,
+                    attributes.get(updated) if updated else None,
+                    json.dumps(attributes, separators=(",", ":")),
+                )
+            )
+            relationship = (resource.get("relationships") or {}).get("tags")
+            if relationship is not None and "data" in relationship:
+                self._db.execute(
+                    "DELETE FROM tagged WHERE kind = ? AND id = ?",
+                    (kind, resource["id"]),
+                )
+                tagged += [
+                    (kind, resource["id"], tag["id"])
+                    for tag in relationship["data"] or []
+                ]
+        self._db.executemany(
+            "INSERT OR REPLACE INTO resources VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+        )
+        self._db.executemany("INSERT OR IGNORE INTO tagged VALUES (?, ?, ?)", tagged)
@@ -0,0 +1,323 @@
+import hashlib
+import json
+import threading
+import time
+from typing import Any
+
+import numpy as np
+
+from universal_mcp_klaviyo.utils import iter_pages
+
+# Report name -> (KlaviyoApp method, JSON:API type of the request body).
+REPORTS = {
+    "campaign-values": ("query_campaign_values", "campaign-values-report"),
+    "flow-values": ("query_flow_values", "flow-values-report"),
+    "flow-series": ("query_flow_series", "flow-series-report"),
+    "form-values": ("query_form_values", "form-values-report"),
+    "form-series": ("query_form_series", "form-series-report"),
+    "segment-values": ("query_segment_values", "segment-values-report"),
+    "segment-series": ("query_segment_series", "segment-series-report"),
+}
+
+
+def _as_float(value: Any) -> float:
+    return np.nan if value is None else float(value)
+
+
+class ReportTable:
+    """
+    Column-oriented view of reporting results.
+
+    Grouping columns (e.g. `flow_id`, `send_channel`) are object arrays with one entry
+    per result row. Statistic columns are float arrays; for series reports they are
+    two-dimensional with one column per entry in `date_times`. Missing values are NaN.
+    """
+
+    def __init__(
+        self,
+        groupings: dict[str, np.ndarray],
+        statistics: dict[str, np.ndarray],
+        date_times: list[str] | None = None,
+    ) -> None:
+        self.groupings = groupings
+        self.statistics = statistics
+        self.date_times = date_times
+
+    @classmethod
+    def from_results(
+        cls, results: list[dict[str, Any]], date_times: list[str] | None = None
+    ) -> "ReportTable":
+        """
+        Builds a table from the `results` array of one or more report responses.
+        """
+        grouping_names = sorted(
+            {name for row in results for name in row.get("groupings") or {}}
+        )
+        statistic_names = sorted(
+            {name for row in results for name in row.get("statistics") or {}}
+        )
+        groupings = {
+            name: np.array(
+                [(row.get("groupings") or {}).get(name) for row in results],
+                dtype=object,
+            )
+            for name in grouping_names
+        }
+        statistics = {}
+        for name in statistic_names:
+            values = [(row.get("statistics") or {}).get(name) for row in results]
+            if date_times is None:
+                statistics[name] = np.array([_as_float(v) for v in values], dtype=float)
+            else:
+                width = len(date_times)
+                statistics[name] = np.array(
+                    [
+                        [_as_float(x) for x in v] if v is not None else [np.nan] * width
+                        for v in values
+                    ],
+                    dtype=float,
+                ).reshape(len(values), width)
+        return cls(groupings, statistics, date_times)
+
+    @classmethod
+    def concat(cls, tables: list["ReportTable"]) -> "ReportTable":
+        """
+        Stacks tables with the same date axis row-wise. Columns missing from a table are
+        filled with None/NaN.
+        """
+        tables = [t for t in tables if len(t)]
+        if not tables:
+            return cls({}, {})
+        date_times = tables[0].date_times
+        if any(t.date_times != date_times for t in tables):
+            raise ValueError(
+                "Cannot concatenate series tables with different date_times"
+            )
+        grouping_names = sorted({name for t in tables for name in t.groupings})
+        statistic_names = sorted({name for t in tables for name in t.statistics})
+        groupings = {
+            name: np.concatenate(
+                [
+                    t.groupings.get(name, np.full(len(t), None, dtype=object))
+                    for t in tables
+                ]
+            )
+            for name in grouping_names
+        }
+        shape = () if date_times is None else (len(date_times),)
+        statistics = {
+            name: np.concatenate(
+                [
+                    t.statistics.get(name, np.full((len(t), *shape), np.nan))
+                    for t in tables
+                ]
+            )
+            for name in statistic_names
+        }
+        return cls(groupings, statistics, date_times)
+
+    def __len__(self) -> int:
+        for column in (*self.groupings.values(), *self.statistics.values()):
+            return len(column)
+        return 0
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        if name in self.statistics:
+            return self.statistics[name]
+        return self.groupings[name]
+
+    def ratio(self, numerator: str, denominator: str) -> np.ndarray:
+        """
+        Element-wise `numerator / denominator`, NaN where the denominator is zero.
+        """
+        num, den = self.statistics[numerator], self.statistics[denominator]
+        return np.divide(
+            num, den, out=np.full(np.broadcast(num, den).shape, np.nan), where=den != 0
+        )
+
+    def with_ratio(self, name: str, numerator: str, denominator: str) -> "ReportTable":
+        """
+        Returns a copy of the table with a derived ratio statistic added.
+        """
+        return ReportTable(
+            self.groupings,
+            {**self.statistics, name: self.ratio(numerator, denominator)},
+            self.date_times,
+        )
+
+    def where(self, **groupings: Any) -> "ReportTable":
+        """
+        Rows whose grouping columns equal the given values, e.g.
+        `table.where(flow_id="Xyz")`.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        for name, value in groupings.items():
+            mask &= self.groupings[name] == value
+        return self._take(mask)
+
+    def group_by(self, *names: str) -> "ReportTable":
+        """
+        Sums statistics over rows sharing the same values of the given grouping columns.
+
+        Only additive statistics (counts, revenue) are meaningful after summing;
+        recompute rates from the summed counts with `with_ratio`.
+        """
+        if not len(self):
+            return ReportTable(
+                {name: np.array([], dtype=object) for name in names},
+                {},
+                self.date_times,
+            )
+        codes, uniques = [], []
+        for name in names:
+            _, first, inverse = np.unique(
+                self.groupings[name].astype(str), return_index=True, return_inverse=True
+            )
+            uniques.append(self.groupings[name][first])
+            codes.append(inverse)
+        combined = np.ravel_multi_index(codes, [len(u) for u in uniques])
+        keys, inverse = np.unique(combined, return_inverse=True)
+        unraveled = np.unravel_index(keys, [len(u) for u in uniques])
+        groupings = {name: uniques[i][unraveled[i]] for i, name in enumerate(names)}
+        statistics = {}
+        for name, column in self.statistics.items():
+            totals = np.zeros((len(keys), *column.shape[1:]))
+            np.add.at(totals, inverse, np.nan_to_num(column))
+            statistics[name] = totals
+        return ReportTable(groupings, statistics, self.date_times)
+
+    def to_records(self) -> list[dict[str, Any]]:
+        """
+        Converts back to the `{"groupings": ..., "statistics": ...}` row format of the
+        API.
+        """
+        return [
+            {
+                "groupings": {
+                    name: column[i] for name, column in self.groupings.items()
+                },
+                "statistics": {
+                    name: (column[i].tolist() if column.ndim > 1 else column[i].item())
+                    for name, column in self.statistics.items()
+                },
+            }
+            for i in range(len(self))
+        ]
+
+    def _take(self, index: np.ndarray) -> "ReportTable":
+        return ReportTable(
+            {name: column[index] for name, column in self.groupings.items()},
+            {name: column[index] for name, column in self.statistics.items()},
+            self.date_times,
+        )
+
+
+class ReportingEngine:
+    """
+    Runs Klaviyo reporting queries to completion and returns them as `ReportTable`s.
+
+    Every page of a report is fetched and merged before returning. Complete results are
+    memoised per request body for `ttl` seconds, so dashboards that re-issue the same
+    query only pay for it once.
+
+    Args:
+        app: The KlaviyoApp instance to query through.
+        ttl: Seconds a result stays cached. Zero disables caching.
+    """
+
+    def __init__(self, app: Any, ttl: float = 300.0) -> None:
+        self.app = app
+        self.ttl = ttl
+        self._cache: dict[str, tuple[float, ReportTable]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def build_body(
+        report: str,
+        statistics: list[str],
+        timeframe: dict[str, Any],
+        conversion_metric_id: str | None = None,
+        filter: str | None = None,
+        interval: str | None = None,
+        group_by: list[str] | None = None,
+    ) -> dict[str, Any]:
+        if report not in REPORTS:
+            raise ValueError(
+                f"Unknown report '{report}', expected one of: {', '.join(REPORTS)}"
+            )
+        attributes = {
+            "statistics": statistics,
+            "timeframe": timeframe,
+            "conversion_metric_id": conversion_metric_id,
+            "filter": filter,
+            "interval": interval,
+            "group_by": group_by,
+        }
+        return {
+            "type": REPORTS[report][1],
+            "attributes": {k: v for k, v in attributes.items() if v is not None},
+        }
+
+    def query(
+        self,
+        report: str,
+        statistics: list[str],
+        timeframe: dict[str, Any],
+        conversion_metric_id: str | None = None,
+        filter: str | None = None,
+        interval: str | None = None,
+        group_by: list[str] | None = None,
+    ) -> ReportTable:
+        """
+        Runs a report and returns all of its pages as one table.
+
+        Args:
+            report: One of the keys of `REPORTS`, e.g. "flow-values" or
+                "segment-series".
+            statistics: Statistics to compute, e.g. ["opens", "recipients"].
+            timeframe: A `{"key": ...}` or `{"start": ..., "end": ...}` timeframe.
+            conversion_metric_id: Metric used for conversion statistics (campaign and
+                flow reports).
+            filter: Report filter expression.
+            interval: Bucket size for series reports, e.g. "daily".
+            group_by: Grouping columns for form and segment reports.
+
+        Returns:
+            ReportTable: Merged results of every page.
+        """
+        body = self.build_body(
+            report,
+            statistics,
+            timeframe,
+            conversion_metric_id,
+            filter,
+            interval,
+            group_by,
+        )
+        key = hashlib.sha256(json.dumps(body, sort_keys=True).encode()).hexdigest()
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached and now - cached[0] < self.ttl:
+            return cached[1]
+        table = self.fetch(report, body)
+        if self.ttl:
+            with self._lock:
+                self._cache[key] = (now, table)
+        return table
+
+    def fetch(self, report: str, body: dict[str, Any]) -> ReportTable:
+        """
+        Fetches every page of a report request body, bypassing the cache.
+        """
+        method = getattr(self.app, REPORTS[report][0])
+        results, date_times = [], None
+        for document in iter_pages(method, data=body):
+            attributes = document["data"]["attributes"]
+            results.extend(attributes.get("results") or [])
+            date_times = attributes.get("date_times", date_times)
+        return ReportTable.from_results(results, date_times)
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
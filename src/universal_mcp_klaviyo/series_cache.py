@@ -0,0 +1,284 @@
+import json
+import threading
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from universal_mcp_klaviyo.reporting import ReportingEngine, ReportTable
+
+# Series report -> (grouping that identifies the object, filter selecting a set of
+# objects).
+SERIES_REPORTS = {
+    "flow-series": ("flow_id", "contains-any(flow_id,{ids})"),
+    "segment-series": ("segment_id", "any(segment_id,{ids})"),
+}
+
+
+def bucket_start(moment: datetime, interval: str, tz: ZoneInfo) -> datetime:
+    """
+    Start of the `interval` bucket containing `moment`, aligned in `tz`.
+    """
+    local = moment.astimezone(tz)
+    if interval == "hourly":
+        return local.replace(minute=0, second=0, microsecond=0)
+    day = local.replace(hour=0, minute=0, second=0, microsecond=0)
+    if interval == "daily":
+        return day
+    if interval == "weekly":
+        return day - timedelta(days=day.weekday())
+    if interval == "monthly":
+        return day.replace(day=1)
+    raise ValueError(f"Unsupported interval '{interval}'")
+
+
+def next_bucket(start: datetime, interval: str) -> datetime:
+    if interval == "hourly":
+        return start + timedelta(hours=1)
+    if interval == "daily":
+        return start + timedelta(days=1)
+    if interval == "weekly":
+        return start + timedelta(weeks=1)
+    if interval == "monthly":
+        return start.replace(
+            year=start.year + start.month // 12, month=start.month % 12 + 1
+        )
+    raise ValueError(f"Unsupported interval '{interval}'")
+
+
+class SeriesCache:
+    """
+    Incremental cache for `query_flow_series` and `query_segment_series`.
+
+    Buckets that have fully elapsed never change, so they are stored per (object id,
+    statistic, interval, timezone) and only the window after the last complete bucket is
+    requested again. A refresh therefore costs one query over the new time since the
+    previous refresh, however long the series is.
+
+    Args:
+        engine: Reporting engine used to run the underlying queries.
+        clock: Returns the current time; override in tests.
+    """
+
+    def __init__(
+        self, engine: ReportingEngine, clock: Callable[[], datetime] | None = None
+    ) -> None:
+        self.engine = engine
+        self.clock = clock or (lambda: datetime.now(UTC))
+        # (report, interval, timezone, statistic, groupings) -> {date_time: value}
+        self._buckets: dict[tuple, dict[str, float]] = {}
+        # (report, interval, timezone, statistic, id) -> start of the first cached
+        # bucket
+        self._complete_from: dict[tuple, datetime] = {}
+        # (report, interval, timezone, statistic, id) -> end of the last complete cached
+        # bucket
+        self._complete_until: dict[tuple, datetime] = {}
+        # (report, interval, timezone, id) -> grouping tuples seen for the object
+        self._rows: dict[tuple, set[tuple]] = {}
+        self._lock = threading.Lock()
+
+    def get_series(
+        self,
+        report: str,
+        ids: list[str],
+        statistics: list[str],
+        interval: str,
+        start: datetime,
+        end: datetime | None = None,
+        timezone: str = "UTC",
+        conversion_metric_id: str | None = None,
+    ) -> ReportTable:
+        """
+        Returns the series for `ids` between `start` and `end`, querying only uncached
+        buckets.
+
+        Args:
+            report: "flow-series" or "segment-series".
+            ids: Flow or segment ids to include.
+            statistics: Statistics to return, e.g. ["opens", "recipients"].
+            interval: "hourly", "daily", "weekly" or "monthly".
+            start: Beginning of the series; aligned down to a bucket boundary.
+            end: End of the series. Defaults to now.
+            timezone: Account timezone that buckets are aligned to.
+            conversion_metric_id: Conversion metric, required by flow reports.
+
+        Returns:
+            ReportTable: One row per grouping with a `date_times` axis.
+        """
+        if report not in SERIES_REPORTS:
+            raise ValueError(
+                f"Unsupported series report '{report}', expected one of: "
+                f"{', '.join(SERIES_REPORTS)}"
+            )
+        id_field, filter_template = SERIES_REPORTS[report]
+        tz = ZoneInfo(timezone)
+        now = self.clock()
+        start = bucket_start(start, interval, tz)
+        end = (end or now).astimezone(tz)
+        complete_boundary = max(bucket_start(min(now, end), interval, tz), start)
+        scope = (report, interval, timezone)
+
+        with self._lock:
+            window_start = min(
+                self._uncached_from((*scope, statistic, id), start)
+                for statistic in statistics
+                for id in ids
+            )
+        fresh = ReportTable({}, {})
+        if window_start < end:
+            timeframe = {"start": window_start.isoformat(), "end": end.isoformat()}
+            body = self.engine.build_body(
+                report,
+                statistics,
+                timeframe,
+                conversion_metric_id=conversion_metric_id,
+                filter=filter_template.format(ids=json.dumps(sorted(ids))),
+                interval=interval,
+            )
+            fresh = self.engine.fetch(report, body)
+            self._store(
+                scope, fresh, statistics, ids, interval, window_start, complete_boundary
+            )
+        return self._assemble(
+            scope,
+            fresh,
+            ids,
+            statistics,
+            id_field,
+            interval,
+            start,
+            end,
+            complete_boundary,
+        )
+
+    def invalidate(self, report: str | None = None) -> None:
+        with self._lock:
+            for store in (
+                self._buckets,
+                self._complete_from,
+                self._complete_until,
+                self._rows,
+            ):
+                for key in [k for k in store if report is None or k[0] == report]:
+                    del store[key]
+
+    def _store(
+        self,
+        scope: tuple,
+        table: ReportTable,
+        statistics: list[str],
+        ids: list[str],
+        interval: str,
+        window_start: datetime,
+        complete_boundary: datetime,
+    ) -> None:
+        id_field = SERIES_REPORTS[scope[0]][0]
+        date_times = table.date_times or []
+        complete = [
+            (j, date_time)
+            for j, date_time in enumerate(date_times)
+            if next_bucket(datetime.fromisoformat(date_time), interval)
+            <= complete_boundary
+        ]
+        with self._lock:
+            for i, groupings in enumerate(self._grouping_keys(table)):
+                self._rows.setdefault(
+                    (*scope, table.groupings[id_field][i]), set()
+                ).add(groupings)
+                for statistic in statistics:
+                    if statistic not in table.statistics:
+                        continue
+                    values = self._buckets.setdefault(
+                        (*scope, statistic, groupings), {}
+                    )
+                    for j, date_time in complete:
+                        values[date_time] = float(table.statistics[statistic][i, j])
+            for statistic in statistics:
+                for id in ids:
+                    key = (*scope, statistic, id)
+                    cached_from = self._complete_from.get(key)
+                    cached_until = self._complete_until.get(key)
+                    if (
+                        cached_from is None
+                        or window_start > cached_until
+                        or complete_boundary < cached_from
+                    ):
+                        # A window apart from the cached range replaces it, so the
+                        # range never spans buckets that were not fetched.
+                        cached_from, cached_until = window_start, complete_boundary
+                    self._complete_from[key] = min(cached_from, window_start)
+                    self._complete_until[key] = max(cached_until, complete_boundary)
+
+    def _uncached_from(self, key: tuple, start: datetime) -> datetime:
+        # Cached buckets are contiguous, so a series starting before them is fetched
+        # again from its start.
+        if key not in self._complete_until or start < self._complete_from[key]:
+            return start
+        return max(self._complete_until[key], start)
+
+    def _assemble(
+        self,
+        scope: tuple,
+        fresh: ReportTable,
+        ids: list[str],
+        statistics: list[str],
+        id_field: str,
+        interval: str,
+        start: datetime,
+        end: datetime,
+        complete_boundary: datetime,
+    ) -> ReportTable:
+        fresh_rows = {
+            groupings: i for i, groupings in enumerate(self._grouping_keys(fresh))
+        }
+        fresh_dates = {
+            date_time: j for j, date_time in enumerate(fresh.date_times or [])
+        }
+        with self._lock:
+            row_keys = sorted(
+                set().union(*(self._rows.get((*scope, id), set()) for id in ids))
+                | set(fresh_rows)
+            )
+            dates = {
+                date_time
+                for groupings in row_keys
+                for statistic in statistics
+                for date_time in self._buckets.get((*scope, statistic, groupings), {})
+            }
+            dates.update(fresh_dates)
+            date_times = sorted(
+                (d for d in dates if start <= datetime.fromisoformat(d) < end),
+                key=datetime.fromisoformat,
+            )
+            results = []
+            for groupings in row_keys:
+                row_statistics = {}
+                for statistic in statistics:
+                    cached = self._buckets.get((*scope, statistic, groupings), {})
+                    fresh_column = fresh.statistics.get(statistic)
+                    row = []
+                    for date_time in date_times:
+                        value = cached.get(date_time)
+                        if (
+                            date_time in fresh_dates
+                            and groupings in fresh_rows
+                            and fresh_column is not None
+                        ):
+                            value = float(
+                                fresh_column[
+                                    fresh_rows[groupings], fresh_dates[date_time]
+                                ]
+                            )
+                        row.append(value)
+                    row_statistics[statistic] = row
+                results.append(
+                    {"groupings": dict(groupings), "statistics": row_statistics}
+                )
+        return ReportTable.from_results(results, date_times)
+
+    @staticmethod
+    def _grouping_keys(table: ReportTable) -> list[tuple]:
+        names = sorted(table.groupings)
+        return [
+            tuple((name, table.groupings[name][i]) for name in names)
+            for i in range(len(table))
+        ]
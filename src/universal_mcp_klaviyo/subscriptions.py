@@ -0,0 +1,375 @@
+import threading
+import time
+from typing import Any
+
+from loguru import logger
+
+from universal_mcp_klaviyo.profiles import normalize_identifier
+from universal_mcp_klaviyo.utils import (
+    RateLimiter,
+    call_with_retry,
+    chunked,
+    is_retryable,
+    run_concurrently,
+)
+
+CHANNELS = {"email": "email", "sms": "phone_number"}
+MAX_SUBSCRIPTION_BATCH = 1000
+
+
+class ConsentOperation:
+    """
+    One queued subscribe or unsubscribe, in arrival order.
+    """
+
+    def __init__(
+        self,
+        seq: int,
+        action: str,
+        list_id: str | None,
+        channel: str,
+        identifier: str,
+        profile_id: str | None = None,
+        consented_at: str | None = None,
+    ) -> None:
+        self.seq = seq
+        self.action = action
+        self.list_id = list_id
+        self.channel = channel
+        self.identifier = identifier
+        self.profile_id = profile_id
+        self.consented_at = consented_at
+
+    @property
+    def key(self) -> tuple[str, str]:
+        return self.channel, normalize_identifier(
+            CHANNELS[self.channel], self.identifier
+        )
+
+    def profile(self) -> dict[str, Any]:
+        consent: dict[str, Any] = {
+            "consent": "SUBSCRIBED" if self.action == "subscribe" else "UNSUBSCRIBED"
+        }
+        if self.consented_at and self.action == "subscribe":
+            consent["consented_at"] = self.consented_at
+        resource: dict[str, Any] = {
+            "type": "profile",
+            "attributes": {
+                CHANNELS[self.channel]: self.identifier,
+                "subscriptions": {self.channel: {"marketing": consent}},
+            },
+        }
+        if self.profile_id and self.action == "subscribe":
+            resource["id"] = self.profile_id
+        return resource
+
+
+class SubscriptionBatcher:
+    """
+    Batches consent changes into `bulk_subscribe_profiles` / `bulk_unsubscribe_profiles`
+    jobs.
+
+    Operations are grouped by (list id, channel, action) and sent as jobs of up to 1000
+    profiles. Klaviyo applies these jobs asynchronously and returns no job to wait on,
+    so jobs submitted in order may still be applied out of order. Operations on the same
+    (profile, channel, list) therefore collapse to the last one before anything is sent:
+    a subscribe followed by an unsubscribe only sends the unsubscribe. Changes to one
+    profile on different lists are split into waves submitted one after another, a
+    profile appearing at most once per wave. Since there is no job to poll, the batcher
+    waits `wave_delay` seconds between waves to give Klaviyo time to apply one before
+    the next; only batches containing conflicting changes have more than one wave.
+    A wave failing with a retryable error is put back in the queue together with every
+    later wave; operations Klaviyo rejects outright are dropped and counted instead.
+
+    Args:
+        app: The KlaviyoApp instance to submit through.
+        flush_interval: Maximum seconds an operation waits before being submitted.
+        max_pending: Number of pending operations that triggers an early flush.
+        wave_delay: Seconds to wait between waves, giving Klaviyo time to apply the
+            previous jobs. Lowering it risks jobs being applied out of order.
+        max_workers: Maximum number of job submissions in flight.
+        tier: Klaviyo rate tier of the bulk subscription endpoints.
+        custom_source: Optional `custom_source` recorded on subscribe jobs.
+        historical_import: Marks subscribe jobs as historical imports, which requires
+            `consented_at`.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        flush_interval: float = 5.0,
+        max_pending: int = 10000,
+        wave_delay: float = 30.0,
+        max_workers: int = 4,
+        tier: str = "M",
+        custom_source: str | None = None,
+        historical_import: bool = False,
+    ) -> None:
+        self.app = app
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.wave_delay = wave_delay
+        self.max_workers = max_workers
+        self.limiter = RateLimiter.for_tier(tier)
+        self.custom_source = custom_source
+        self.historical_import = historical_import
+        self._pending: list[ConsentOperation] = []
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def __enter__(self) -> "SubscriptionBatcher":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def subscribe(
+        self,
+        list_id: str,
+        channel: str = "email",
+        email: str | None = None,
+        phone_number: str | None = None,
+        profile_id: str | None = None,
+        consented_at: str | None = None,
+    ) -> None:
+        """
+        Queues a marketing subscription of one profile to a list.
+
+        Args:
+            list_id: The list to subscribe to.
+            channel: "email" or "sms".
+            email: Email address, required for the email channel.
+            phone_number: Phone number in E.164 format, required for the sms channel.
+            profile_id: Optional id of the existing profile.
+            consented_at: When consent was collected, for historical imports.
+        """
+        self._put(
+            "subscribe", list_id, channel, email, phone_number, profile_id, consented_at
+        )
+
+    def unsubscribe(
+        self,
+        list_id: str | None = None,
+        channel: str = "email",
+        email: str | None = None,
+        phone_number: str | None = None,
+    ) -> None:
+        """
+        Queues a marketing unsubscribe of one profile, from a list or, without
+        `list_id`, from the channel.
+        """
+        self._put("unsubscribe", list_id, channel, email, phone_number)
+
+    def _put(
+        self,
+        action: str,
+        list_id: str | None,
+        channel: str,
+        email: str | None,
+        phone_number: str | None,
+        profile_id: str | None = None,
+        consented_at: str | None = None,
+    ) -> None:
+        if channel not in CHANNELS:
+            raise ValueError(
+                f"Unsupported channel '{channel}', expected one of: "
+                f"{', '.join(CHANNELS)}"
+            )
+        identifier = email if channel == "email" else phone_number
+        if not identifier:
+            raise ValueError(f"The {channel} channel needs {CHANNELS[channel]}")
+        with self._lock:
+            self._seq += 1
+            self._pending.append(
+                ConsentOperation(
+                    self._seq,
+                    action,
+                    list_id,
+                    channel,
+                    identifier,
+                    profile_id,
+                    consented_at,
+                )
+            )
+            full = len(self._pending) >= self.max_pending
+        if full:
+            self._wake.set()
+
+    @staticmethod
+    def plan(
+        operations: list[ConsentOperation],
+    ) -> list[dict[tuple[str | None, str, str], list[ConsentOperation]]]:
+        """
+        Splits operations into ordered waves of (list id, channel, action) groups.
+
+        Only the last operation per (profile, channel, list) is kept. A profile appears
+        at most once per wave for each channel, and its remaining operations land in
+        strictly increasing waves.
+
+        Returns:
+            list[dict]: One dict per wave mapping (list id, channel, action) to its
+                operations.
+        """
+        waves: list[
+            dict[tuple[str | None, str, str], dict[tuple[str, str], ConsentOperation]]
+        ] = []
+        last: dict[tuple[str, str], tuple[int, ConsentOperation]] = {}
+        final = {
+            (operation.key, operation.list_id): operation
+            for operation in sorted(operations, key=lambda op: op.seq)
+        }
+        for operation in sorted(final.values(), key=lambda op: op.seq):
+            group = (operation.list_id, operation.channel, operation.action)
+            previous = last.get(operation.key)
+            if (
+                previous is not None
+                and (previous[1].list_id, previous[1].channel, previous[1].action)
+                == group
+            ):
+                wave = previous[0]
+            else:
+                wave = previous[0] + 1 if previous is not None else 0
+            while len(waves) <= wave:
+                waves.append({})
+            waves[wave].setdefault(group, {})[operation.key] = operation
+            last[operation.key] = (wave, operation)
+        return [
+            {group: list(entries.values()) for group, entries in wave.items()}
+            for wave in waves
+        ]
+
+    def flush(self) -> dict[str, int]:
+        """
+        Submits every pending operation now.
+
+        Returns:
+            dict[str, int]: Number of `operations` submitted, `jobs` created, `waves`
+                used, operations `failed` and put back in the queue, and operations
+                `dropped` because Klaviyo rejected them.
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+            waves = self.plan(pending)
+            submitted, jobs, dropped = 0, 0, 0
+            for number, wave in enumerate(waves):
+                if number and self.wave_delay:
+                    time.sleep(self.wave_delay)
+                batches = [
+                    (group, batch)
+                    for group, operations in wave.items()
+                    for batch in chunked(operations, MAX_SUBSCRIPTION_BATCH)
+                ]
+                errors = run_concurrently(
+                    self._submit, batches, self.max_workers, self.limiter
+                )
+                failed = []
+                for (_, batch), error in zip(batches, errors):
+                    if error is None:
+                        submitted += len(batch)
+                        jobs += 1
+                    elif is_retryable(error):
+                        failed += batch
+                    else:
+                        dropped += len(batch)
+                if failed:
+                    # Later waves depend on this one, so they go back in the queue
+                    # unsent.
+                    failed += [
+                        operation
+                        for later in waves[number + 1 :]
+                        for operations in later.values()
+                        for operation in operations
+                    ]
+                    with self._lock:
+                        self._pending = (
+                            sorted(failed, key=lambda operation: operation.seq)
+                            + self._pending
+                        )
+                    return {
+                        "operations": submitted,
+                        "jobs": jobs,
+                        "waves": number + 1,
+                        "failed": len(failed),
+                        "dropped": dropped,
+                    }
+            return {
+                "operations": submitted,
+                "jobs": jobs,
+                "waves": len(waves),
+                "failed": 0,
+                "dropped": dropped,
+            }
+
+    def start(self) -> None:
+        """
+        Starts the background thread that flushes on the interval.
+        """
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="klaviyo-subscription-batcher", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops the background thread and submits whatever is still pending.
+        """
+        if self._thread is not None:
+            self._stopped.set()
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Flushing queued Klaviyo consent changes failed")
+
+    def _submit(
+        self, job: tuple[tuple[str | None, str, str], list[ConsentOperation]]
+    ) -> Exception | None:
+        (list_id, _, action), operations = job
+        attributes: dict[str, Any] = {
+            "profiles": {"data": [operation.profile() for operation in operations]}
+        }
+        if action == "subscribe":
+            if self.custom_source:
+                attributes["custom_source"] = self.custom_source
+            if self.historical_import:
+                attributes["historical_import"] = True
+        kind = "create" if action == "subscribe" else "delete"
+        data: dict[str, Any] = {
+            "type": f"profile-subscription-bulk-{kind}-job",
+            "attributes": attributes,
+        }
+        if list_id:
+            data["relationships"] = {"list": {"data": {"type": "list", "id": list_id}}}
+        method = (
+            self.app.bulk_subscribe_profiles
+            if action == "subscribe"
+            else self.app.bulk_unsubscribe_profiles
+        )
+        try:
+            call_with_retry(method, data=data)
+        except Exception as e:
+            logger.exception(
+                f"Submitting a {action} job for {len(operations)} profiles failed"
+            )
+            return e
+        return None
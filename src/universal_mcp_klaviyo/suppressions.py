@@ -0,0 +1,205 @@
+import threading
+from collections.abc import Iterable
+from concurrent.futures import Future
+from typing import Any
+
+from loguru import logger
+
+from universal_mcp_klaviyo.jobs import JobPoller
+from universal_mcp_klaviyo.list_sync import IdSet
+from universal_mcp_klaviyo.profiles import normalize_identifier
+from universal_mcp_klaviyo.utils import (
+    RateLimiter,
+    call_with_retry,
+    chunked,
+    iter_resources,
+    run_concurrently,
+)
+
+MAX_SUPPRESSION_BATCH = 100
+SUPPRESSED_FILTER = (
+    "greater-than(subscriptions.email.marketing.suppression.timestamp,{since})"
+)
+# Action -> (job submitter, job type, status getter).
+ACTIONS = {
+    "suppress": (
+        "bulk_suppress_profiles",
+        "profile-suppression-bulk-create-job",
+        "get_bulk_suppress_profiles_job",
+    ),
+    "unsuppress": (
+        "bulk_unsuppress_profiles",
+        "profile-suppression-bulk-delete-job",
+        "get_bulk_unsuppress_profiles_job",
+    ),
+}
+
+
+class SuppressionManager:
+    """
+    Applies large email suppression deltas through `bulk_suppress_profiles` and
+    `bulk_unsuppress_profiles`.
+
+    Emails currently suppressed are streamed once from `get_profiles` with a
+    `subscriptions.email.marketing.suppression` filter into a compact
+    `IdSet`, so a delta only submits emails whose state actually changes:
+    suppressions skip emails that are already suppressed, unsuppressions skip emails
+    that are not. The rest are read lazily, chunked into jobs of the maximum size,
+    submitted concurrently under the endpoints' rate tier and tracked by a shared
+    `JobPoller` until every job finishes.
+
+    Args:
+        app: The KlaviyoApp instance to call through.
+        poller: Job poller to share. Defaults to a new one.
+        batch_size: Emails per job (Klaviyo allows up to 100).
+        max_workers: Maximum number of job submissions in flight.
+        tier: Klaviyo rate tier of the suppression job endpoints.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        poller: JobPoller | None = None,
+        batch_size: int = MAX_SUPPRESSION_BATCH,
+        max_workers: int = 4,
+        tier: str = "L",
+    ) -> None:
+        self.app = app
+        self.poller = poller or JobPoller(app, tier=tier)
+        self.batch_size = min(batch_size, MAX_SUPPRESSION_BATCH)
+        self.max_workers = max_workers
+        self.limiter = RateLimiter.for_tier(tier)
+        self._suppressed: IdSet | None = None
+        self._lock = threading.Lock()
+
+    def load_suppressed(self, since: str = "1970-01-01T00:00:00Z") -> IdSet:
+        """
+        Streams the emails of profiles suppressed after `since` into the set used for
+        de-duplication.
+        """
+        profiles = iter_resources(
+            self.app.get_profiles,
+            fields_profile="email",
+            filter=SUPPRESSED_FILTER.format(since=since),
+            page_size=100,
+        )
+        suppressed = IdSet.from_iterable(
+            normalize_identifier("email", profile["attributes"]["email"])
+            for profile in profiles
+            if (profile.get("attributes") or {}).get("email")
+        )
+        with self._lock:
+            self._suppressed = (
+                suppressed
+                if self._suppressed is None
+                else self._suppressed | suppressed
+            )
+            return self._suppressed
+
+    def suppress(
+        self, emails: Iterable[str], chunk_size: int = 100_000
+    ) -> dict[str, int]:
+        """
+        Suppresses every given email that is not suppressed yet.
+
+        Returns:
+            dict[str, int]: Emails `submitted` and `skipped`, `jobs` run, and emails
+                whose job could not be created or `failed`.
+        """
+        return self._apply("suppress", emails, chunk_size)
+
+    def unsuppress(
+        self, emails: Iterable[str], chunk_size: int = 100_000
+    ) -> dict[str, int]:
+        """
+        Lifts the suppression of every given email that is currently suppressed.
+
+        Returns:
+            dict[str, int]: Emails `submitted` and `skipped`, `jobs` run, and emails
+                whose job could not be created or `failed`.
+        """
+        return self._apply("unsuppress", emails, chunk_size)
+
+    def _apply(
+        self, action: str, emails: Iterable[str], chunk_size: int
+    ) -> dict[str, int]:
+        submitter, job_type, getter = ACTIONS[action]
+        if self._suppressed is None:
+            self.load_suppressed()
+        stats = {"submitted": 0, "skipped": 0, "jobs": 0, "failed": 0}
+        # Emails of failed jobs; succeeded ones are caught as repeats by the suppressed
+        # set.
+        failed: set[str] = set()
+
+        def submit(batch: list[str]) -> str | None:
+            data = {
+                "type": job_type,
+                "attributes": {
+                    "profiles": {
+                        "data": [
+                            {"type": "profile", "attributes": {"email": email}}
+                            for email in batch
+                        ]
+                    }
+                },
+            }
+            # A batch that cannot be submitted fails on its own; the other batches'
+            # jobs are still tracked.
+            try:
+                job = call_with_retry(getattr(self.app, submitter), data=data)
+            except Exception as e:
+                logger.error(f"Could not {action} {len(batch)} emails: {e}")
+                return None
+            return job["data"]["id"]
+
+        # Each chunk's jobs finish before the next chunk is read, so memory stays
+        # bounded by the chunk, the suppressed set and the failures.
+        for chunk in chunked(emails, chunk_size):
+            suppressed = self._suppressed
+            pending: dict[str, None] = {}
+            for raw in chunk:
+                email = normalize_identifier("email", raw)
+                if (
+                    email in pending
+                    or email in failed
+                    or (email in suppressed) == (action == "suppress")
+                ):
+                    stats["skipped"] += 1
+                    continue
+                pending[email] = None
+            batches = list(chunked(pending, self.batch_size))
+            job_ids = run_concurrently(submit, batches, self.max_workers, self.limiter)
+            futures = [
+                None if job_id is None else self.poller.watch(getter, job_id)
+                for job_id in job_ids
+            ]
+            outcomes = [
+                (batch, future is not None and self._succeeded(future))
+                for batch, future in zip(batches, futures)
+            ]
+            done = IdSet.from_iterable(
+                email for batch, succeeded in outcomes if succeeded for email in batch
+            )
+            failed.update(
+                email
+                for batch, succeeded in outcomes
+                if not succeeded
+                for email in batch
+            )
+            with self._lock:
+                self._suppressed = (
+                    self._suppressed | done
+                    if action == "suppress"
+                    else self._suppressed - done
+                )
+            stats["submitted"] += len(pending)
+            stats["jobs"] += sum(job_id is not None for job_id in job_ids)
+        stats["failed"] = len(failed)
+        return stats
+
+    @staticmethod
+    def _succeeded(future: Future) -> bool:
+        try:
+            return (future.result().get("attributes") or {}).get("status") == "complete"
+        except Exception:
+            return False
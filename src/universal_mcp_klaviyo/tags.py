@@ -0,0 +1,144 @@
+from collections.abc import Iterable
+from typing import Any
+
+from universal_mcp_klaviyo.utils import (
+    RateLimiter,
+    call_with_retry,
+    chunked,
+    iter_resources,
+    run_concurrently,
+)
+
+TAGGABLE_KINDS = ("flow", "campaign", "list", "segment")
+MAX_TAG_BATCH = 100
+
+
+class TagChange:
+    """
+    One relationship request of the plan: add or remove a batch of objects of one kind
+    on a tag.
+    """
+
+    def __init__(self, tag_id: str, kind: str, action: str, ids: list[str]) -> None:
+        self.tag_id = tag_id
+        self.kind = kind
+        self.action = action
+        self.ids = ids
+
+    def __repr__(self) -> str:
+        return (
+            f"TagChange({self.tag_id!r}, {self.kind!r}, {self.action!r}, "
+            f"{len(self.ids)} ids)"
+        )
+
+
+class TagPlanner:
+    """
+    Applies a tagging policy across flows, campaigns, lists and segments with the fewest
+    calls.
+
+    A policy maps each tag id to the objects that should carry it, per kind. The current
+    tag -> object relationships of every (tag, kind) pair in the policy are read
+    concurrently with `get_*_ids_for_tag`, diffed against the policy, and the
+    differences are sent through `tag_*` / `remove_tag_from_*` in batches of up to
+    `MAX_TAG_BATCH` objects, concurrently under the tag endpoints' rate tier.
+
+    Args:
+        app: The KlaviyoApp instance to call through.
+        max_workers: Maximum number of requests in flight.
+        tier: Klaviyo rate tier of the tag relationship endpoints.
+    """
+
+    def __init__(self, app: Any, max_workers: int = 4, tier: str = "M") -> None:
+        self.app = app
+        self.max_workers = max_workers
+        self.limiter = RateLimiter.for_tier(tier)
+
+    def current(
+        self, pairs: Iterable[tuple[str, str]]
+    ) -> dict[tuple[str, str], set[str]]:
+        """
+        Reads the objects currently tagged, for each (tag id, kind) pair, in parallel.
+        """
+        pairs = list(dict.fromkeys(pairs))
+        for _, kind in pairs:
+            if kind not in TAGGABLE_KINDS:
+                raise ValueError(
+                    f"Unsupported kind '{kind}', expected one of: "
+                    f"{', '.join(TAGGABLE_KINDS)}"
+                )
+
+        def read(pair: tuple[str, str]) -> set[str]:
+            tag_id, kind = pair
+            method = getattr(self.app, f"get_{kind}_ids_for_tag")
+            return {resource["id"] for resource in iter_resources(method, tag_id)}
+
+        return dict(
+            zip(pairs, run_concurrently(read, pairs, self.max_workers, self.limiter))
+        )
+
+    def plan(
+        self, policy: dict[str, dict[str, Iterable[str]]], remove: bool = True
+    ) -> list[TagChange]:
+        """
+        Computes the minimal relationship requests that make the account match the
+        policy.
+
+        Args:
+            policy: Tag id -> kind ("flow", "campaign", "list" or "segment") -> ids that
+                should carry the tag. Kinds left out of a tag's entry are not touched.
+            remove: When False, objects tagged but missing from the policy keep the tag.
+
+        Returns:
+            list[TagChange]: Batches to add and remove, at most `MAX_TAG_BATCH` ids
+                each.
+        """
+        desired = {
+            (tag_id, kind): set(ids)
+            for tag_id, kinds in policy.items()
+            for kind, ids in kinds.items()
+        }
+        current = self.current(desired)
+        changes = []
+        for (tag_id, kind), target in desired.items():
+            diffs = [("add", target - current[(tag_id, kind)])]
+            if remove:
+                diffs.append(("remove", current[(tag_id, kind)] - target))
+            for action, ids in diffs:
+                changes += [
+                    TagChange(tag_id, kind, action, batch)
+                    for batch in chunked(sorted(ids), MAX_TAG_BATCH)
+                ]
+        return changes
+
+    def apply(
+        self, policy: dict[str, dict[str, Iterable[str]]], remove: bool = True
+    ) -> dict[str, int]:
+        """
+        Plans and executes the policy, see `plan` for the arguments.
+
+        Returns:
+            dict[str, int]: Number of relationships `added` and `removed`, and
+                `requests` made to change them.
+        """
+        changes = self.plan(policy, remove)
+
+        def submit(change: TagChange) -> None:
+            prefix = "tag" if change.action == "add" else "remove_tag_from"
+            method = getattr(self.app, f"{prefix}_{change.kind}s")
+            call_with_retry(
+                method,
+                change.tag_id,
+                data=[{"type": change.kind, "id": id} for id in change.ids],
+            )
+
+        run_concurrently(submit, changes, self.max_workers, self.limiter)
+        return {
+            "added": sum(
+                len(change.ids) for change in changes if change.action == "add"
+            ),
+            "removed": sum(
+                len(change.ids) for change in changes if change.action == "remove"
+            ),
+            "requests": len(changes),
+        }
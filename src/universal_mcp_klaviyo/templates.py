@@ -0,0 +1,164 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from universal_mcp_klaviyo.utils import RateLimiter, call_with_retry, run_concurrently
+
+
+def context_hash(context: dict[str, Any] | None) -> str:
+    """
+    Hash of a render context that ignores key order and whitespace.
+    """
+    canonical = json.dumps(
+        context or {}, sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class TemplateRenderCache:
+    """
+    Memoises `render_template` results by template id, template version and context.
+
+    Cache keys combine the template's `updated` timestamp with a canonical hash of the
+    context, so editing a template invalidates its renders without any bookkeeping. The
+    timestamp itself is read with `get_template` at most once per `version_ttl` seconds
+    per template. Batch renders de-duplicate equal contexts and fan the misses out
+    concurrently under the render endpoint's rate tier.
+
+    Args:
+        app: The KlaviyoApp instance to render through.
+        max_entries: Maximum number of renders kept, least recently used first out.
+        version_ttl: Seconds a template's `updated` timestamp is trusted before it is
+            re-read.
+        max_workers: Maximum number of renders in flight during `render_many`.
+        tier: Klaviyo rate tier of `render_template`.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        max_entries: int = 1024,
+        version_ttl: float = 30.0,
+        max_workers: int = 4,
+        tier: str = "S",
+    ) -> None:
+        self.app = app
+        self.max_entries = max_entries
+        self.version_ttl = version_ttl
+        self.max_workers = max_workers
+        self.limiter = RateLimiter.for_tier(tier)
+        self.hits = 0
+        self.misses = 0
+        self._renders: OrderedDict[tuple[str, str, str], dict[str, Any]] = OrderedDict()
+        self._versions: dict[str, tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._renders)
+
+    def version(self, template_id: str) -> str:
+        """
+        Returns the template's `updated` timestamp, re-reading it once `version_ttl` has
+        passed.
+        """
+        now = time.monotonic()
+        with self._lock:
+            cached = self._versions.get(template_id)
+        if cached and now - cached[0] < self.version_ttl:
+            return cached[1]
+        document = call_with_retry(
+            self.app.get_template, template_id, fields_template="updated"
+        )
+        updated = document["data"]["attributes"].get("updated") or ""
+        with self._lock:
+            self._versions[template_id] = (now, updated)
+        return updated
+
+    def render(
+        self, template_id: str, context: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """
+        Renders a template, returning the cached result when the template and context
+        are unchanged.
+
+        Args:
+            template_id: The template to render.
+            context: Variables available to the template.
+
+        Returns:
+            dict[str, Any]: The `render_template` response document.
+        """
+        return self.render_many(template_id, [context])[0]
+
+    def render_many(
+        self, template_id: str, contexts: list[dict[str, Any] | None]
+    ) -> list[dict[str, Any]]:
+        """
+        Renders a template once per context, concurrently, reusing cached and repeated
+        renders.
+
+        Args:
+            template_id: The template to render.
+            contexts: One context per render.
+
+        Returns:
+            list[dict[str, Any]]: The `render_template` response documents, in input
+                order.
+        """
+        version = self.version(template_id)
+        keys = [(template_id, version, context_hash(context)) for context in contexts]
+        results: dict[tuple[str, str, str], dict[str, Any]] = {}
+        with self._lock:
+            for key in keys:
+                if key in self._renders:
+                    self._renders.move_to_end(key)
+                    results[key] = self._renders[key]
+        missing = {
+            key: context for key, context in zip(keys, contexts) if key not in results
+        }
+        with self._lock:
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+
+        def render(
+            item: tuple[tuple[str, str, str], dict[str, Any] | None],
+        ) -> dict[str, Any]:
+            _, context = item
+            data = {
+                "type": "template",
+                "id": template_id,
+                "attributes": {"context": context or {}},
+            }
+            return call_with_retry(self.app.render_template, data=data)
+
+        for key, document in zip(
+            missing,
+            run_concurrently(render, missing.items(), self.max_workers, self.limiter),
+        ):
+            results[key] = document
+            self._store(key, document)
+        return [results[key] for key in keys]
+
+    def invalidate(self, template_id: str | None = None) -> None:
+        """
+        Drops cached renders and versions of one template, or of all templates.
+        """
+        with self._lock:
+            if template_id is None:
+                self._renders.clear()
+                self._versions.clear()
+                return
+            self._versions.pop(template_id, None)
+            for key in [key for key in self._renders if key[0] == template_id]:
+                del self._renders[key]
+
+    def _store(self, key: tuple[str, str, str], document: dict[str, Any]) -> None:
+        with self._lock:
+            self._renders[key] = document
+            self._renders.move_to_end(key)
+            while len(self._renders) > self.max_entries:
+                self._renders.popitem(last=False)
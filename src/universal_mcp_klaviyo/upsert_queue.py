@@ -0,0 +1,278 @@
+import threading
+from typing import Any
+
+from loguru import logger
+
+from universal_mcp_klaviyo.profiles import normalize_identifier
+from universal_mcp_klaviyo.utils import (
+    RateLimiter,
+    call_with_retry,
+    chunked,
+    is_retryable,
+    run_concurrently,
+)
+
+# Identifiers that coalesce updates; the first one present names the pending slot.
+KEY_FIELDS = ("id", "external_id", "email", "phone_number")
+# Attributes holding objects that are merged field by field rather than replaced.
+NESTED_FIELDS = ("location", "properties")
+MAX_BULK_IMPORT_PROFILES = 10000
+
+
+def merge_attributes(older: dict[str, Any], newer: dict[str, Any]) -> dict[str, Any]:
+    """
+    Last-write-wins merge of two profile attribute dicts.
+    """
+    merged = {**older, **newer}
+    for field in NESTED_FIELDS:
+        if isinstance(older.get(field), dict) and isinstance(newer.get(field), dict):
+            merged[field] = {**older[field], **newer[field]}
+    return merged
+
+
+class ProfileUpsertQueue:
+    """
+    Write-behind buffer in front of `create_or_update_profile`.
+
+    Updates for the same profile are coalesced until the next flush, so a burst of small
+    attribute changes becomes one write. Updates share a slot when they share any
+    identifier (emails compared case-insensitively), and a record carrying identifiers
+    of several slots merges them. Flushes happen every `flush_interval` seconds once
+    `start()` has been called, as soon as `max_pending` profiles are waiting, or on
+    `flush()`. Backlogs of at least `bulk_threshold` profiles go through
+    `bulk_import_profiles` instead of individual upserts. Writes that fail with a
+    retryable error are put back in the queue, under any newer pending values, for up to
+    `max_attempts` flushes; writes Klaviyo rejects outright, such as a 400 for an
+    invalid attribute, are dropped at once and reported by `flush`.
+
+    Args:
+        app: The KlaviyoApp instance to write through.
+        flush_interval: Maximum seconds an update waits before being written.
+        max_pending: Number of pending profiles that triggers an early flush.
+        bulk_threshold: Minimum backlog size sent as bulk import jobs.
+        max_workers: Maximum number of individual upserts in flight.
+        tier: Klaviyo rate tier of `create_or_update_profile`.
+        index: Optional `ProfileIdentityIndex` kept up to date from upsert responses.
+        max_attempts: Flushes a profile's write may fail in before it is dropped.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        flush_interval: float = 5.0,
+        max_pending: int = 10000,
+        bulk_threshold: int = 100,
+        max_workers: int = 4,
+        tier: str = "M",
+        index: Any = None,
+        max_attempts: int = 5,
+    ) -> None:
+        self.app = app
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.bulk_threshold = bulk_threshold
+        self.max_workers = max_workers
+        self.limiter = RateLimiter.for_tier(tier)
+        self.index = index
+        self.max_attempts = max_attempts
+        self._pending: dict[tuple[str, str], dict[str, Any]] = {}
+        # Key of a requeued slot -> flushes its write has already failed in.
+        self._attempts: dict[tuple[str, str], int] = {}
+        # Every identifier of a pending update -> key of its slot in `_pending`.
+        self._slots: dict[tuple[str, str], tuple[str, str]] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def __enter__(self) -> "ProfileUpsertQueue":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def put(self, attributes: dict[str, Any], id: str | None = None) -> None:
+        """
+        Queues an update. `attributes` must contain an email, phone number or external
+        id unless `id` is given.
+        """
+        if id is not None:
+            attributes = {**attributes, "id": id}
+        if not any(attributes.get(field) for field in KEY_FIELDS):
+            raise ValueError(f"Profile update needs one of: {', '.join(KEY_FIELDS)}")
+        with self._lock:
+            self._merge(attributes, older=False)
+            full = len(self._pending) >= self.max_pending
+        if full:
+            self._wake.set()
+
+    def flush(self) -> dict[str, Any]:
+        """
+        Writes every pending update now.
+
+        Returns:
+            dict[str, Any]: Counts of `profiles` written and `failed`, the ids of bulk
+                import `jobs` created, and the identifiers of failed profiles
+                `dropped` instead of being requeued.
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending, self._slots = self._pending, {}, {}
+                attempts, self._attempts = self._attempts, {}
+            if not pending:
+                return {"profiles": 0, "failed": 0, "jobs": [], "dropped": []}
+            if len(pending) >= self.bulk_threshold:
+                failed, jobs = self._bulk_import(pending)
+            else:
+                failed, jobs = self._upsert(pending), []
+            dropped = []
+            with self._lock:
+                for key, error in failed.items():
+                    tries = attempts.get(key, 0) + 1
+                    if is_retryable(error) and tries < self.max_attempts:
+                        self._merge(pending[key], older=True, attempts=tries)
+                        continue
+                    logger.error(
+                        f"Dropping the update of Klaviyo profile {key[0]}={key[1]} "
+                        f"after {tries} failed attempts: {error}"
+                    )
+                    dropped.append(key)
+            return {
+                "profiles": len(pending) - len(failed),
+                "failed": len(failed),
+                "jobs": jobs,
+                "dropped": dropped,
+            }
+
+    def start(self) -> None:
+        """
+        Starts the background thread that flushes on the interval.
+        """
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="klaviyo-upsert-queue", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops the background thread and writes whatever is still pending.
+        """
+        if self._thread is not None:
+            self._stopped.set()
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Flushing queued Klaviyo profile updates failed")
+
+    def _merge(
+        self, attributes: dict[str, Any], older: bool, attempts: int = 0
+    ) -> None:
+        # Folds an update into the slot of its identifiers, under or over the pending
+        # values.
+        identifiers = [
+            (field, normalize_identifier(field, attributes[field]))
+            for field in KEY_FIELDS
+            if attributes.get(field)
+        ]
+        slots = [
+            key
+            for key in dict.fromkeys(
+                self._slots.get(identifier) for identifier in identifiers
+            )
+            if key
+        ]
+        if len(slots) > 1:
+            # Slots are merged in the order they were last written, so later writes
+            # still win.
+            order = {key: i for i, key in enumerate(self._pending)}
+            slots.sort(key=order.__getitem__)
+            stale = set(slots[1:])
+            for identifier, slot in self._slots.items():
+                if slot in stale:
+                    self._slots[identifier] = slots[0]
+        merged: dict[str, Any] = {}
+        for key in slots:
+            merged = merge_attributes(merged, self._pending.pop(key))
+            attempts = max(attempts, self._attempts.pop(key, 0))
+        merged = (
+            merge_attributes(attributes, merged)
+            if older
+            else merge_attributes(merged, attributes)
+        )
+        key = slots[0] if slots else identifiers[0]
+        self._pending[key] = merged
+        if attempts:
+            self._attempts[key] = attempts
+        for identifier in identifiers:
+            self._slots[identifier] = key
+
+    @staticmethod
+    def _resource(attributes: dict[str, Any]) -> dict[str, Any]:
+        attributes = dict(attributes)
+        resource = {"type": "profile"}
+        if "id" in attributes:
+            resource["id"] = attributes.pop("id")
+        resource["attributes"] = attributes
+        return resource
+
+    def _upsert(
+        self, pending: dict[tuple[str, str], dict[str, Any]]
+    ) -> dict[tuple[str, str], Exception]:
+        def write(item: tuple[tuple[str, str], dict[str, Any]]) -> Exception | None:
+            key, attributes = item
+            try:
+                document = call_with_retry(
+                    self.app.create_or_update_profile, data=self._resource(attributes)
+                )
+            except Exception as e:
+                logger.exception(f"Upserting Klaviyo profile {key[0]}={key[1]} failed")
+                return e
+            if self.index is not None:
+                self.index.observe(document)
+            return None
+
+        errors = run_concurrently(
+            write, pending.items(), self.max_workers, self.limiter
+        )
+        return {key: error for key, error in zip(pending, errors) if error is not None}
+
+    def _bulk_import(
+        self, pending: dict[tuple[str, str], dict[str, Any]]
+    ) -> tuple[dict[tuple[str, str], Exception], list[str]]:
+        failed: dict[tuple[str, str], Exception] = {}
+        jobs = []
+        for keys in chunked(pending, MAX_BULK_IMPORT_PROFILES):
+            data = {
+                "type": "profile-bulk-import-job",
+                "attributes": {
+                    "profiles": {"data": [self._resource(pending[key]) for key in keys]}
+                },
+            }
+            try:
+                document = call_with_retry(self.app.bulk_import_profiles, data=data)
+            except Exception as e:
+                logger.exception(
+                    f"Submitting a bulk import of {len(keys)} Klaviyo profiles failed"
+                )
+                failed.update((key, e) for key in keys)
+                continue
+            if document:
+                jobs.append(document["data"]["id"])
+        return failed, jobs
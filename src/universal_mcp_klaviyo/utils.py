@@ -0,0 +1,238 @@
+import inspect
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+import httpx
+
+RETRYABLE_STATUS_CODES = {429, 502, 503, 504}
+
+# Klaviyo rate limit tiers: (burst requests per second, steady requests per minute).
+RATE_TIERS = {
+    "XS": (1, 15),
+    "S": (3, 60),
+    "M": (10, 150),
+    "L": (75, 700),
+    "XL": (350, 3500),
+}
+
+
+def retry_after(response: httpx.Response, default: float) -> float:
+    """
+    Seconds to wait before retrying, taken from the Retry-After header when present.
+    """
+    value = response.headers.get("Retry-After")
+    try:
+        return max(float(value), 0.0) if value is not None else default
+    except ValueError:
+        return default
+
+
+def call_with_retry(
+    func: Callable[..., Any],
+    *args: Any,
+    max_retries: int = 3,
+    backoff: float = 1.0,
+    **kwargs: Any,
+) -> Any:
+    """
+    Calls a KlaviyoApp method, retrying throttled and transiently failing requests.
+
+    Rate-limited responses are retried after the server's Retry-After hint; other
+    retryable failures back off exponentially. Retries are counted in the app's metrics
+    registry when one has been attached with `metrics.instrument`.
+
+    Args:
+        func: A bound KlaviyoApp method, e.g. `app.get_profiles`.
+        *args: Positional arguments for `func`.
+        max_retries: Maximum number of retries before the error is re-raised.
+        backoff: Base delay in seconds for exponential backoff.
+        **kwargs: Keyword arguments for `func`.
+
+    Returns:
+        Any: Whatever `func` returns.
+
+    Raises:
+        httpx.HTTPStatusError: If the request still fails after `max_retries` retries,
+            or fails with a non-retryable status.
+    """
+    metrics = getattr(getattr(func, "__self__", None), "metrics", None)
+    for attempt in range(max_retries + 1):
+        try:
+            return func(*args, **kwargs)
+        except httpx.HTTPStatusError as e:
+            if (
+                attempt == max_retries
+                or e.response.status_code not in RETRYABLE_STATUS_CODES
+            ):
+                raise
+            delay = retry_after(e.response, backoff * 2**attempt)
+        except httpx.TransportError:
+            if attempt == max_retries:
+                raise
+            delay = backoff * 2**attempt
+        if metrics is not None:
+            metrics.record_retry(func.__name__)
+        time.sleep(delay)
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Whether a failed request may succeed if sent again later: transport errors and the
+    statuses `call_with_retry` retries. Other failures, such as a 400 for an invalid
+    payload, fail the same way every time.
+    """
+    if isinstance(error, httpx.TransportError):
+        return True
+    return (
+        isinstance(error, httpx.HTTPStatusError)
+        and error.response.status_code in RETRYABLE_STATUS_CODES
+    )
+
+
+def next_cursor(document: dict[str, Any]) -> str | None:
+    """
+    Extracts the cursor for the next page from a JSON:API `links.next` URL.
+
+    List endpoints name the parameter `page[cursor]` and reporting endpoints
+    `page_cursor`; both are recognised.
+    """
+    next_url = (document.get("links") or {}).get("next")
+    if not next_url:
+        return None
+    query = parse_qs(urlsplit(next_url).query)
+    values = query.get("page[cursor]") or query.get("page_cursor")
+    return values[0] if values else None
+
+
+def iter_pages(
+    func: Callable[..., dict[str, Any]], *args: Any, max_retries: int = 3, **kwargs: Any
+) -> Iterator[dict[str, Any]]:
+    """
+    Yields every page of a paginated KlaviyoApp method, following `links.next`.
+
+    Methods without a `page_cursor` parameter are called once.
+
+    Args:
+        func: A bound KlaviyoApp method, e.g. `app.get_profiles`.
+        *args: Positional arguments for `func`.
+        max_retries: Retries per page, see `call_with_retry`.
+        **kwargs: Keyword arguments for `func`, e.g. `filter` or `page_size`.
+
+    Returns:
+        Iterator[dict[str, Any]]: Response documents in page order.
+    """
+    paginated = "page_cursor" in inspect.signature(func).parameters
+    while True:
+        document = call_with_retry(func, *args, max_retries=max_retries, **kwargs)
+        yield document
+        cursor = next_cursor(document) if paginated else None
+        if cursor is None:
+            return
+        kwargs["page_cursor"] = cursor
+
+
+def iter_resources(
+    func: Callable[..., dict[str, Any]], *args: Any, **kwargs: Any
+) -> Iterator[dict[str, Any]]:
+    """
+    Yields the individual resources in `data` across all pages of `func`.
+    """
+    for document in iter_pages(func, *args, **kwargs):
+        data = document.get("data") or []
+        yield from data if isinstance(data, list) else [data]
+
+
+def chunked(items: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    """
+    Splits a stream into lists of at most `size` items.
+    """
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class RateLimiter:
+    """
+    Token buckets enforcing both the burst and the steady limit of a Klaviyo rate tier.
+
+    Args:
+        burst: Requests allowed per second.
+        steady: Requests allowed per minute.
+    """
+
+    def __init__(self, burst: float, steady: float) -> None:
+        self._limits = ((burst, burst), (steady, steady / 60.0))
+        self._tokens = [float(burst), float(steady)]
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_tier(cls, tier: str) -> "RateLimiter":
+        if tier not in RATE_TIERS:
+            raise ValueError(
+                f"Unknown rate tier '{tier}', expected one of: {', '.join(RATE_TIERS)}"
+            )
+        return cls(*RATE_TIERS[tier])
+
+    def acquire(self) -> None:
+        """
+        Blocks until a request may be sent under both limits.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                elapsed, self._updated = now - self._updated, now
+                for i, (capacity, per_second) in enumerate(self._limits):
+                    self._tokens[i] = min(
+                        capacity, self._tokens[i] + elapsed * per_second
+                    )
+                if all(tokens >= 1 for tokens in self._tokens):
+                    self._tokens = [tokens - 1 for tokens in self._tokens]
+                    return
+                wait = max(
+                    (1 - tokens) / per_second
+                    for tokens, (_, per_second) in zip(self._tokens, self._limits)
+                )
+            time.sleep(wait)
+
+
+def run_concurrently(
+    func: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_workers: int = 8,
+    limiter: RateLimiter | None = None,
+) -> list[Any]:
+    """
+    Calls `func` on every item from a thread pool and returns the results in input
+    order.
+
+    Args:
+        func: Function applied to each item.
+        items: Inputs, one call each.
+        max_workers: Maximum number of calls in flight.
+        limiter: Optional rate limiter acquired before each call.
+
+    Returns:
+        list[Any]: `func(item)` for each item. The first exception raised by a call is
+            re-raised.
+    """
+
+    def call(item: Any) -> Any:
+        if limiter is not None:
+            limiter.acquire()
+        return func(item)
+
+    items = list(items)
+    if len(items) <= 1 or max_workers <= 1:
+        return [call(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(call, items))
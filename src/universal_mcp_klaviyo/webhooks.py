@@ -0,0 +1,418 @@
+import asyncio
+import base64
+import contextlib
+import hashlib
+import hmac
+import inspect
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterator, Mapping
+from typing import Any
+
+import uvicorn
+from loguru import logger
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+SIGNATURE_HEADER = "klaviyo-signature"
+TIMESTAMP_HEADER = "klaviyo-timestamp"
+MAX_BODY_SIZE = 5 << 20
+# Limits of the built-in listener: bytes of a request's head, open connections.
+MAX_HEADER_SIZE = 16 << 10
+MAX_CONNECTIONS = 1000
+
+Handler = Callable[[list[dict[str, Any]]], Awaitable[None] | None]
+
+
+def sign(secret: str, body: bytes, timestamp: str | None = None) -> str:
+    """
+    HMAC-SHA256 signature of a delivery, base64-encoded. The timestamp, when sent, is
+    signed with the body.
+    """
+    message = body + timestamp.encode() if timestamp else body
+    return base64.b64encode(
+        hmac.new(secret.encode(), message, hashlib.sha256).digest()
+    ).decode()
+
+
+def delivery_events(payload: Any) -> list[dict[str, Any]]:
+    """
+    Events in a delivery: the `data` array of a batch, or the single event object.
+    """
+    data = payload.get("data", payload) if isinstance(payload, dict) else payload
+    events = data if isinstance(data, list) else [data]
+    return [event for event in events if isinstance(event, dict)]
+
+
+class _MemoryQueue:
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._events: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        self._taken = 0
+
+    def __len__(self) -> int:
+        # Events taken for a batch count until acknowledged.
+        return self._events.qsize() + self._taken
+
+    def seen_ids(self) -> list[str]:
+        return []
+
+    def push(self, events: list[dict[str, Any]]) -> None:
+        for event in events:
+            self._events.put_nowait(event)
+
+    async def pop(self, size: int, interval: float) -> list[dict[str, Any]]:
+        batch = [await self._events.get()]
+        self._taken = 1
+        deadline = time.monotonic() + interval
+        while len(batch) < size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._events.get(), remaining))
+                self._taken += 1
+            except TimeoutError:
+                break
+        return batch
+
+    def ack(self, batch: list[dict[str, Any]]) -> None:
+        self._taken = 0
+
+
+class _SpoolQueue:
+    # Events are committed to SQLite before the delivery is acknowledged and deleted
+    # only once handled.
+    def __init__(self, path: str, max_size: int) -> None:
+        self.max_size = max_size
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS spool (seq INTEGER PRIMARY KEY, event_id TEXT, "
+            "event TEXT NOT NULL)"
+        )
+        self._ready = asyncio.Event()
+        self._inflight: list[int] = []
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM spool").fetchone()[0]
+
+    def seen_ids(self) -> list[str]:
+        return [
+            row[0]
+            for row in self._db.execute(
+                "SELECT event_id FROM spool WHERE event_id IS NOT NULL ORDER BY seq"
+            )
+        ]
+
+    def push(self, events: list[dict[str, Any]]) -> None:
+        with self._db:
+            self._db.executemany(
+                "INSERT INTO spool (event_id, event) VALUES (?, ?)",
+                [
+                    (event.get("id"), json.dumps(event, separators=(",", ":")))
+                    for event in events
+                ],
+            )
+        self._ready.set()
+
+    async def pop(self, size: int, interval: float) -> list[dict[str, Any]]:
+        while not len(self):
+            self._ready.clear()
+            await self._ready.wait()
+        if len(self) < size:
+            await asyncio.sleep(interval)
+        rows = self._db.execute(
+            "SELECT seq, event FROM spool ORDER BY seq LIMIT ?", (size,)
+        ).fetchall()
+        self._inflight = [row[0] for row in rows]
+        return [json.loads(row[1]) for row in rows]
+
+    def ack(self, batch: list[dict[str, Any]]) -> None:
+        with self._db:
+            self._db.executemany(
+                "DELETE FROM spool WHERE seq = ?", [(seq,) for seq in self._inflight]
+            )
+
+    def close(self) -> None:
+        self._db.close()
+
+
+class _EmbeddedServer(uvicorn.Server):
+    # Runs inside the caller's event loop, so the caller keeps its signal handlers.
+    @contextlib.contextmanager
+    def capture_signals(self) -> Iterator[None]:
+        yield
+
+
+class WebhookReceiver:
+    """
+    Optional asyncio HTTP endpoint for Klaviyo webhook deliveries.
+
+    Each POST is authenticated by comparing the `Klaviyo-Signature` header with an
+    HMAC-SHA256 of the raw body (and `Klaviyo-Timestamp`, when sent) under the webhook's
+    `secret_key`, in constant time. Accepted events are de-duplicated by event id
+    against queued and handled events, and a single dispatcher hands them to `handler`
+    in batches; ids of a batch dropped after `max_attempts` are forgotten so Klaviyo's
+    redelivery is accepted. When the queue is full the receiver answers 503 so Klaviyo
+    retries later. With `spool_path` the queue lives in SQLite and events survive a
+    restart; otherwise it is in memory.
+
+    Deliveries are served by a Starlette route, `asgi_app`, run by uvicorn on
+    `host`:`port` or mounted in an existing ASGI application. The built-in listener
+    caps request heads at 16 KiB and open connections at 1000, closes idle keep-alive
+    connections after `read_timeout` and answers 408 to bodies not received within it.
+
+    Args:
+        secret: The `secret_key` the webhook was created with.
+        handler: Called with each batch of events; may be a coroutine function. Plain
+            functions run in a worker thread.
+        host: Interface to listen on.
+        port: Port to listen on; 0 picks a free one.
+        path: URL path deliveries are posted to.
+        max_queue: Maximum number of queued events.
+        batch_size: Maximum number of events per handler call.
+        batch_interval: Seconds to wait for a batch to fill before dispatching it.
+        dedupe_window: Number of recent event ids remembered for de-duplication.
+        max_skew: Maximum age in seconds of a delivery's `Klaviyo-Timestamp`, when sent.
+        spool_path: SQLite file for a disk-backed queue.
+        max_attempts: Handler attempts per batch before the batch is dropped and logged.
+        read_timeout: Seconds allowed for reading a body and for an idle keep-alive
+            connection.
+    """
+
+    def __init__(
+        self,
+        secret: str,
+        handler: Handler,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        path: str = "/",
+        max_queue: int = 10000,
+        batch_size: int = 100,
+        batch_interval: float = 0.5,
+        dedupe_window: int = 100_000,
+        max_skew: float = 300.0,
+        spool_path: str | None = None,
+        max_attempts: int = 3,
+        read_timeout: float = 10.0,
+    ) -> None:
+        self.secret = secret
+        self.handler = handler
+        self.host = host
+        self.port = port
+        self.path = path
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.dedupe_window = dedupe_window
+        self.max_skew = max_skew
+        self.spool_path = spool_path
+        self.max_attempts = max_attempts
+        self.read_timeout = read_timeout
+        self.asgi_app = Starlette(
+            routes=[Route(path, self._endpoint, methods=["POST"])]
+        )
+        self.stats = {
+            "received": 0,
+            "duplicates": 0,
+            "rejected": 0,
+            "malformed": 0,
+            "dispatched": 0,
+            "failed": 0,
+        }
+        # Ids of handled events, and of events queued but not handled yet.
+        self._seen: OrderedDict[str, None] = OrderedDict()
+        self._queued: set[str] = set()
+        self._queue: _MemoryQueue | _SpoolQueue | None = None
+        self._server: uvicorn.Server | None = None
+        self._serving: asyncio.Task | None = None
+        self._dispatcher: asyncio.Task | None = None
+        self._busy = False
+
+    async def __aenter__(self) -> "WebhookReceiver":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.stop()
+
+    async def start(self, serve: bool = True) -> None:
+        """
+        Starts the dispatcher and, unless `serve` is False, the HTTP listener. `port` is
+        updated with the bound port.
+        """
+        self._queue = (
+            _SpoolQueue(self.spool_path, self.max_queue)
+            if self.spool_path
+            else _MemoryQueue(self.max_queue)
+        )
+        self._queued.update(self._queue.seen_ids())
+        self._dispatcher = asyncio.create_task(self._dispatch())
+        if serve:
+            config = uvicorn.Config(
+                self.asgi_app,
+                host=self.host,
+                port=self.port,
+                http="h11",
+                lifespan="off",
+                log_level="warning",
+                timeout_keep_alive=self.read_timeout,
+                timeout_graceful_shutdown=self.read_timeout,
+                limit_concurrency=MAX_CONNECTIONS,
+                h11_max_incomplete_event_size=MAX_HEADER_SIZE,
+            )
+            self._server = _EmbeddedServer(config)
+            self._serving = asyncio.create_task(self._serve_http())
+            while not self._server.started:
+                if self._serving.done():
+                    self._server = None
+                    raise OSError(f"Could not listen on {self.host}:{self.port}")
+                await asyncio.sleep(0.01)
+            self.port = self._server.servers[0].sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """
+        Stops accepting deliveries, dispatches what is queued in memory and shuts down.
+        """
+        if self._server is not None:
+            self._server.should_exit = True
+            await self._serving
+            self._server = self._serving = None
+        if self._dispatcher is not None:
+            # A spooled queue keeps its events for the next start; a memory queue is
+            # drained first.
+            while (
+                isinstance(self._queue, _MemoryQueue)
+                and (len(self._queue) or self._busy)
+                and not self._dispatcher.done()
+            ):
+                await asyncio.sleep(self.batch_interval / 10)
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+        if isinstance(self._queue, _SpoolQueue):
+            self._queue.close()
+
+    def verify(self, body: bytes, headers: Mapping[str, str]) -> bool:
+        """
+        Checks a delivery's signature and, when a timestamp is sent, its freshness.
+        """
+        headers = {key.lower(): value for key, value in headers.items()}
+        signature = headers.get(SIGNATURE_HEADER)
+        if not signature:
+            return False
+        timestamp = headers.get(TIMESTAMP_HEADER)
+        if timestamp is not None:
+            try:
+                if abs(time.time() - float(timestamp)) > self.max_skew:
+                    return False
+            except ValueError:
+                return False
+        return hmac.compare_digest(
+            signature.encode(), sign(self.secret, body, timestamp).encode()
+        )
+
+    async def receive(self, body: bytes, headers: Mapping[str, str]) -> int:
+        """
+        Authenticates, de-duplicates and queues one delivery.
+
+        Returns:
+            int: The HTTP status to answer with: 202 when queued, 401 for a bad
+                signature, 400 for a malformed body and 503 when the queue is full.
+        """
+        if not self.verify(body, headers):
+            self.stats["rejected"] += 1
+            return 401
+        try:
+            events = delivery_events(json.loads(body))
+        except ValueError:
+            self.stats["malformed"] += 1
+            return 400
+        fresh, ids = [], set()
+        for event in events:
+            event_id = event.get("id")
+            if event_id is not None and (
+                event_id in self._seen or event_id in self._queued or event_id in ids
+            ):
+                self.stats["duplicates"] += 1
+                continue
+            if event_id is not None:
+                ids.add(event_id)
+            fresh.append(event)
+        if len(self._queue) + len(fresh) > self._queue.max_size:
+            return 503
+        self._queue.push(fresh)
+        self._queued |= ids
+        self.stats["received"] += len(fresh)
+        return 202
+
+    def _remember(self, event_id: str) -> None:
+        self._seen[event_id] = None
+        self._seen.move_to_end(event_id)
+        while len(self._seen) > self.dedupe_window:
+            self._seen.popitem(last=False)
+
+    async def _dispatch(self) -> None:
+        while True:
+            batch = await self._queue.pop(self.batch_size, self.batch_interval)
+            self._busy = True
+            handled = False
+            for attempt in range(1, self.max_attempts + 1):
+                try:
+                    if inspect.iscoroutinefunction(self.handler):
+                        await self.handler(batch)
+                    else:
+                        await asyncio.to_thread(self.handler, batch)
+                    self.stats["dispatched"] += len(batch)
+                    handled = True
+                    break
+                except Exception:
+                    logger.exception(
+                        f"Webhook handler failed on a batch of {len(batch)} events "
+                        f"(attempt {attempt})"
+                    )
+                    if attempt < self.max_attempts:
+                        await asyncio.sleep(2 ** (attempt - 1) * self.batch_interval)
+            else:
+                self.stats["failed"] += len(batch)
+            for event in batch:
+                event_id = event.get("id")
+                if event_id is not None:
+                    self._queued.discard(event_id)
+                    if handled:
+                        self._remember(event_id)
+            self._queue.ack(batch)
+            self._busy = False
+
+    async def _serve_http(self) -> None:
+        try:
+            await self._server.serve()
+        except SystemExit:
+            # uvicorn exits when it cannot bind; `start` reports the failure.
+            pass
+
+    async def _endpoint(self, request: Request) -> Response:
+        try:
+            length = int(request.headers.get("content-length") or 0)
+        except ValueError:
+            return Response(status_code=400)
+        if length > MAX_BODY_SIZE:
+            return Response(status_code=413)
+        body = bytearray()
+        try:
+            async with asyncio.timeout(self.read_timeout):
+                async for chunk in request.stream():
+                    body += chunk
+                    if len(body) > MAX_BODY_SIZE:
+                        return Response(status_code=413)
+        except TimeoutError:
+            return Response(status_code=408)
+        return Response(status_code=await self.receive(bytes(body), request.headers))
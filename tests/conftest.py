@@ -0,0 +1,20 @@
+from unittest.mock import MagicMock
+
+import pytest
+from mock_klaviyo import MockKlaviyo
+
+from universal_mcp_klaviyo.app import KlaviyoApp
+
+
+@pytest.fixture
+def mock_klaviyo():
+    return MockKlaviyo()
+
+
+@pytest.fixture
+def mock_app(mock_klaviyo):
+    mock_integration = MagicMock()
+    mock_integration.get_credentials.return_value = {
+        "access_token": "dummy_access_token"
+    }
+    return KlaviyoApp(integration=mock_integration, client=mock_klaviyo.client())
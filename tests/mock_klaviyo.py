@@ -0,0 +1,536 @@
+"""
+In-process stand-in for the Klaviyo REST API.
+
+`MockKlaviyo` keeps resources, relationships, report rows and bulk jobs in memory and
+answers requests with JSON:API-shaped documents: cursor pagination through `links.next`,
+`included` arrays for `include=`, 429s with Retry-After when throttling is enabled, and
+bulk jobs that move from queued to complete as they are polled. Use `transport()` for an
+httpx MockTransport, or `serve()` to run it behind a real localhost socket.
+"""
+
+import json
+import re
+import threading
+import uuid
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import httpx
+
+Handler = Callable[[httpx.Request, re.Match], httpx.Response]
+
+_FILTER_TERM = re.compile(
+    r"(equals|any|greater-than|less-than|greater-or-equal|less-or-equal|contains)\(([\w.$-]+),(.+?)\)(?:,|$)"
+)
+
+
+def _singular(collection: str) -> str:
+    overrides = {"catalog-categories": "catalog-category", "tag-groups": "tag-group"}
+    return overrides.get(
+        collection, collection[:-1] if collection.endswith("s") else collection
+    )
+
+
+def _parse_value(raw: str) -> Any:
+    raw = raw.strip()
+    if raw.startswith("["):
+        return [
+            _parse_value(part) for part in re.findall(r'"[^"]*"|[^,\[\]]+', raw[1:-1])
+        ]
+    if raw.startswith('"') and raw.endswith('"'):
+        return raw[1:-1]
+    if raw in ("true", "false"):
+        return raw == "true"
+    return raw
+
+
+def _field(resource: dict[str, Any], name: str) -> Any:
+    if name == "id":
+        return resource["id"]
+    value: Any = resource["attributes"]
+    for part in name.split("."):
+        value = value.get(part) if isinstance(value, dict) else None
+    return value
+
+
+# Filter operator -> test of (field value, expected value).
+_FILTER_OPS = {
+    "equals": lambda value, expected: value == expected,
+    "any": lambda value, expected: value in expected,
+    "contains": lambda value, expected: value is not None and expected in value,
+    "greater-than": lambda value, expected: value is not None and value > expected,
+    "greater-or-equal": lambda value, expected: value is not None and value >= expected,
+    "less-than": lambda value, expected: value is not None and value < expected,
+    "less-or-equal": lambda value, expected: value is not None and value <= expected,
+}
+
+
+def _matches(resource: dict[str, Any], filter_expr: str | None) -> bool:
+    return all(
+        _FILTER_OPS[op](_field(resource, name), _parse_value(raw))
+        for op, name, raw in _FILTER_TERM.findall(filter_expr or "")
+    )
+
+
+def _json_response(
+    status_code: int, document: Any = None, headers: dict[str, str] | None = None
+) -> httpx.Response:
+    if document is None:
+        return httpx.Response(status_code, headers=headers)
+    return httpx.Response(status_code, json=document, headers=headers)
+
+
+def _error(
+    status_code: int, detail: str, meta: dict[str, Any] | None = None
+) -> httpx.Response:
+    error = {"status": status_code, "code": "error", "title": detail, "detail": detail}
+    if meta:
+        error["meta"] = meta
+    return _json_response(status_code, {"errors": [error]})
+
+
+class MockKlaviyo:
+    """
+    Fake Klaviyo API backed by in-memory collections.
+
+    Args:
+        throttle_every: When non-zero, every Nth request is answered with a 429.
+        retry_after: Value of the Retry-After header sent with 429 responses.
+        job_polls: How many status reads a bulk job stays queued/processing for.
+        rate_limit: Value reported in the RateLimit-Limit header.
+    """
+
+    def __init__(
+        self,
+        throttle_every: int = 0,
+        retry_after: int = 0,
+        job_polls: int = 2,
+        rate_limit: int = 150,
+    ) -> None:
+        self.resources: dict[str, dict[str, dict[str, Any]]] = defaultdict(dict)
+        self.relationships: dict[tuple[str, str, str], list[str]] = defaultdict(list)
+        self.reports: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        self.jobs: dict[str, dict[str, Any]] = {}
+        self.requests: list[httpx.Request] = []
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.job_polls = job_polls
+        self.rate_limit = rate_limit
+        self._lock = threading.Lock()
+        self._routes: list[tuple[str, re.Pattern, Handler]] = [
+            (method, re.compile(pattern), handler)
+            for method, pattern, handler in [
+                ("POST", r"/api/([\w-]+-reports)", self._query_report),
+                ("POST", r"/api/([\w-]+-jobs)", self._create_job),
+                ("GET", r"/api/([\w-]+-jobs)/([^/]+)", self._get_job),
+                (
+                    "GET",
+                    r"/api/([\w-]+)/([^/]+)/relationships/([\w-]+)",
+                    self._get_relationship,
+                ),
+                (
+                    "POST",
+                    r"/api/([\w-]+)/([^/]+)/relationships/([\w-]+)",
+                    self._add_relationship,
+                ),
+                (
+                    "PATCH",
+                    r"/api/([\w-]+)/([^/]+)/relationships/([\w-]+)",
+                    self._replace_relationship,
+                ),
+                (
+                    "DELETE",
+                    r"/api/([\w-]+)/([^/]+)/relationships/([\w-]+)",
+                    self._remove_relationship,
+                ),
+                ("GET", r"/api/([\w-]+)/([^/]+)/([\w-]+)", self._get_related),
+                ("GET", r"/api/([\w-]+)/([^/]+)", self._get_resource),
+                ("PATCH", r"/api/([\w-]+)/([^/]+)", self._update_resource),
+                ("DELETE", r"/api/([\w-]+)/([^/]+)", self._delete_resource),
+                ("GET", r"/api/([\w-]+)", self._list_resources),
+                ("POST", r"/api/([\w-]+)", self._create_resource),
+            ]
+        ]
+
+    def route(self, method: str, pattern: str) -> Callable[[Handler], Handler]:
+        """
+        Registers a handler for requests whose path fully matches `pattern`.
+
+        Registered routes take precedence over the generic collection behaviour, and
+        later registrations over earlier ones.
+        """
+
+        def decorator(handler: Handler) -> Handler:
+            self._routes.insert(0, (method, re.compile(pattern), handler))
+            return handler
+
+        return decorator
+
+    def add(
+        self,
+        collection: str,
+        id: str | None = None,
+        relationships: dict[str, list[str]] | None = None,
+        **attributes: Any,
+    ) -> dict[str, Any]:
+        """
+        Seeds a resource, e.g. `mock.add("profiles", email="a@example.com")`.
+        """
+        id = id or uuid.uuid4().hex[:26].upper()
+        resource = {"type": _singular(collection), "id": id, "attributes": attributes}
+        self.resources[collection][id] = resource
+        for name, ids in (relationships or {}).items():
+            self.relationships[(collection, id, name)] = list(ids)
+        return resource
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    def client(self) -> httpx.Client:
+        return httpx.Client(
+            transport=self.transport(), base_url="https://a.klaviyo.com"
+        )
+
+    @contextmanager
+    def serve(self) -> Iterator[str]:
+        """
+        Serves the mock on an ephemeral localhost port and yields its base URL.
+        """
+        mock = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def _dispatch(self) -> None:
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                request = httpx.Request(
+                    self.command,
+                    f"http://localhost{self.path}",
+                    headers=dict(self.headers),
+                    content=body,
+                )
+                response = mock.handle(request)
+                self.send_response(response.status_code)
+                for name, value in response.headers.items():
+                    if name.lower() != "content-length":
+                        self.send_header(name, value)
+                self.send_header("Content-Length", str(len(response.content)))
+                self.end_headers()
+                self.wfile.write(response.content)
+
+            do_GET = do_POST = do_PATCH = do_DELETE = _dispatch
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), RequestHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield f"http://127.0.0.1:{server.server_address[1]}"
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        with self._lock:
+            self.requests.append(request)
+            throttled = (
+                self.throttle_every and len(self.requests) % self.throttle_every == 0
+            )
+        if throttled:
+            response = _error(429, "Request was throttled.")
+            response.headers["Retry-After"] = str(self.retry_after)
+            response.headers["RateLimit-Remaining"] = "0"
+        else:
+            response = self._dispatch(request)
+            response.headers["RateLimit-Remaining"] = str(
+                max(self.rate_limit - len(self.requests), 0)
+            )
+        response.headers["RateLimit-Limit"] = str(self.rate_limit)
+        return response
+
+    def _dispatch(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        for method, pattern, handler in self._routes:
+            if method == request.method:
+                match = pattern.fullmatch(path)
+                if match:
+                    with self._lock:
+                        return handler(request, match)
+        return _error(404, f"No route for {request.method} {path}")
+
+    @staticmethod
+    def _params(request: httpx.Request) -> dict[str, str]:
+        return {k: v[-1] for k, v in parse_qs(urlsplit(str(request.url)).query).items()}
+
+    @staticmethod
+    def _body(request: httpx.Request) -> Any:
+        return json.loads(request.content) if request.content else {}
+
+    def _page(
+        self,
+        request: httpx.Request,
+        items: list[Any],
+        default_size: int = 20,
+        max_size: int = 100,
+        cursor_param: str = "page[cursor]",
+    ) -> tuple[list[Any], dict[str, Any]]:
+        params = self._params(request)
+        size = min(int(params.get("page[size]", default_size)), max_size)
+        offset = int(params.get(cursor_param) or 0)
+        links: dict[str, Any] = {"self": str(request.url), "next": None, "prev": None}
+        if offset + size < len(items):
+            query = {**params, cursor_param: str(offset + size)}
+            links["next"] = (
+                f"{request.url.scheme}://{request.url.host}{request.url.path}?{urlencode(query)}"
+            )
+        return items[offset : offset + size], links
+
+    def _included(
+        self, collection: str, resources: list[dict[str, Any]], include: str | None
+    ) -> list[dict[str, Any]]:
+        included, seen = [], set()
+        for name in filter(None, (include or "").split(",")):
+            for resource in resources:
+                for related_id in self.relationships.get(
+                    (collection, resource["id"], name), []
+                ):
+                    related = self._find(related_id)
+                    if related and (related["type"], related_id) not in seen:
+                        seen.add((related["type"], related_id))
+                        included.append(related)
+        return included
+
+    def _find(self, id: str) -> dict[str, Any] | None:
+        for resources in self.resources.values():
+            if id in resources:
+                return resources[id]
+        return None
+
+    def _with_relationships(
+        self, collection: str, resource: dict[str, Any]
+    ) -> dict[str, Any]:
+        relationships = {
+            name: {
+                "data": [
+                    {
+                        "type": (self._find(i) or {"type": _singular(name)})["type"],
+                        "id": i,
+                    }
+                    for i in ids
+                ]
+            }
+            for (coll, id, name), ids in self.relationships.items()
+            if coll == collection and id == resource["id"]
+        }
+        return (
+            {**resource, "relationships": relationships} if relationships else resource
+        )
+
+    def _list_resources(
+        self, request: httpx.Request, match: re.Match
+    ) -> httpx.Response:
+        collection = match.group(1)
+        params = self._params(request)
+        items = [
+            r
+            for r in self.resources[collection].values()
+            if _matches(r, params.get("filter"))
+        ]
+        sort = params.get("sort")
+        if sort:
+            key = sort.lstrip("-")
+            items.sort(
+                key=lambda r: (_field(r, key) is None, _field(r, key) or ""),
+                reverse=sort.startswith("-"),
+            )
+        page, links = self._page(request, items)
+        document = {
+            "data": [self._with_relationships(collection, r) for r in page],
+            "links": links,
+        }
+        if "include" in params:
+            document["included"] = self._included(collection, page, params["include"])
+        return _json_response(200, document)
+
+    def _get_resource(self, request: httpx.Request, match: re.Match) -> httpx.Response:
+        collection, id = match.groups()
+        resource = self.resources[collection].get(id)
+        if resource is None:
+            return _error(404, f"{_singular(collection)} {id} not found")
+        document = {
+            "data": self._with_relationships(collection, resource),
+            "links": {"self": str(request.url)},
+        }
+        include = self._params(request).get("include")
+        if include:
+            document["included"] = self._included(collection, [resource], include)
+        return _json_response(200, document)
+
+    def _create_resource(
+        self, request: httpx.Request, match: re.Match
+    ) -> httpx.Response:
+        collection = match.group(1)
+        data = self._body(request).get("data") or {}
+        attributes = data.get("attributes") or {}
+        if collection == "profiles":
+            for key in ("email", "phone_number", "external_id"):
+                for existing in self.resources[collection].values():
+                    if (
+                        attributes.get(key)
+                        and existing["attributes"].get(key) == attributes[key]
+                    ):
+                        return _error(
+                            409,
+                            "A profile already exists with one of these identifiers.",
+                            {"duplicate_profile_id": existing["id"]},
+                        )
+        relationships = {
+            name: [
+                rel["id"]
+                for rel in (
+                    value.get("data")
+                    if isinstance(value.get("data"), list)
+                    else [value.get("data")]
+                )
+                if rel
+            ]
+            for name, value in (data.get("relationships") or {}).items()
+        }
+        resource = self.add(collection, data.get("id"), relationships, **attributes)
+        return _json_response(
+            201, {"data": self._with_relationships(collection, resource)}
+        )
+
+    def _update_resource(
+        self, request: httpx.Request, match: re.Match
+    ) -> httpx.Response:
+        collection, id = match.groups()
+        resource = self.resources[collection].get(id)
+        if resource is None:
+            return _error(404, f"{_singular(collection)} {id} not found")
+        resource["attributes"].update(
+            (self._body(request).get("data") or {}).get("attributes") or {}
+        )
+        return _json_response(200, {"data": resource})
+
+    def _delete_resource(
+        self, request: httpx.Request, match: re.Match
+    ) -> httpx.Response:
+        collection, id = match.groups()
+        if self.resources[collection].pop(id, None) is None:
+            return _error(404, f"{_singular(collection)} {id} not found")
+        return _json_response(204)
+
+    def _get_relationship(
+        self, request: httpx.Request, match: re.Match
+    ) -> httpx.Response:
+        collection, id, name = match.groups()
+        ids = self.relationships.get((collection, id, name), [])
+        page, links = self._page(request, ids)
+        data = [
+            {"type": (self._find(i) or {"type": _singular(name)})["type"], "id": i}
+            for i in page
+        ]
+        return _json_response(200, {"data": data, "links": links})
+
+    def _get_related(self, request: httpx.Request, match: re.Match) -> httpx.Response:
+        collection, id, name = match.groups()
+        related = [
+            r
+            for r in map(self._find, self.relationships.get((collection, id, name), []))
+            if r
+        ]
+        params = self._params(request)
+        related = [r for r in related if _matches(r, params.get("filter"))]
+        page, links = self._page(request, related)
+        document = {"data": page, "links": links}
+        if "include" in params:
+            related_collection = next(
+                (c for c, rs in self.resources.items() if page and page[0]["id"] in rs),
+                name,
+            )
+            document["included"] = self._included(
+                related_collection, page, params["include"]
+            )
+        return _json_response(200, document)
+
+    def _add_relationship(
+        self, request: httpx.Request, match: re.Match
+    ) -> httpx.Response:
+        collection, id, name = match.groups()
+        ids = self.relationships[(collection, id, name)]
+        existing = set(ids)
+        ids.extend(
+            rel["id"]
+            for rel in self._body(request).get("data") or []
+            if rel["id"] not in existing
+        )
+        return _json_response(204)
+
+    def _replace_relationship(
+        self, request: httpx.Request, match: re.Match
+    ) -> httpx.Response:
+        data = self._body(request).get("data")
+        self.relationships[match.groups()] = [
+            rel["id"] for rel in (data if isinstance(data, list) else [data]) if rel
+        ]
+        return _json_response(204)
+
+    def _remove_relationship(
+        self, request: httpx.Request, match: re.Match
+    ) -> httpx.Response:
+        collection, id, name = match.groups()
+        removed = {rel["id"] for rel in self._body(request).get("data") or []}
+        key = (collection, id, name)
+        self.relationships[key] = [
+            i for i in self.relationships[key] if i not in removed
+        ]
+        return _json_response(204)
+
+    def _query_report(self, request: httpx.Request, match: re.Match) -> httpx.Response:
+        collection = match.group(1)
+        page, links = self._page(
+            request,
+            self.reports[collection],
+            default_size=500,
+            max_size=500,
+            cursor_param="page_cursor",
+        )
+        data = {
+            "type": _singular(collection),
+            "id": uuid.uuid4().hex,
+            "attributes": {"results": page},
+        }
+        return _json_response(200, {"data": data, "links": links})
+
+    def _create_job(self, request: httpx.Request, match: re.Match) -> httpx.Response:
+        collection = match.group(1)
+        data = self._body(request).get("data") or {}
+        job_id = data.get("id") or uuid.uuid4().hex
+        job = {
+            "type": data.get("type") or _singular(collection),
+            "id": job_id,
+            "attributes": {"status": "queued", "payload": data.get("attributes") or {}},
+        }
+        self.jobs[job_id] = {"polls": 0, "resource": job}
+        self.resources[collection][job_id] = job
+        return _json_response(202, {"data": job})
+
+    def _get_job(self, request: httpx.Request, match: re.Match) -> httpx.Response:
+        job = self.jobs.get(match.group(2))
+        if job is None or match.group(2) not in self.resources[match.group(1)]:
+            return _error(404, f"job {match.group(2)} not found")
+        job["polls"] += 1
+        attributes = job["resource"]["attributes"]
+        if job["polls"] > self.job_polls:
+            attributes["status"] = "complete"
+        elif job["polls"] > self.job_polls // 2:
+            attributes["status"] = "processing"
+        return _json_response(200, {"data": job["resource"]})
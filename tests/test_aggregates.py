@@ -0,0 +1,75 @@
+import json
+from datetime import UTC, datetime
+
+import httpx
+import pytest
+
+from universal_mcp_klaviyo.aggregates import AggregatePlanner
+
+
+@pytest.fixture
+def aggregates(mock_klaviyo):
+    @mock_klaviyo.route("POST", r"/api/metric-aggregates")
+    def metric_aggregates(request, match):
+        attributes = json.loads(request.content)["data"]["attributes"]
+        entries = [
+            {
+                "dimensions": [f"{name}-{i}" for name in attributes.get("by", [])],
+                "measurements": {m: [i, i + 1] for m in attributes["measurements"]},
+            }
+            for i in range(3 if attributes.get("by") else 1)
+        ]
+        document = {
+            "data": {
+                "type": "metric-aggregate",
+                "attributes": {
+                    "dates": ["2024-01-01T00:00:00+00:00", "2024-01-02T00:00:00+00:00"],
+                    "data": entries,
+                },
+            },
+            "links": {},
+        }
+        return httpx.Response(200, json=document)
+
+
+def test_plan_splits_groupings_and_long_timeframes(mock_app):
+    planner = AggregatePlanner(mock_app)
+    bodies = planner.plan(
+        ["M1", "M2"],
+        ["count", "unique"],
+        datetime(2023, 1, 1, tzinfo=UTC),
+        datetime(2024, 6, 1, tzinfo=UTC),
+        groupings=[
+            ["$attributed_channel"],
+            ["URL", "Client Type"],
+            ["Client Type", "URL"],
+        ],
+    )
+
+    assert len(bodies) == 2 * 2 * 2
+    assert all(
+        body["attributes"]["measurements"] == ["count", "unique"] for body in bodies
+    )
+    with pytest.raises(ValueError):
+        planner.plan(
+            ["M1"],
+            ["count"],
+            datetime(2024, 1, 1),
+            datetime(2024, 2, 1),
+            groupings=[["a", "b", "c"]],
+        )
+
+
+def test_run_assembles_columnar_result(mock_klaviyo, mock_app, aggregates):
+    table = AggregatePlanner(mock_app).run(
+        ["M1", "M2"],
+        ["count"],
+        datetime(2024, 1, 1, tzinfo=UTC),
+        datetime(2024, 1, 3, tzinfo=UTC),
+        groupings=[[], ["URL"]],
+        intervals=["day"],
+    )
+
+    assert len(mock_klaviyo.requests) == 4
+    assert len(table) == 2 * (1 + 3) * 2
+    assert table.where(metric_id="M2", URL="URL-2")["count"].tolist() == [2.0, 3.0]
@@ -15,3 +15,29 @@ def app_instance():
 
 def test_application(app_instance):
     check_application_instance(app_instance, app_name="klaviyo")
+
+
+def test_relationship_delete_sends_its_body(mock_klaviyo, mock_app):
+    mock_klaviyo.add("lists", id="L1", relationships={"profiles": ["P1", "P2"]})
+
+    assert (
+        mock_app.remove_profiles_from_list("L1", data=[{"type": "profile", "id": "P1"}])
+        is None
+    )
+
+    assert mock_klaviyo.relationships[("lists", "L1", "profiles")] == ["P2"]
+    assert (
+        mock_klaviyo.requests[-1].method == "DELETE"
+        and mock_klaviyo.requests[-1].content
+    )
+
+
+def test_empty_responses_decode_to_none(mock_klaviyo, mock_app):
+    mock_klaviyo.add("tags", id="T1", name="Onboarding")
+
+    assert mock_app.get_tag("T1")["data"]["attributes"]["name"] == "Onboarding"
+    assert mock_app.delete_tag("T1") is None
+    assert (
+        mock_app.add_profiles_to_list("L1", data=[{"type": "profile", "id": "P1"}])
+        is None
+    )
@@ -0,0 +1,148 @@
+import asyncio
+
+import pytest
+from universal_mcp.tools.manager import ToolManager
+
+from universal_mcp_klaviyo.reporting import ReportingEngine
+from universal_mcp_klaviyo.utils import iter_resources
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.fixture
+def profiles(mock_klaviyo):
+    for i in range(1000):
+        mock_klaviyo.add(
+            "profiles",
+            email=f"user{i}@example.com",
+            updated=f"2024-01-01T00:{i // 60:02d}:{i % 60:02d}+00:00",
+        )
+
+
+def test_pagination(benchmark, mock_app, profiles):
+    def run():
+        return sum(1 for _ in iter_resources(mock_app.get_profiles, page_size=100))
+
+    assert benchmark(run) == 1000
+
+
+def test_pagination_with_throttling(benchmark, mock_klaviyo, mock_app, profiles):
+    mock_klaviyo.throttle_every = 4
+
+    def run():
+        return sum(1 for _ in iter_resources(mock_app.get_profiles, page_size=100))
+
+    assert benchmark(run) == 1000
+
+
+def test_bulk_import(benchmark, mock_app):
+    payload = {
+        "type": "profile-bulk-import-job",
+        "attributes": {
+            "profiles": {
+                "data": [
+                    {"type": "profile", "attributes": {"email": f"user{i}@example.com"}}
+                    for i in range(10000)
+                ]
+            }
+        },
+    }
+
+    def run():
+        job = mock_app.bulk_import_profiles(data=payload)["data"]
+        while job["attributes"]["status"] != "complete":
+            job = mock_app.get_bulk_import_profiles_job(job["id"])["data"]
+        return job
+
+    assert benchmark(run)["attributes"]["status"] == "complete"
+
+
+def test_event_batching(benchmark, mock_app):
+    events = [
+        {
+            "type": "event-bulk-create",
+            "attributes": {
+                "profile": {
+                    "data": {
+                        "type": "profile",
+                        "attributes": {"email": f"user{i % 100}@example.com"},
+                    }
+                },
+                "events": {
+                    "data": [
+                        {
+                            "type": "event",
+                            "attributes": {
+                                "properties": {"value": i},
+                                "metric": {
+                                    "data": {
+                                        "type": "metric",
+                                        "attributes": {"name": "Viewed"},
+                                    }
+                                },
+                            },
+                        }
+                    ]
+                },
+            },
+        }
+        for i in range(1000)
+    ]
+
+    def run():
+        for start in range(0, len(events), 100):
+            mock_app.bulk_create_events(
+                data={
+                    "type": "event-bulk-create-job",
+                    "attributes": {
+                        "events-bulk-create": {"data": events[start : start + 100]}
+                    },
+                }
+            )
+
+    benchmark(run)
+
+
+def test_reporting_query(benchmark, mock_klaviyo, mock_app):
+    mock_klaviyo.reports["flow-values-reports"] = [
+        {
+            "groupings": {
+                "flow_id": f"F{i // 4}",
+                "send_channel": "email",
+                "flow_message_id": f"M{i}",
+            },
+            "statistics": {"opens": i, "recipients": 10 * i},
+        }
+        for i in range(2000)
+    ]
+    engine = ReportingEngine(mock_app, ttl=0)
+
+    def run():
+        table = engine.query(
+            "flow-values",
+            ["opens", "recipients"],
+            {"key": "last_30_days"},
+            conversion_metric_id="M1",
+        )
+        return table.group_by("flow_id").with_ratio("open_rate", "opens", "recipients")
+
+    assert len(benchmark(run)) == 500
+
+
+def test_tool_dispatch(benchmark, mock_klaviyo, mock_app):
+    mock_klaviyo.add("accounts", id="ACCOUNT", test_account=False)
+    manager = ToolManager()
+    manager.register_tools_from_app(mock_app, tool_names=["klaviyo_get_account"])
+
+    def run():
+        return asyncio.run(manager.call_tool("klaviyo_get_account", {"id": "ACCOUNT"}))
+
+    assert benchmark(run)["data"]["id"] == "ACCOUNT"
+
+
+def test_tool_dispatch_over_socket(benchmark, mock_klaviyo, mock_app):
+    mock_klaviyo.add("accounts", id="ACCOUNT", test_account=False)
+    with mock_klaviyo.serve() as base_url:
+        mock_app.base_url = base_url
+        mock_app._client = None
+        assert benchmark(mock_app.get_account, "ACCOUNT")["data"]["id"] == "ACCOUNT"
@@ -0,0 +1,171 @@
+import asyncio
+import json
+
+import pytest
+
+from universal_mcp_klaviyo.cache import (
+    ResourceCache,
+    WebhookInvalidator,
+    changed_resources,
+    register_webhook,
+)
+from universal_mcp_klaviyo.webhooks import WebhookReceiver, sign
+
+
+def _reads(mock_klaviyo, path):
+    return [
+        request
+        for request in mock_klaviyo.requests
+        if request.method == "GET" and request.url.path == path
+    ]
+
+
+def test_changed_resources_reads_event_and_relationships():
+    event = {
+        "type": "event",
+        "id": "E1",
+        "relationships": {
+            "profile": {"data": {"type": "profile", "id": "P1"}},
+            "metric": {"data": {"type": "metric", "id": "M1"}},
+        },
+    }
+    assert changed_resources(event) == {("profile", "P1")}
+    assert changed_resources({"type": "campaign", "id": "C1"}) == {("campaign", "C1")}
+
+
+def test_cache_serves_hits_and_keys_on_arguments(mock_klaviyo, mock_app):
+    mock_klaviyo.add("profiles", id="P1", email="ann@example.com")
+    cache = ResourceCache(mock_app)
+
+    assert (
+        cache.get("profile", "P1")["data"]["attributes"]["email"] == "ann@example.com"
+    )
+    cache.get("profile", "P1")
+    cache.get("profile", "P1", fields_profile="email")
+    assert len(_reads(mock_klaviyo, "/api/profiles/P1")) == 2
+    assert (cache.hits, cache.misses, len(cache)) == (1, 2, 2)
+    with pytest.raises(ValueError):
+        cache.get("metric", "M1")
+
+
+def test_read_racing_an_invalidation_is_not_cached(mock_klaviyo, mock_app):
+    mock_klaviyo.add("profiles", id="P1", email="old@example.com")
+    cache = ResourceCache(mock_app)
+    get_profile = mock_app.get_profile
+
+    def racing_get_profile(*args, **kwargs):
+        document = get_profile(*args, **kwargs)
+        # The webhook for a change lands after the read but before it is cached.
+        mock_klaviyo.resources["profiles"]["P1"]["attributes"]["email"] = (
+            "new@example.com"
+        )
+        cache.invalidate("profile", "P1")
+        return document
+
+    mock_app.get_profile = racing_get_profile
+    assert (
+        cache.get("profile", "P1")["data"]["attributes"]["email"] == "old@example.com"
+    )
+    assert len(cache) == 0
+    mock_app.get_profile = get_profile
+    assert (
+        cache.get("profile", "P1")["data"]["attributes"]["email"] == "new@example.com"
+    )
+    assert len(cache) == 1
+
+
+def test_read_racing_a_refresh_does_not_overwrite_it(mock_klaviyo, mock_app):
+    mock_klaviyo.add("profiles", id="P1", email="old@example.com")
+    cache = ResourceCache(mock_app)
+    cache.get("profile", "P1")
+    events = [{"type": "profile", "id": "P1"}]
+    get_profile = mock_app.get_profile
+    raced = []
+
+    def racing_get_profile(*args, **kwargs):
+        document = get_profile(*args, **kwargs)
+        if not raced:
+            raced.append(None)
+            # The expired entry is being re-read when the change is refreshed.
+            mock_klaviyo.resources["profiles"]["P1"]["attributes"]["email"] = (
+                "new@example.com"
+            )
+            raced.append(WebhookInvalidator(cache, refresh=True)(events))
+        return document
+
+    cache.ttl = 0
+    mock_app.get_profile = racing_get_profile
+    assert (
+        cache.get("profile", "P1")["data"]["attributes"]["email"] == "old@example.com"
+    )
+    assert raced[1] == {"evicted": 0, "refreshed": 1}
+    cache.ttl = 3600
+    mock_app.get_profile = get_profile
+    assert (
+        cache.get("profile", "P1")["data"]["attributes"]["email"] == "new@example.com"
+    )
+
+
+def test_invalidator_evicts_or_refreshes_changed_resources(mock_klaviyo, mock_app):
+    profile = mock_klaviyo.add("profiles", id="P1", email="ann@example.com")
+    mock_klaviyo.add("flows", id="F1", name="Welcome")
+    cache = ResourceCache(mock_app)
+    cache.get("profile", "P1")
+    cache.get("profile", "P1", include="lists")
+    cache.get("flow", "F1")
+    events = [
+        {
+            "type": "event",
+            "id": f"E{i}",
+            "relationships": {"profile": {"data": {"type": "profile", "id": "P1"}}},
+        }
+        for i in range(3)
+    ]
+
+    assert WebhookInvalidator(cache)(events) == {"evicted": 2, "refreshed": 0}
+    assert len(cache) == 1
+
+    cache.get("profile", "P1")
+    profile["attributes"]["email"] = "ann@example.org"
+    reads = len(_reads(mock_klaviyo, "/api/profiles/P1"))
+    assert WebhookInvalidator(cache, refresh=True)(events) == {
+        "evicted": 0,
+        "refreshed": 1,
+    }
+    assert len(_reads(mock_klaviyo, "/api/profiles/P1")) == reads + 1
+    assert (
+        cache.get("profile", "P1")["data"]["attributes"]["email"] == "ann@example.org"
+    )
+    assert len(_reads(mock_klaviyo, "/api/profiles/P1")) == reads + 1
+
+
+def test_register_webhook_and_receiver_bridge(mock_klaviyo, mock_app):
+    mock_klaviyo.add("campaigns", id="C1", name="Launch")
+    webhook_id = register_webhook(
+        mock_app, "cache", "https://example.com/hooks", "shh", ["campaign:updated"]
+    )
+    body = json.loads(
+        next(r for r in mock_klaviyo.requests if r.url.path == "/api/webhooks").content
+    )
+    assert body["data"]["relationships"]["webhook-topics"]["data"] == [
+        {"type": "webhook-topic", "id": "campaign:updated"}
+    ]
+    assert webhook_id
+
+    cache = ResourceCache(mock_app)
+    cache.get("campaign", "C1")
+
+    async def deliver():
+        async with WebhookReceiver(
+            "shh", WebhookInvalidator(cache), batch_interval=0.01
+        ) as receiver:
+            delivery = json.dumps({"data": [{"type": "campaign", "id": "C1"}]}).encode()
+            assert (
+                await receiver.receive(
+                    delivery, {"Klaviyo-Signature": sign("shh", delivery)}
+                )
+                == 202
+            )
+
+    asyncio.run(deliver())
+    assert len(cache) == 0
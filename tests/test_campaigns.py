@@ -0,0 +1,117 @@
+import json
+import threading
+
+import httpx
+
+from universal_mcp_klaviyo.campaigns import CampaignLauncher
+from universal_mcp_klaviyo.jobs import JobPoller
+
+
+def _posts(mock_klaviyo, path):
+    return [
+        request
+        for request in mock_klaviyo.requests
+        if request.method == "POST" and request.url.path == path
+    ]
+
+
+def test_launch_runs_every_campaign_through_estimate_and_send(mock_klaviyo, mock_app):
+    events = []
+    with CampaignLauncher(
+        mock_app, poller=JobPoller(mock_app, min_interval=0.01, tier="XL"), tier="XL"
+    ) as launcher:
+        launcher.on_event(
+            lambda campaign_id, stage, detail: events.append((campaign_id, stage))
+        )
+        stages = launcher.launch([f"C{i}" for i in range(8)] + ["C0"], timeout=10)
+    launcher.poller.stop()
+
+    assert stages == {f"C{i}": "sent" for i in range(8)}
+    assert len(_posts(mock_klaviyo, "/api/campaign-recipient-estimation-jobs")) == 8
+    assert len(_posts(mock_klaviyo, "/api/campaign-send-jobs")) == 8
+    c0 = [stage for campaign_id, stage in events if campaign_id == "C0"]
+    assert (
+        c0[:4] == ["estimating", "estimated", "sending", "progress"]
+        and c0[-1] == "sent"
+    )
+
+
+def test_cancel_before_and_during_send(mock_klaviyo, mock_app):
+    mock_klaviyo.job_polls = 1000
+    sending = threading.Event()
+
+    @mock_klaviyo.route("GET", r"/api/campaign-recipient-estimation-jobs/([^/]+)")
+    def estimation(request, match):
+        return httpx.Response(
+            200,
+            json={
+                "data": {
+                    "type": "campaign-recipient-estimation-job",
+                    "id": match.group(1),
+                    "attributes": {"status": "complete"},
+                }
+            },
+        )
+
+    @mock_klaviyo.route("PATCH", r"/api/campaign-send-jobs/([^/]+)")
+    def cancel(request, match):
+        job = mock_klaviyo.jobs[match.group(1)]
+        job["polls"] = -1000
+        job["resource"]["attributes"]["status"] = "cancelled"
+        return httpx.Response(204)
+
+    launcher = CampaignLauncher(
+        mock_app, poller=JobPoller(mock_app, min_interval=0.01, max_interval=0.05)
+    )
+    launcher.on_event(
+        lambda campaign_id, stage, detail: (
+            campaign_id == "LATE" and stage == "sending" and sending.set()
+        )
+    )
+    early = launcher.submit("EARLY")
+    launcher.cancel("EARLY")
+    late = launcher.submit("LATE")
+    assert sending.wait(5)
+    launcher.cancel("LATE")
+
+    assert early.result(timeout=5) == "cancelled"
+    assert late.result(timeout=5) == "cancelled"
+    assert [
+        json.loads(r.content)["data"]["id"]
+        for r in _posts(mock_klaviyo, "/api/campaign-send-jobs")
+    ] == ["LATE"]
+    launcher.close()
+    launcher.poller.stop()
+
+
+def test_close_stops_the_owned_poller_and_cancels_running_launches(
+    mock_klaviyo, mock_app
+):
+    mock_klaviyo.job_polls = 1000
+    launcher = CampaignLauncher(mock_app, tier="XL")
+    assert launcher.launch(["C1"], timeout=0.1) == {"C1": "estimating"}
+    future = launcher.submit("C1")
+
+    launcher.close()
+
+    assert future.cancelled()
+    assert launcher.poller._thread is None
+
+
+def test_send_with_unknown_outcome_is_not_repeated(mock_klaviyo, mock_app):
+    @mock_klaviyo.route("POST", r"/api/(campaign-send-jobs)")
+    def send(request, match):
+        if b"LOST" in request.content:
+            raise httpx.ReadTimeout("lost", request=request)
+        if b"REJECTED" in request.content:
+            return httpx.Response(503)
+        mock_klaviyo._create_job(request, match)
+        return httpx.Response(503)
+
+    with CampaignLauncher(
+        mock_app, poller=JobPoller(mock_app, min_interval=0.01, tier="XL"), tier="XL"
+    ) as launcher:
+        stages = launcher.launch(["ACCEPTED", "LOST", "REJECTED"], timeout=10)
+
+    assert stages == {"ACCEPTED": "sent", "LOST": "failed", "REJECTED": "failed"}
+    assert len(_posts(mock_klaviyo, "/api/campaign-send-jobs")) == 3
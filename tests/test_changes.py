@@ -0,0 +1,113 @@
+import pytest
+
+from universal_mcp_klaviyo.changes import ChangePoller, shift_timestamp
+
+
+def _listings(mock_klaviyo, path):
+    return [
+        request
+        for request in mock_klaviyo.requests
+        if request.method == "GET" and request.url.path == path
+    ]
+
+
+def test_shift_timestamp_floors_to_utc_seconds():
+    assert shift_timestamp("2024-01-01T00:00:05.500+00:00", 1) == "2024-01-01T00:00:04Z"
+    assert shift_timestamp("2024-01-01T02:00:00+02:00", 0) == "2024-01-01T00:00:00Z"
+
+
+def test_poller_emits_each_change_once_and_persists_marks(
+    mock_klaviyo, mock_app, tmp_path
+):
+    profile = mock_klaviyo.add(
+        "profiles", id="P1", email="a@example.com", updated="2024-01-01T00:00:01Z"
+    )
+    mock_klaviyo.add(
+        "profiles", id="P2", email="b@example.com", updated="2024-01-01T00:00:02Z"
+    )
+    mock_klaviyo.add(
+        "campaigns",
+        id="C1",
+        messages={"channel": "sms"},
+        updated_at="2024-01-01T00:00:03Z",
+    )
+    path = str(tmp_path / "changes.db")
+    received = []
+
+    poller = ChangePoller(mock_app, path=path, kinds=["profile", "campaign"])
+    poller.subscribe(received.extend)
+    assert poller.poll() == {"profile": 2, "campaign": 1}
+    assert sorted((change.kind, change.id) for change in received) == [
+        ("campaign", "C1"),
+        ("profile", "P1"),
+        ("profile", "P2"),
+    ]
+    assert poller.marks() == {
+        "profile": "2024-01-01T00:00:02Z",
+        "campaign": "2024-01-01T00:00:03Z",
+    }
+
+    # A write landing on the mark's own second is caught; already delivered versions are
+    # not repeated.
+    mock_klaviyo.add(
+        "profiles", id="P3", email="c@example.com", updated="2024-01-01T00:00:02Z"
+    )
+    assert poller.poll() == {"profile": 1, "campaign": 0}
+    assert received[-1].id == "P3"
+    filters = [
+        request.url.params.get("filter")
+        for request in _listings(mock_klaviyo, "/api/profiles")
+    ]
+    assert filters[-1] == "greater-than(updated,2024-01-01T00:00:01Z)"
+    poller.close()
+
+    profile["attributes"]["updated"] = "2024-01-02T00:00:00Z"
+    restarted = ChangePoller(mock_app, path=path, kinds=["profile"])
+    restarted.subscribe(received.extend)
+    assert restarted.poll() == {"profile": 1}
+    assert (received[-1].id, received[-1].updated) == ("P1", "2024-01-02T00:00:00Z")
+
+
+def test_failed_consumer_keeps_the_mark(mock_klaviyo, mock_app):
+    mock_klaviyo.add("segments", id="S1", name="VIP", updated="2024-01-01T00:00:00Z")
+    poller = ChangePoller(mock_app, kinds=["segment"])
+    calls = []
+
+    def flaky(changes):
+        calls.append([change.id for change in changes])
+        if len(calls) == 1:
+            raise RuntimeError("downstream unavailable")
+
+    poller.subscribe(flaky)
+    with pytest.raises(RuntimeError):
+        poller.poll()
+    assert poller.marks() == {}
+    assert poller.poll() == {"segment": 1}
+    assert calls == [["S1"], ["S1"]]
+    with pytest.raises(ValueError):
+        ChangePoller(mock_app, kinds=["metric"])
+
+
+def test_catalog_items_are_compared_locally(mock_klaviyo, mock_app):
+    mock_klaviyo.add(
+        "catalog-items", id="I1", title="Mug", updated="2024-01-01T00:00:00+00:00"
+    )
+    item = mock_klaviyo.add(
+        "catalog-items", id="I2", title="Cap", updated="2024-01-01T00:00:05+00:00"
+    )
+    poller = ChangePoller(mock_app, kinds=["catalog-item"])
+    received = []
+    poller.subscribe(received.extend)
+
+    assert poller.poll() == {"catalog-item": 2}
+    assert poller.poll() == {"catalog-item": 0}
+    item["attributes"]["updated"] = "2024-01-02T00:00:00+00:00"
+    assert poller.poll() == {"catalog-item": 1}
+    assert (received[-1].id, received[-1].updated) == (
+        "I2",
+        "2024-01-02T00:00:00+00:00",
+    )
+    assert {
+        request.url.params.get("filter")
+        for request in _listings(mock_klaviyo, "/api/catalog-items")
+    } == {None}
@@ -0,0 +1,115 @@
+import re
+
+import httpx
+
+from universal_mcp_klaviyo.coupons import (
+    CouponCodePipeline,
+    attribute_errors,
+    generate_codes,
+)
+
+
+def test_generate_codes():
+    codes = list(generate_codes(5, length=6, prefix="SUMMER-"))
+    assert len(codes) == 5 and all(
+        re.fullmatch(r"SUMMER-[A-Z0-9]{6}", code) for code in codes
+    )
+
+
+def test_attribute_errors_matches_whole_codes_and_pointers():
+    errors = [
+        {"detail": "A10 is already in use"},
+        {
+            "detail": "Invalid code",
+            "source": {
+                "pointer": "/data/attributes/coupon-codes/data/2/attributes/unique_code"
+            },
+        },
+        {"detail": "Something else went wrong"},
+    ]
+    assert attribute_errors(["A1", "A10", "B-2"], errors) == {
+        "A10": "A10 is already in use",
+        "B-2": "Invalid code",
+    }
+
+
+def test_pipeline_dedupes_chunks_and_streams_failures(mock_klaviyo, mock_app):
+    for code in ["OLD1", "OLD2"]:
+        mock_klaviyo.add("coupon-codes", id=f"C1-{code}", unique_code=code)
+        mock_klaviyo.relationships[("coupons", "C1", "coupon-codes")].append(
+            f"C1-{code}"
+        )
+    submitted = {}
+
+    @mock_klaviyo.route("GET", r"/api/coupon-code-bulk-create-jobs/([^/]+)")
+    def job(request, match):
+        codes = submitted.setdefault(
+            match.group(1),
+            [
+                entry["attributes"]["unique_code"]
+                for entry in mock_klaviyo.jobs[match.group(1)]["resource"][
+                    "attributes"
+                ]["payload"]["coupon-codes"]["data"]
+            ],
+        )
+        bad = [code for code in codes if code.startswith("BAD")]
+        attributes = {
+            "status": "complete",
+            "total_count": len(codes),
+            "failed_count": len(bad),
+            "errors": [{"detail": f"{code} is invalid"} for code in bad],
+        }
+        document = {
+            "data": {
+                "type": "coupon-code-bulk-create-job",
+                "id": match.group(1),
+                "attributes": attributes,
+            }
+        }
+        if request.url.params.get("include") == "coupon-codes":
+            document["included"] = [
+                {"type": "coupon-code", "id": code, "attributes": {"unique_code": code}}
+                for code in codes
+                if code not in bad
+            ]
+        return httpx.Response(200, json=document)
+
+    codes = ["OLD1", *[f"NEW{i}" for i in range(2500)], "NEW5", "BAD1"]
+    pipeline = CouponCodePipeline(mock_app, poll_interval=0)
+
+    failures = list(pipeline.create("C1", codes))
+
+    assert failures == [
+        {"code": "BAD1", "job_id": failures[0]["job_id"], "detail": "BAD1 is invalid"}
+    ]
+    assert pipeline.stats == {
+        "submitted": 2501,
+        "skipped": 2,
+        "created": 2500,
+        "failed": 1,
+    }
+    assert sorted(len(codes) for codes in submitted.values()) == [501, 1000, 1000]
+
+
+def test_failed_job_fails_its_codes_only(mock_klaviyo, mock_app):
+    @mock_klaviyo.route("POST", r"/api/(coupon-code-bulk-create-jobs)")
+    def reject(request, match):
+        if b"BAD" in request.content:
+            return httpx.Response(400, json={"errors": [{"detail": "invalid"}]})
+        return mock_klaviyo._create_job(request, match)
+
+    codes = [f"NEW{i}" for i in range(1000)] + ["BAD1", "BAD2"]
+    pipeline = CouponCodePipeline(mock_app, poll_interval=0)
+
+    failures = list(pipeline.create("C1", codes))
+
+    assert [(f["code"], f["job_id"]) for f in failures] == [
+        ("BAD1", None),
+        ("BAD2", None),
+    ]
+    assert pipeline.stats == {
+        "submitted": 1002,
+        "skipped": 0,
+        "created": 1000,
+        "failed": 2,
+    }
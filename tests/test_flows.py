@@ -0,0 +1,60 @@
+from universal_mcp_klaviyo.flows import FlowCrawler
+
+
+def test_crawl_returns_full_trees_level_by_level(mock_klaviyo, mock_app):
+    mock_klaviyo.add("templates", id="TPL1", name="Welcome")
+    for f in range(60):
+        actions = [f"A{f}-{a}" for a in range(2)]
+        mock_klaviyo.add(
+            "flows",
+            id=f"F{f:02d}",
+            name=f"Flow {f}",
+            status="live" if f < 55 else "draft",
+            relationships={"flow-actions": actions},
+        )
+        for action in actions:
+            mock_klaviyo.add(
+                "flow-actions",
+                id=action,
+                action_type="SEND_EMAIL",
+                relationships={"flow-messages": [f"M{action}"]},
+            )
+            mock_klaviyo.add(
+                "flow-messages",
+                id=f"M{action}",
+                name=action,
+                relationships={"template": ["TPL1"]},
+            )
+
+    trees = FlowCrawler(mock_app, max_workers=16, tier="XL").crawl(
+        filter='equals(status,"live")'
+    )
+
+    assert len(trees) == 55
+    tree = trees[0]
+    assert [action["id"] for action in tree["actions"]] == ["A0-0", "A0-1"]
+    assert tree["actions"][0]["messages"][0]["id"] == "MA0-0"
+    assert (
+        tree["actions"][0]["messages"][0]["template"]["attributes"]["name"] == "Welcome"
+    )
+    paths = [request.url.path.split("/")[2] for request in mock_klaviyo.requests]
+    assert (
+        paths.count("flows") == 2
+        and paths.count("flow-actions") == 110
+        and paths.count("flow-messages") == 110
+    )
+
+
+def test_crawl_by_ids(mock_klaviyo, mock_app):
+    mock_klaviyo.add(
+        "flows", id="F1", name="One", relationships={"flow-actions": ["A1"]}
+    )
+    mock_klaviyo.add("flows", id="F2", name="Two")
+    mock_klaviyo.add("flow-actions", id="A1", action_type="TIME_DELAY")
+
+    trees = FlowCrawler(mock_app).crawl(["F1", "F1"])
+
+    assert [
+        (tree["id"], [action["id"] for action in tree["actions"]]) for tree in trees
+    ] == [("F1", ["A1"])]
+    assert trees[0]["actions"][0]["messages"] == []
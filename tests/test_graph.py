@@ -0,0 +1,94 @@
+from universal_mcp_klaviyo.graph import AccountGraph
+
+
+def _seed(mock_klaviyo):
+    mock_klaviyo.add(
+        "templates", id="TPL1", name="Welcome", updated="2024-01-01T00:00:00Z"
+    )
+    mock_klaviyo.add(
+        "templates", id="TPL2", name="Reminder", updated="2024-01-01T00:00:00Z"
+    )
+    mock_klaviyo.add("tags", id="TAG1", name="Onboarding")
+    for flow, actions in {"F1": ["A1", "A2"], "F2": ["A3"]}.items():
+        mock_klaviyo.add(
+            "flows",
+            id=flow,
+            name=flow,
+            updated="2024-01-01T00:00:00Z",
+            relationships={
+                "flow-actions": actions,
+                "tags": ["TAG1"] if flow == "F1" else [],
+            },
+        )
+        for action in actions:
+            mock_klaviyo.add(
+                "flow-actions",
+                id=action,
+                action_type="SEND_EMAIL",
+                relationships={"flow-messages": [f"M{action}"]},
+            )
+            template = "TPL2" if action == "A2" else "TPL1"
+            mock_klaviyo.add(
+                "flow-messages",
+                id=f"M{action}",
+                name=f"M{action}",
+                relationships={"template": [template]},
+            )
+    mock_klaviyo.add(
+        "lists",
+        id="L1",
+        name="Newsletter",
+        updated="2024-01-01T00:00:00Z",
+        relationships={"flow-triggers": ["F2"], "tags": ["TAG1"]},
+    )
+
+
+def test_build_answers_graph_queries_locally(mock_klaviyo, mock_app):
+    _seed(mock_klaviyo)
+
+    graph = AccountGraph(mock_app).build()
+    requests = len(mock_klaviyo.requests)
+
+    assert graph.flows_using_template("TPL1") == {"F1", "F2"}
+    assert graph.flows_using_template("TPL2") == {"F1"}
+    assert graph.flow_triggers("F2") == {("list", "L1")}
+    assert graph.referrers("tag", "TAG1", "tags") == {("flow", "F1"), ("list", "L1")}
+    assert graph.reachable("flow", "F1", "flow-message") == {"MA1", "MA2"}
+    assert graph.nodes[("flow-action", "A1")] == {"action_type": "SEND_EMAIL"}
+    assert len(mock_klaviyo.requests) == requests
+    # Five listings, then one level of three actions and one of three messages.
+    assert requests == 5 + 3 + 3
+
+
+def test_refresh_recrawls_only_changed_flows(mock_klaviyo, mock_app):
+    _seed(mock_klaviyo)
+    graph = AccountGraph(mock_app).build()
+
+    flow = mock_klaviyo.resources["flows"]["F1"]
+    flow["attributes"]["updated"] = "2024-02-01T00:00:00Z"
+    mock_klaviyo.relationships[("flows", "F1", "flow-actions")] = ["A1"]
+    mock_klaviyo.requests.clear()
+
+    assert graph.refresh() == {
+        "flow": 1,
+        "list": 0,
+        "segment": 0,
+        "template": 0,
+        "tag": 1,
+    }
+    assert graph.flows_using_template("TPL2") == set()
+    assert ("flow-action", "A2") not in graph.nodes
+    assert len(mock_klaviyo.requests) == 5 + 1 + 1
+
+
+def test_save_and_load_round_trip(mock_klaviyo, mock_app, tmp_path):
+    _seed(mock_klaviyo)
+    AccountGraph(mock_app).build().save(tmp_path / "graph.json")
+
+    graph = AccountGraph.load(mock_app, tmp_path / "graph.json")
+
+    assert graph.flows_using_template("TPL1") == {"F1", "F2"}
+    assert graph.marks["flow"] == "2024-01-01T00:00:00Z"
+    graph.discard("flow", "F1")
+    assert graph.flows_using_template("TPL2") == set()
+    assert graph.referrers("tag", "TAG1") == {("list", "L1")}
@@ -0,0 +1,41 @@
+from universal_mcp_klaviyo.identity_index import ProfileIdentityIndex
+
+
+def test_load_observe_and_resolve(mock_klaviyo, mock_app, tmp_path):
+    for i in range(150):
+        mock_klaviyo.add("profiles", id=f"P{i:03d}", email=f"User{i}@example.com")
+    index = ProfileIdentityIndex(mock_app, str(tmp_path / "identities.db"))
+
+    assert index.load() == 150
+    requests = len(mock_klaviyo.requests)
+    assert index.resolve("email", ["user5@example.com", "USER149@example.com"]) == {
+        "user5@example.com": "P005",
+        "USER149@example.com": "P149",
+    }
+    assert len(mock_klaviyo.requests) == requests
+
+    index.observe(
+        {
+            "data": {
+                "type": "profile",
+                "id": "P005",
+                "attributes": {"email": "renamed@example.com"},
+            }
+        }
+    )
+    assert index.lookup("email", ["user5@example.com", "renamed@example.com"]) == {
+        "renamed@example.com": "P005"
+    }
+
+
+def test_resolve_fetches_misses_in_batches(mock_klaviyo, mock_app):
+    for i in range(250):
+        mock_klaviyo.add("profiles", id=f"P{i:03d}", email=f"user{i}@example.com")
+    index = ProfileIdentityIndex(mock_app)
+
+    found = index.resolve(
+        "email", [f"user{i}@example.com" for i in range(200)] + ["nobody@example.com"]
+    )
+
+    assert len(found) == 200
+    assert len(mock_klaviyo.requests) == 3
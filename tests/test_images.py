@@ -0,0 +1,153 @@
+import hashlib
+import io
+import json
+import re
+
+import httpx
+import pytest
+
+from universal_mcp_klaviyo.images import ImageIndex, ImageUploader, content_hash
+
+
+class _Pipe(io.RawIOBase):
+    """Unseekable stream, like a socket or pipe."""
+
+    def __init__(self, data: bytes) -> None:
+        self._data = io.BytesIO(data)
+        self.name = "pipe.gif"
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        chunk = self._data.read(len(buffer))
+        buffer[: len(chunk)] = chunk
+        return len(chunk)
+
+
+def _uploads(mock_klaviyo):
+    uploads = []
+
+    @mock_klaviyo.route("POST", r"/api/image-upload")
+    def upload(request, match):
+        body = request.content
+        filename = re.search(rb'filename="([^"]*)"', body).group(1).decode()
+        name = re.search(rb'name="name"\r\n\r\n([^\r]*)', body)
+        image = mock_klaviyo.add(
+            "images", name=name.group(1).decode() if name else filename
+        )
+        uploads.append((filename, body))
+        return httpx.Response(201, json={"data": image})
+
+    return uploads
+
+
+def test_upload_image_from_file_streams_multipart(mock_klaviyo, mock_app, tmp_path):
+    uploads = _uploads(mock_klaviyo)
+    path = tmp_path / "banner.png"
+    path.write_bytes(b"\x89PNG" + b"x" * 200_000)
+
+    document = mock_app.upload_image_from_file(str(path), name="Banner", hidden=True)
+
+    assert document["data"]["attributes"]["name"] == "Banner"
+    filename, body = uploads[0]
+    assert filename == "banner.png"
+    assert b"Content-Type: image/png" in body and b'name="hidden"\r\n\r\ntrue' in body
+    assert b"x" * 200_000 in body
+
+
+def test_batch_upload_dedupes_by_content(mock_klaviyo, mock_app, tmp_path):
+    uploads = _uploads(mock_klaviyo)
+    mock_klaviyo.add(
+        "images", id="IMG0", name="old", image_url="https://cdn.example.com/old.png"
+    )
+
+    @mock_klaviyo.route("GET", r"/old.png")
+    def cdn(request, match):
+        assert "Authorization" not in request.headers
+        return httpx.Response(200, content=b"old-bytes")
+
+    paths = []
+    for name, content in [
+        ("a.png", b"aaa"),
+        ("b.png", b"bbb"),
+        ("a-copy.png", b"aaa"),
+        ("old.png", b"old-bytes"),
+    ]:
+        paths.append(tmp_path / name)
+        paths[-1].write_bytes(content)
+
+    uploader = ImageUploader(mock_app, downloader=mock_klaviyo.client())
+    assert uploader.load_existing() == 1
+    results = uploader.upload_many([*paths, _Pipe(b"ccc")])
+
+    assert [result["uploaded"] for result in results] == [
+        True,
+        True,
+        False,
+        False,
+        True,
+    ]
+    assert results[2]["id"] == results[0]["id"] and results[3]["id"] == "IMG0"
+    assert results[1]["sha256"] == content_hash(paths[1])
+    assert sorted(filename for filename, _ in uploads) == ["a.png", "b.png", "image"]
+    assert (
+        mock_klaviyo.resources["images"][results[4]["id"]]["attributes"]["name"]
+        == "pipe.gif"
+    )
+    assert uploader.upload(io.BytesIO(b"bbb"))["uploaded"] is False
+
+
+def test_image_index_answers_repeat_uploads_locally(mock_klaviyo, mock_app, tmp_path):
+    mock_klaviyo.add(
+        "images",
+        id="IMG1",
+        name="Hero",
+        image_url="https://cdn.example.com/hero.png",
+        updated_at="2024-01-01T00:00:00Z",
+    )
+
+    @mock_klaviyo.route("POST", r"/api/images")
+    def import_image(request, match):
+        attributes = json.loads(request.content)["data"]["attributes"]
+        image = mock_klaviyo.add(
+            "images",
+            name=attributes.get("name"),
+            image_url=f"https://cdn.example.com/{len(mock_klaviyo.resources['images'])}.png",
+        )
+        return httpx.Response(201, json={"data": image})
+
+    @mock_klaviyo.route("GET", r"/hero.png")
+    def cdn(request, match):
+        return httpx.Response(200, content=b"hero-bytes")
+
+    index = ImageIndex(
+        mock_app, path=str(tmp_path / "images.db"), downloader=mock_klaviyo.client()
+    )
+    assert index.load(hash_content=True) == 1
+    assert index.find(sha256=hashlib.sha256(b"hero-bytes").hexdigest()) == "IMG1"
+    assert (
+        index.find(url="https://cdn.example.com/hero.png")
+        == index.find(name="Hero")
+        == "IMG1"
+    )
+
+    first = index.upload_from_url("https://assets.example.com/sale.png", name="Sale")
+    mock_klaviyo.requests.clear()
+    assert index.upload_from_url("https://assets.example.com/sale.png") == {
+        "id": first["id"],
+        "uploaded": False,
+    }
+    assert index.set_campaign_message_image("CM1", name="Sale") == first["id"]
+    assert [
+        (request.method, request.url.path) for request in mock_klaviyo.requests
+    ] == [("PATCH", "/api/campaign-messages/CM1/relationships/image")]
+    assert mock_klaviyo.relationships[("campaign-messages", "CM1", "image")] == [
+        first["id"]
+    ]
+    index.close()
+
+    reopened = ImageIndex(mock_app, path=str(tmp_path / "images.db"))
+    assert reopened.find(url="https://assets.example.com/sale.png") == first["id"]
+    with pytest.raises(LookupError):
+        reopened.set_campaign_message_image("CM1", name="Missing")
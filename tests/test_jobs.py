@@ -0,0 +1,155 @@
+import threading
+import time
+
+import httpx
+import pytest
+
+from universal_mcp_klaviyo.jobs import JobPoller, job_progress
+
+
+def _job_reads(mock_klaviyo, job_id):
+    return [
+        request
+        for request in mock_klaviyo.requests
+        if request.method == "GET" and request.url.path.endswith(job_id)
+    ]
+
+
+def test_job_progress_tracks_status_and_counts():
+    assert job_progress(
+        {"status": "processing", "completed_count": 1, "total_count": 4, "name": "x"}
+    ) == (
+        "processing",
+        (("completed_count", 1), ("total_count", 4)),
+    )
+
+
+def test_poller_resolves_many_jobs_and_reports_updates(mock_klaviyo, mock_app):
+    for i in range(5):
+        mock_app.send_campaign(data={"type": "campaign-send-job", "id": f"J{i}"})
+    updates = []
+    with JobPoller(mock_app, min_interval=0.01, max_interval=0.05) as poller:
+        futures = [
+            poller.watch(
+                "get_campaign_send_job",
+                f"J{i}",
+                on_update=lambda job: updates.append(job["attributes"]["status"]),
+            )
+            for i in range(5)
+        ]
+        assert poller.watch("get_campaign_send_job", "J0") is futures[0]
+        jobs = [future.result(timeout=5) for future in futures]
+    assert {job["attributes"]["status"] for job in jobs} == {"complete"}
+    assert updates.count("complete") == 5 and "processing" in updates
+    assert all(len(_job_reads(mock_klaviyo, f"J{i}")) == 3 for i in range(5))
+    assert len(poller) == 0
+
+
+def test_poller_backs_off_while_idle_and_fails_unknown_jobs(mock_klaviyo, mock_app):
+    mock_klaviyo.job_polls = 1000
+    mock_app.bulk_import_profiles(
+        data={"type": "profile-bulk-import-job", "id": "SLOW", "attributes": {}}
+    )
+    poller = JobPoller(mock_app, min_interval=0.01, max_interval=0.08)
+    future = poller.watch("get_bulk_import_profiles_job", "SLOW")
+    with pytest.raises(httpx.HTTPStatusError):
+        poller.watch("get_bulk_import_profiles_job", "MISSING").result(timeout=5)
+
+    watch = poller._watches[("get_bulk_import_profiles_job", "SLOW")]
+    deadline = time.monotonic() + 5
+    while watch.interval < 0.08 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert watch.interval == 0.08
+    poller.unwatch("get_bulk_import_profiles_job", "SLOW")
+    assert future.cancelled()
+    poller.stop()
+
+
+def test_due_jobs_of_one_type_are_checked_with_one_listing(mock_klaviyo, mock_app):
+    for i in range(4):
+        mock_app.bulk_import_profiles(
+            data={"type": "profile-bulk-import-job", "id": f"J{i}", "attributes": {}}
+        )
+    poller = JobPoller(mock_app, min_interval=0.01, max_interval=0.01)
+    seen = threading.Event()
+    futures = [
+        poller.watch(
+            "get_bulk_import_profiles_job", f"J{i}", on_update=lambda job: seen.set()
+        )
+        for i in range(4)
+    ]
+    assert seen.wait(5)
+    poller.stop()
+    assert poller.listings >= 1 and poller.checks == 0
+    assert not any(_job_reads(mock_klaviyo, f"J{i}") for i in range(4))
+    listing = next(
+        r
+        for r in mock_klaviyo.requests
+        if r.method == "GET" and r.url.path == "/api/profile-bulk-import-jobs"
+    )
+    assert listing.url.params["filter"] == 'any(status,["queued","processing"])'
+
+    # Finished jobs drop out of the listing and are read individually.
+    for i in range(2):
+        mock_klaviyo.jobs[f"J{i}"]["resource"]["attributes"]["status"] = "complete"
+        mock_klaviyo.jobs[f"J{i}"]["polls"] = 1000
+    poller.start()
+    assert [
+        future.result(timeout=5)["attributes"]["status"] for future in futures[:2]
+    ] == ["complete", "complete"]
+    assert not futures[2].done() and not futures[3].done()
+    poller.stop()
+
+
+def test_throttled_checks_pause_for_retry_after(mock_klaviyo, mock_app):
+    mock_app.bulk_import_profiles(
+        data={"type": "profile-bulk-import-job", "id": "J1", "attributes": {}}
+    )
+    throttled = []
+
+    @mock_klaviyo.route("GET", r"/api/profile-bulk-import-jobs/J1")
+    def job(request, match):
+        if not throttled:
+            throttled.append(time.monotonic())
+            return httpx.Response(
+                429, headers={"Retry-After": "0.2"}, json={"errors": []}
+            )
+        throttled.append(time.monotonic())
+        return httpx.Response(
+            200,
+            json={
+                "data": {
+                    "type": "profile-bulk-import-job",
+                    "id": "J1",
+                    "attributes": {"status": "complete"},
+                }
+            },
+        )
+
+    with JobPoller(mock_app, min_interval=0.01) as poller:
+        assert (
+            poller.watch("get_bulk_import_profiles_job", "J1").result(timeout=5)[
+                "attributes"
+            ]["status"]
+            == "complete"
+        )
+    assert throttled[1] - throttled[0] >= 0.2
+
+
+def test_malformed_listing_falls_back_to_individual_reads(mock_klaviyo, mock_app):
+    @mock_klaviyo.route("GET", r"/api/profile-bulk-import-jobs$")
+    def malformed(request, match):
+        return httpx.Response(200, json={"data": [{"type": "profile-bulk-import-job"}]})
+
+    for i in range(2):
+        mock_app.bulk_import_profiles(
+            data={"type": "profile-bulk-import-job", "id": f"J{i}", "attributes": {}}
+        )
+    with JobPoller(mock_app, min_interval=0.01, max_interval=0.01) as poller:
+        futures = [
+            poller.watch("get_bulk_import_profiles_job", f"J{i}") for i in range(2)
+        ]
+        assert {
+            future.result(timeout=5)["attributes"]["status"] for future in futures
+        } == {"complete"}
+    assert poller.listings == 0 and poller.checks >= 2
@@ -0,0 +1,26 @@
+from universal_mcp_klaviyo.list_sync import IdSet, ListSynchronizer
+
+
+def test_id_set_operations():
+    a = IdSet.from_iterable(["C", "A", "B", "A"], chunk_size=2)
+    b = IdSet.from_iterable(["B", "D"])
+
+    assert list(a) == ["A", "B", "C"]
+    assert "B" in a and "D" not in a
+    assert list(a - b) == ["A", "C"]
+    assert list(a | b) == ["A", "B", "C", "D"]
+    assert list(a & b) == ["B"]
+
+
+def test_sync_adds_and_removes_in_batches(mock_klaviyo, mock_app):
+    mock_klaviyo.add(
+        "lists", id="L1", relationships={"profiles": [f"P{i:04d}" for i in range(250)]}
+    )
+    target = [f"P{i:04d}" for i in range(100, 400)]
+
+    result = ListSynchronizer(mock_app, batch_size=60).sync("L1", target)
+
+    assert result == {"added": 150, "removed": 100}
+    assert sorted(mock_klaviyo.relationships[("lists", "L1", "profiles")]) == target
+    writes = [r for r in mock_klaviyo.requests if r.method != "GET"]
+    assert len(writes) == 3 + 2
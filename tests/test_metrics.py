@@ -0,0 +1,51 @@
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+
+from universal_mcp_klaviyo.app import KlaviyoApp
+from universal_mcp_klaviyo.metrics import MetricsRegistry, instrument, render_prometheus
+from universal_mcp_klaviyo.utils import call_with_retry
+
+
+@pytest.fixture
+def app_instance():
+    calls = {"n": 0}
+
+    def handler(request):
+        calls["n"] += 1
+        if calls["n"] == 1:
+            return httpx.Response(
+                429, headers={"Retry-After": "0"}, json={"errors": []}
+            )
+        return httpx.Response(
+            200,
+            headers={"RateLimit-Limit": "10", "RateLimit-Remaining": "7"},
+            json={"data": {"type": "account", "id": "abc"}},
+        )
+
+    mock_integration = MagicMock()
+    mock_integration.get_credentials.return_value = {
+        "access_token": "dummy_access_token"
+    }
+    return KlaviyoApp(
+        integration=mock_integration,
+        client=httpx.Client(transport=httpx.MockTransport(handler)),
+    )
+
+
+def test_records_per_method_metrics(app_instance):
+    registry = instrument(app_instance, MetricsRegistry())
+    call_with_retry(app_instance.get_account, "abc", backoff=0)
+
+    stats = registry.snapshot()["get_account"]
+    assert stats["status_codes"] == {429: 1, 200: 1}
+    assert stats["retries"] == 1
+    assert stats["latency"]["count"] == 2
+    assert stats["response_bytes"] > 0
+    assert stats["rate_limit_remaining"] == 7
+    assert stats["phases"]["decode"]["count"] == 1
+
+    text = render_prometheus(registry)
+    assert 'klaviyo_retries_total{operation="get_account"} 1' in text
+    assert 'klaviyo_responses_total{operation="get_account",status="200"} 1' in text
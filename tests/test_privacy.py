@@ -0,0 +1,108 @@
+import json
+
+import httpx
+import pytest
+
+from universal_mcp_klaviyo.identity_index import ProfileIdentityIndex
+from universal_mcp_klaviyo.privacy import ProfileDeletionPipeline
+
+
+def _deletion_requests(mock_klaviyo):
+    return [
+        json.loads(request.content)["data"]["attributes"]["profile"]["data"]["id"]
+        for request in mock_klaviyo.requests
+        if request.method == "POST"
+        and request.url.path == "/api/data-privacy-deletion-jobs"
+    ]
+
+
+@pytest.fixture
+def deletions(mock_klaviyo):
+    failing = set()
+
+    @mock_klaviyo.route("POST", r"/api/data-privacy-deletion-jobs")
+    def delete(request, match):
+        profile_id = json.loads(request.content)["data"]["attributes"]["profile"][
+            "data"
+        ]["id"]
+        if profile_id in failing:
+            return httpx.Response(400, json={"errors": [{"detail": "rejected"}]})
+        mock_klaviyo.resources["profiles"].pop(profile_id, None)
+        return httpx.Response(202)
+
+    return failing
+
+
+def test_pipeline_resolves_dedupes_and_confirms(
+    mock_klaviyo, mock_app, deletions, tmp_path
+):
+    for i in range(6):
+        mock_klaviyo.add(
+            "profiles",
+            id=f"P{i}",
+            email=f"user{i}@example.com",
+            phone_number=f"+1555000000{i}",
+        )
+    deletions.add("P5")
+    path = str(tmp_path / "ledger.db")
+    pipeline = ProfileDeletionPipeline(mock_app, path=path, batch_size=2)
+
+    summary = pipeline.process(
+        emails=[
+            "User0@example.com",
+            "user1@example.com",
+            "user5@example.com",
+            "nobody@example.com",
+        ],
+        phone_numbers=["+15550000001", "+15550000002"],
+        ids=["P3"],
+    )
+
+    assert sorted(_deletion_requests(mock_klaviyo)) == ["P0", "P1", "P2", "P3", "P5"]
+    assert summary == {
+        "pending": 0,
+        "resolved": 0,
+        "not_found": 1,
+        "submitted": 5,
+        "confirmed": 0,
+        "failed": 1,
+    }
+    assert (
+        pipeline.status("email", "USER1@example.com")
+        == pipeline.status("phone_number", "+15550000001")
+        == "submitted"
+    )
+
+    summary = pipeline.confirm()
+    assert summary["confirmed"] == 5 and summary["submitted"] == 0
+    # Only the digest of settled identifiers stays in the ledger.
+    assert pipeline._db.execute(
+        "SELECT status, value FROM deletions WHERE value IS NOT NULL"
+    ).fetchall() == [("failed", "user5@example.com")]
+    assert pipeline.status("email", "user1@example.com") == "confirmed"
+    pipeline.close()
+
+    # A re-run submits nothing new; only the failed deletion is retried.
+    deletions.clear()
+    rerun = ProfileDeletionPipeline(mock_app, path=path)
+    summary = rerun.process(emails=["user0@example.com", "user5@example.com"])
+    assert (
+        _deletion_requests(mock_klaviyo).count("P5") == 2
+        and _deletion_requests(mock_klaviyo).count("P0") == 1
+    )
+    assert summary["submitted"] == 1 and summary["failed"] == 0
+
+
+def test_pipeline_uses_identity_index(mock_klaviyo, mock_app, deletions):
+    mock_klaviyo.add("profiles", id="P1", email="ann@example.com")
+    index = ProfileIdentityIndex(mock_app)
+    index.load()
+    lookups = len(mock_klaviyo.requests)
+
+    pipeline = ProfileDeletionPipeline(mock_app, index=index)
+    pipeline.process(emails=["ann@example.com"])
+    assert len(mock_klaviyo.requests) == lookups + 1
+    pipeline.confirm()
+    assert index.lookup("email", ["ann@example.com"]) == {}
+    with pytest.raises(ValueError):
+        pipeline.record("username", ["ann"])
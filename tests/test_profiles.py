@@ -0,0 +1,33 @@
+from universal_mcp_klaviyo.profiles import pack_filters, resolve_profiles
+
+
+def test_pack_filters_respects_count_and_length_limits():
+    assert (
+        len(list(pack_filters("email", [f"user{i}@example.com" for i in range(250)])))
+        == 3
+    )
+    long_values = [f"{'x' * 200}{i}@example.com" for i in range(60)]
+    filters = list(pack_filters("email", long_values))
+    assert len(filters) > 1
+    assert sum(f.count("@") for f in filters) == 60
+
+
+def test_resolve_profiles_maps_results_back_to_inputs(mock_klaviyo, mock_app):
+    for i in range(150):
+        mock_klaviyo.add(
+            "profiles",
+            id=f"P{i:03d}",
+            email=f"user{i}@example.com",
+            external_id=f"X{i}",
+        )
+
+    result = resolve_profiles(
+        mock_app,
+        emails=["User1@Example.com", "user149@example.com", "nobody@example.com"],
+        external_ids=[f"X{i}" for i in range(120)],
+    )
+
+    assert result["found"]["email"]["User1@Example.com"]["id"] == "P001"
+    assert result["missing"] == {"email": ["nobody@example.com"], "external_id": []}
+    assert len(result["found"]["external_id"]) == 120
+    assert len(mock_klaviyo.requests) == 3
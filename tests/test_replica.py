@@ -0,0 +1,153 @@
+import pytest
+
+from universal_mcp_klaviyo.replica import MetadataReplica
+
+
+def _listings(mock_klaviyo):
+    return [request for request in mock_klaviyo.requests if request.method == "GET"]
+
+
+def _seed(mock_klaviyo):
+    mock_klaviyo.add("tags", id="T1", name="Onboarding")
+    mock_klaviyo.add("tags", id="T2", name="Promo")
+    mock_klaviyo.add(
+        "flows",
+        id="F1",
+        relationships={"tags": ["T1"]},
+        name="Welcome",
+        status="live",
+        created="2024-01-05T00:00:00Z",
+        updated="2024-02-01T00:00:00Z",
+    )
+    mock_klaviyo.add(
+        "flows",
+        id="F2",
+        relationships={"tags": ["T1", "T2"]},
+        name="Welcome SMS",
+        status="draft",
+        created="2024-01-06T00:00:00Z",
+        updated="2024-02-02T00:00:00Z",
+    )
+    mock_klaviyo.add(
+        "segments",
+        id="S1",
+        name="VIP",
+        created="2024-03-10T00:00:00Z",
+        updated="2024-03-10T00:00:00Z",
+    )
+    mock_klaviyo.add(
+        "segments",
+        id="S2",
+        name="Lapsed",
+        created="2024-04-02T00:00:00Z",
+        updated="2024-04-02T00:00:00Z",
+    )
+    mock_klaviyo.add(
+        "campaigns",
+        id="C1",
+        messages={"channel": "email"},
+        name="Spring",
+        status="Sent",
+        created_at="2024-03-01T00:00:00Z",
+        updated_at="2024-03-02T00:00:00Z",
+    )
+
+
+def test_sync_and_query_locally(mock_klaviyo, mock_app):
+    _seed(mock_klaviyo)
+    replica = MetadataReplica(mock_app)
+    counts = replica.sync()
+    assert counts == {
+        "flow": 2,
+        "list": 0,
+        "segment": 2,
+        "campaign": 1,
+        "template": 0,
+        "tag": 2,
+    }
+
+    requests = len(mock_klaviyo.requests)
+    assert [
+        r["id"] for r in replica.query("flow", tag="Onboarding", status="live")
+    ] == ["F1"]
+    assert [r["id"] for r in replica.query("flow", tag="T2")] == ["F2"]
+    assert [r["id"] for r in replica.query("flow", name_contains="welcome")] == [
+        "F2",
+        "F1",
+    ]
+    assert [
+        r["id"]
+        for r in replica.query(
+            "segment", created_after="2024-03-01", created_before="2024-04-01"
+        )
+    ] == ["S1"]
+    assert replica.query("flow", name_contains="%") == []
+    assert replica.query("flow", name_contains="Welcome_") == []
+    assert replica.query("campaign", status="Sent")[0]["attributes"]["name"] == "Spring"
+    assert replica.query("flow", limit=1)[0]["tags"] == ["T1", "T2"]
+    assert len(mock_klaviyo.requests) == requests
+    with pytest.raises(ValueError):
+        replica.query("metric")
+
+
+def test_incremental_and_full_sync(mock_klaviyo, mock_app, tmp_path):
+    _seed(mock_klaviyo)
+    path = str(tmp_path / "replica.db")
+    MetadataReplica(mock_app, path=path).sync()
+
+    flow = mock_klaviyo.resources["flows"]["F1"]
+    flow["attributes"].update(status="manual", updated="2024-05-01T00:00:00Z")
+    mock_klaviyo.relationships[("flows", "F1", "tags")] = ["T2"]
+    del mock_klaviyo.resources["segments"]["S2"]
+
+    replica = MetadataReplica(mock_app, path=path)
+    counts = replica.sync(kinds=["flow", "segment"])
+    assert counts == {"flow": 2, "segment": 0}
+    filters = [
+        request.url.params.get("filter") for request in _listings(mock_klaviyo)[-2:]
+    ]
+    assert filters == [
+        "greater-than(updated,2024-02-01T23:59:59Z)",
+        "greater-than(updated,2024-04-01T23:59:59Z)",
+    ]
+    assert [r["id"] for r in replica.query("flow", tag="Promo")] == ["F1", "F2"]
+    assert replica.query("flow", status="manual")[0]["id"] == "F1"
+    assert len(replica.query("segment")) == 2
+
+    replica.sync(kinds=["segment"], full=True)
+    assert [r["id"] for r in replica.query("segment")] == ["S1"]
+
+
+def test_app_local_query_tool_syncs_once(mock_klaviyo, mock_app):
+    _seed(mock_klaviyo)
+    assert [
+        r["id"] for r in mock_app.query_local_metadata("flow", tag="Onboarding")
+    ] == ["F2", "F1"]
+    requests = len(mock_klaviyo.requests)
+    assert (
+        mock_app.query_local_metadata("segment", name_contains="vip")[0]["id"] == "S1"
+    )
+    assert len(mock_klaviyo.requests) == requests
+    assert mock_app.query_local_metadata in mock_app.list_tools()
+    with pytest.raises(ValueError):
+        mock_app.query_local_metadata("metric", refresh=True)
+    assert len(mock_klaviyo.requests) == requests
+
+    # Tag changes and deletions only show after a full re-sync.
+    mock_klaviyo.relationships[("flows", "F1", "tags")] = []
+    assert [
+        r["id"]
+        for r in mock_app.query_local_metadata("flow", tag="Onboarding", max_age=0)
+    ] == ["F2", "F1"]
+    assert [
+        r["id"]
+        for r in mock_app.query_local_metadata("flow", tag="Onboarding", refresh=True)
+    ] == ["F2"]
+    del mock_klaviyo.resources["segments"]["S1"]
+    assert (
+        mock_app.query_local_metadata("segment", name_contains="vip")[0]["id"] == "S1"
+    )
+    assert (
+        mock_app.query_local_metadata("segment", name_contains="vip", full_max_age=0)
+        == []
+    )
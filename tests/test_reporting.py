@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from universal_mcp_klaviyo.reporting import ReportingEngine, ReportTable
+
+
+@pytest.fixture
+def flow_values(mock_klaviyo):
+    mock_klaviyo.reports["flow-values-reports"] = [
+        {
+            "groupings": {"flow_id": f"F{i % 3}", "flow_message_id": f"M{i}"},
+            "statistics": {"opens": i, "recipients": 0 if i == 0 else 10},
+        }
+        for i in range(1200)
+    ]
+
+
+def test_query_paginates_and_merges(mock_klaviyo, mock_app, flow_values):
+    engine = ReportingEngine(mock_app)
+    table = engine.query(
+        "flow-values",
+        ["opens", "recipients"],
+        {"key": "last_30_days"},
+        conversion_metric_id="M1",
+    )
+
+    assert len(table) == 1200
+    assert len(mock_klaviyo.requests) == 3
+    assert np.isnan(table.ratio("opens", "recipients")[0])
+
+    per_flow = table.group_by("flow_id").with_ratio("open_rate", "opens", "recipients")
+    assert list(per_flow["flow_id"]) == ["F0", "F1", "F2"]
+    assert per_flow["opens"][1] == sum(range(1, 1200, 3))
+    assert per_flow.where(flow_id="F1")["open_rate"][0] == pytest.approx(
+        sum(range(1, 1200, 3)) / 4000
+    )
+
+    engine.query(
+        "flow-values",
+        ["opens", "recipients"],
+        {"key": "last_30_days"},
+        conversion_metric_id="M1",
+    )
+    assert len(mock_klaviyo.requests) == 3
+
+
+def test_series_table_round_trip():
+    results = [
+        {
+            "groupings": {"segment_id": "S1"},
+            "statistics": {"total_members": [1, 2, None]},
+        },
+        {"groupings": {"segment_id": "S2"}, "statistics": {"total_members": [4, 5, 6]}},
+    ]
+    table = ReportTable.from_results(results, ["d1", "d2", "d3"])
+
+    assert table["total_members"].shape == (2, 3)
+    assert table.to_records()[1] == results[1]
+    assert ReportTable.concat([table, table])["total_members"].shape == (4, 3)
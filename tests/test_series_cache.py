@@ -0,0 +1,126 @@
+import json
+from datetime import UTC, datetime, timedelta
+
+import httpx
+import pytest
+
+from universal_mcp_klaviyo.reporting import ReportingEngine
+from universal_mcp_klaviyo.series_cache import SeriesCache
+
+
+@pytest.fixture
+def timeframes(mock_klaviyo):
+    seen = []
+
+    @mock_klaviyo.route("POST", r"/api/flow-series-reports")
+    def flow_series(request, match):
+        attributes = json.loads(request.content)["data"]["attributes"]
+        start = datetime.fromisoformat(attributes["timeframe"]["start"])
+        end = datetime.fromisoformat(attributes["timeframe"]["end"])
+        seen.append((start, end))
+        date_times = []
+        while start < end:
+            date_times.append(start.isoformat())
+            start += timedelta(days=1)
+        results = [
+            {
+                "groupings": {"flow_id": flow_id},
+                "statistics": {
+                    "opens": [datetime.fromisoformat(d).day for d in date_times]
+                },
+            }
+            for flow_id in json.loads(
+                attributes["filter"][len("contains-any(flow_id,") : -1]
+            )
+        ]
+        return httpx.Response(
+            200,
+            json={
+                "data": {
+                    "type": "flow-series-report",
+                    "attributes": {"results": results, "date_times": date_times},
+                },
+                "links": {},
+            },
+        )
+
+    return seen
+
+
+def test_refresh_only_queries_open_window(mock_app, timeframes):
+    now = [datetime(2024, 3, 10, 15, tzinfo=UTC)]
+    cache = SeriesCache(ReportingEngine(mock_app), clock=lambda: now[0])
+    start = datetime(2024, 3, 1, tzinfo=UTC)
+
+    table = cache.get_series(
+        "flow-series", ["F1", "F2"], ["opens"], "daily", start, conversion_metric_id="M"
+    )
+    assert table["opens"].shape == (2, 10)
+    assert timeframes[-1][0] == start
+
+    now[0] = datetime(2024, 3, 11, 9, tzinfo=UTC)
+    table = cache.get_series(
+        "flow-series", ["F1", "F2"], ["opens"], "daily", start, conversion_metric_id="M"
+    )
+    assert timeframes[-1][0] == datetime(2024, 3, 10, tzinfo=UTC)
+    assert table["opens"].shape == (2, 11)
+    assert list(table["opens"][0]) == list(range(1, 12))
+    assert list(table["flow_id"]) == ["F1", "F2"]
+
+
+def test_earlier_start_fetches_leading_buckets(mock_app, timeframes):
+    now = datetime(2024, 3, 10, 15, tzinfo=UTC)
+    cache = SeriesCache(ReportingEngine(mock_app), clock=lambda: now)
+
+    cache.get_series(
+        "flow-series",
+        ["F1"],
+        ["opens"],
+        "daily",
+        datetime(2024, 3, 5, tzinfo=UTC),
+        conversion_metric_id="M",
+    )
+    table = cache.get_series(
+        "flow-series",
+        ["F1"],
+        ["opens"],
+        "daily",
+        datetime(2024, 3, 1, tzinfo=UTC),
+        conversion_metric_id="M",
+    )
+
+    assert timeframes[-1][0] == datetime(2024, 3, 1, tzinfo=UTC)
+    assert list(table["opens"][0]) == list(range(1, 11))
+
+    cache.get_series(
+        "flow-series",
+        ["F1"],
+        ["opens"],
+        "daily",
+        datetime(2024, 3, 3, tzinfo=UTC),
+        conversion_metric_id="M",
+    )
+    assert timeframes[-1][0] == datetime(2024, 3, 10, tzinfo=UTC)
+
+
+def test_disjoint_windows_do_not_mark_the_gap_cached(mock_app, timeframes):
+    now = datetime(2024, 3, 10, 15, tzinfo=UTC)
+    cache = SeriesCache(ReportingEngine(mock_app), clock=lambda: now)
+
+    def series(start_day, end_day):
+        return cache.get_series(
+            "flow-series",
+            ["F1"],
+            ["opens"],
+            "daily",
+            datetime(2024, 3, start_day, tzinfo=UTC),
+            datetime(2024, 3, end_day, tzinfo=UTC),
+            conversion_metric_id="M",
+        )
+
+    series(1, 3)
+    series(6, 8)
+    table = series(1, 8)
+
+    assert timeframes[-1][0] == datetime(2024, 3, 1, tzinfo=UTC)
+    assert list(table["opens"][0]) == list(range(1, 8))
@@ -0,0 +1,113 @@
+import json
+import time
+
+import httpx
+
+from universal_mcp_klaviyo.subscriptions import SubscriptionBatcher
+
+
+def _jobs(mock_klaviyo):
+    jobs = []
+    for request in mock_klaviyo.requests:
+        data = json.loads(request.content)["data"]
+        list_id = (
+            data.get("relationships", {}).get("list", {}).get("data", {}).get("id")
+        )
+        profiles = [
+            profile["attributes"].get("email")
+            or profile["attributes"].get("phone_number")
+            for profile in data["attributes"]["profiles"]["data"]
+        ]
+        jobs.append((request.url.path.rsplit("-", 2)[1], list_id, profiles))
+    return jobs
+
+
+def test_consent_changes_are_grouped_into_bulk_jobs(mock_klaviyo, mock_app):
+    batcher = SubscriptionBatcher(mock_app)
+    for i in range(1500):
+        batcher.subscribe("L1", email=f"user{i}@example.com")
+    batcher.subscribe("L2", channel="sms", phone_number="+15555550100")
+    batcher.unsubscribe("L1", email="other@example.com")
+
+    assert batcher.flush() == {
+        "operations": 1502,
+        "jobs": 4,
+        "waves": 1,
+        "failed": 0,
+        "dropped": 0,
+    }
+    jobs = _jobs(mock_klaviyo)
+    assert sorted(
+        (action, list_id, len(profiles)) for action, list_id, profiles in jobs
+    ) == [
+        ("create", "L1", 500),
+        ("create", "L1", 1000),
+        ("create", "L2", 1),
+        ("delete", "L1", 1),
+    ]
+
+
+def test_changes_collapse_to_the_final_state_per_list(mock_klaviyo, mock_app):
+    batcher = SubscriptionBatcher(mock_app, wave_delay=0.05)
+    batcher.subscribe("L1", email="a@example.com")
+    batcher.subscribe("L1", email="b@example.com")
+    batcher.unsubscribe("L1", email="A@example.com")
+    batcher.subscribe("L1", email="b@example.com")
+    batcher.subscribe("L2", email="c@example.com")
+    batcher.unsubscribe(email="c@example.com")
+
+    started = time.monotonic()
+    summary = batcher.flush()
+
+    assert summary["waves"] == 2
+    assert time.monotonic() - started >= 0.05
+    jobs = _jobs(mock_klaviyo)
+    assert sorted(jobs[:3]) == [
+        ("create", "L1", ["b@example.com"]),
+        ("create", "L2", ["c@example.com"]),
+        ("delete", "L1", ["A@example.com"]),
+    ]
+    assert jobs[3] == ("delete", None, ["c@example.com"])
+
+
+def test_failed_wave_requeues_it_and_everything_after(mock_klaviyo, mock_app):
+    @mock_klaviyo.route("POST", r"/api/profile-subscription-bulk-delete-jobs")
+    def throttle(request, match):
+        return httpx.Response(429, headers={"Retry-After": "0"}, json={"errors": []})
+
+    batcher = SubscriptionBatcher(mock_app, wave_delay=0)
+    batcher.subscribe("L1", email="a@example.com")
+    batcher.unsubscribe(email="a@example.com")
+    batcher.subscribe("L2", email="a@example.com")
+
+    assert batcher.flush() == {
+        "operations": 1,
+        "jobs": 1,
+        "waves": 2,
+        "failed": 2,
+        "dropped": 0,
+    }
+    assert [operation.action for operation in batcher._pending] == [
+        "unsubscribe",
+        "subscribe",
+    ]
+
+
+def test_rejected_operations_are_dropped(mock_klaviyo, mock_app):
+    @mock_klaviyo.route("POST", r"/api/profile-subscription-bulk-delete-jobs")
+    def reject(request, match):
+        return httpx.Response(400, json={"errors": [{"detail": "invalid"}]})
+
+    batcher = SubscriptionBatcher(mock_app, wave_delay=0)
+    batcher.subscribe("L1", email="a@example.com")
+    batcher.unsubscribe(email="a@example.com")
+    batcher.subscribe("L2", email="a@example.com")
+
+    assert batcher.flush() == {
+        "operations": 2,
+        "jobs": 2,
+        "waves": 3,
+        "failed": 0,
+        "dropped": 1,
+    }
+    assert len(batcher) == 0
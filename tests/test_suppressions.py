@@ -0,0 +1,122 @@
+import json
+
+import httpx
+import pytest
+
+from universal_mcp_klaviyo.jobs import JobPoller
+from universal_mcp_klaviyo.suppressions import SuppressionManager
+
+
+def _submitted(mock_klaviyo, path):
+    return [
+        [
+            profile["attributes"]["email"]
+            for profile in json.loads(request.content)["data"]["attributes"][
+                "profiles"
+            ]["data"]
+        ]
+        for request in mock_klaviyo.requests
+        if request.method == "POST" and request.url.path == path
+    ]
+
+
+@pytest.fixture(autouse=True)
+def instant_jobs(mock_klaviyo):
+    # Listings do not advance mock jobs, so jobs finish on their first individual read.
+    mock_klaviyo.job_polls = 0
+
+
+def _suppressed(timestamp):
+    return {
+        "email": {
+            "marketing": {
+                "suppression": {"reason": "HARD_BOUNCE", "timestamp": timestamp}
+            }
+        }
+    }
+
+
+def test_suppress_skips_known_and_duplicate_emails(mock_klaviyo, mock_app):
+    mock_klaviyo.add(
+        "profiles",
+        id="P0",
+        email="gone@example.com",
+        subscriptions=_suppressed("2024-03-01T00:00:00Z"),
+    )
+    mock_klaviyo.add(
+        "profiles",
+        id="P1",
+        email="kept@example.com",
+        subscriptions={"email": {"marketing": {}}},
+    )
+    emails = [
+        "GONE@example.com",
+        "kept@example.com",
+        *(f"user{i}@example.com" for i in range(5)),
+        "User0@example.com",
+    ]
+
+    with JobPoller(mock_app, min_interval=0.01, max_interval=0.05) as poller:
+        manager = SuppressionManager(mock_app, poller=poller, batch_size=2, tier="XL")
+        stats = manager.suppress(emails, chunk_size=4)
+        # Everything submitted above is now known to be suppressed.
+        again = manager.suppress(["user1@example.com", "new@example.com"])
+
+    batches = _submitted(mock_klaviyo, "/api/profile-suppression-bulk-create-jobs")
+    assert stats == {"submitted": 6, "skipped": 2, "jobs": 4, "failed": 0}
+    assert sorted(email for batch in batches[:4] for email in batch) == sorted(
+        ["kept@example.com", *(f"user{i}@example.com" for i in range(5))]
+    )
+    assert all(len(batch) <= 2 for batch in batches)
+    assert again == {"submitted": 1, "skipped": 1, "jobs": 1, "failed": 0}
+    filters = [
+        request.url.params.get("filter")
+        for request in mock_klaviyo.requests
+        if request.url.path == "/api/profiles"
+    ]
+    assert filters == [
+        "greater-than(subscriptions.email.marketing.suppression.timestamp,1970-01-01T00:00:00Z)"
+    ]
+
+
+def test_unsuppress_only_submits_suppressed_emails(mock_klaviyo, mock_app):
+    for i in range(3):
+        mock_klaviyo.add(
+            "profiles",
+            id=f"P{i}",
+            email=f"user{i}@example.com",
+            subscriptions=_suppressed("2024-03-01T00:00:00Z"),
+        )
+
+    with JobPoller(mock_app, min_interval=0.01, max_interval=0.05) as poller:
+        manager = SuppressionManager(mock_app, poller=poller, tier="XL")
+        stats = manager.unsuppress(
+            ["user0@example.com", "user2@example.com", "other@example.com"]
+        )
+        assert manager.unsuppress(["user0@example.com"])["submitted"] == 0
+
+    assert stats == {"submitted": 2, "skipped": 1, "jobs": 1, "failed": 0}
+    assert _submitted(mock_klaviyo, "/api/profile-suppression-bulk-delete-jobs") == [
+        ["user0@example.com", "user2@example.com"]
+    ]
+    assert list(manager._suppressed) == ["user1@example.com"]
+
+
+def test_rejected_batch_fails_only_its_emails(mock_klaviyo, mock_app):
+    @mock_klaviyo.route("POST", r"/api/(profile-suppression-bulk-create-jobs)")
+    def create(request, match):
+        if b"bad@example.com" in request.content:
+            return httpx.Response(400)
+        return mock_klaviyo._create_job(request, match)
+
+    emails = [
+        "bad@example.com",
+        "user0@example.com",
+        *(f"ok{i}@example.com" for i in range(3)),
+    ]
+    with JobPoller(mock_app, min_interval=0.01, max_interval=0.05) as poller:
+        manager = SuppressionManager(mock_app, poller=poller, batch_size=2, tier="XL")
+        stats = manager.suppress(emails)
+
+    assert stats == {"submitted": 5, "skipped": 0, "jobs": 2, "failed": 2}
+    assert sorted(manager._suppressed) == sorted(f"ok{i}@example.com" for i in range(3))
@@ -0,0 +1,59 @@
+import json
+
+from universal_mcp_klaviyo.tags import MAX_TAG_BATCH, TagPlanner
+
+
+def test_plan_computes_minimal_changes(mock_klaviyo, mock_app):
+    mock_klaviyo.relationships[("tags", "T1", "flows")] = ["F1", "F2", "F3"]
+    mock_klaviyo.relationships[("tags", "T1", "lists")] = ["L1"]
+    mock_klaviyo.relationships[("tags", "T2", "campaigns")] = ["C1"]
+
+    changes = TagPlanner(mock_app).plan(
+        {
+            "T1": {"flow": ["F2", "F3", "F4"], "list": ["L1"]},
+            "T2": {"campaign": [f"C{i}" for i in range(1, 251)], "segment": []},
+        }
+    )
+
+    summary = sorted(
+        (change.tag_id, change.kind, change.action, len(change.ids))
+        for change in changes
+    )
+    assert summary == [
+        ("T1", "flow", "add", 1),
+        ("T1", "flow", "remove", 1),
+        ("T2", "campaign", "add", 49),
+        ("T2", "campaign", "add", MAX_TAG_BATCH),
+        ("T2", "campaign", "add", MAX_TAG_BATCH),
+    ]
+    assert len(mock_klaviyo.requests) == 4
+
+
+def test_apply_updates_relationships(mock_klaviyo, mock_app):
+    mock_klaviyo.relationships[("tags", "T1", "segments")] = ["S1", "S2"]
+
+    summary = TagPlanner(mock_app).apply(
+        {"T1": {"segment": ["S2", "S3"]}, "T2": {"segment": ["S1"]}}
+    )
+
+    assert summary == {"added": 2, "removed": 1, "requests": 3}
+    assert sorted(mock_klaviyo.relationships[("tags", "T1", "segments")]) == [
+        "S2",
+        "S3",
+    ]
+    assert mock_klaviyo.relationships[("tags", "T2", "segments")] == ["S1"]
+    removal = next(
+        request for request in mock_klaviyo.requests if request.method == "DELETE"
+    )
+    assert json.loads(removal.content) == {"data": [{"type": "segment", "id": "S1"}]}
+
+
+def test_apply_without_remove_keeps_extra_tags(mock_klaviyo, mock_app):
+    mock_klaviyo.relationships[("tags", "T1", "lists")] = ["L1"]
+
+    assert TagPlanner(mock_app).apply({"T1": {"list": ["L2"]}}, remove=False) == {
+        "added": 1,
+        "removed": 0,
+        "requests": 1,
+    }
+    assert sorted(mock_klaviyo.relationships[("tags", "T1", "lists")]) == ["L1", "L2"]
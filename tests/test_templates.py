@@ -0,0 +1,100 @@
+import json
+
+import httpx
+
+from universal_mcp_klaviyo.templates import TemplateRenderCache, context_hash
+
+
+def _renders(mock_klaviyo):
+    return [
+        request
+        for request in mock_klaviyo.requests
+        if request.url.path == "/api/template-render"
+    ]
+
+
+def test_context_hash_is_canonical():
+    assert context_hash({"a": 1, "b": {"c": 2, "d": 3}}) == context_hash(
+        {"b": {"d": 3, "c": 2}, "a": 1}
+    )
+    assert context_hash(None) == context_hash({})
+    assert context_hash({"a": 1}) != context_hash({"a": 2})
+
+
+def test_render_cache_keys_on_template_version_and_context(mock_klaviyo, mock_app):
+    template = mock_klaviyo.add(
+        "templates",
+        id="T1",
+        html="<p>{{ first_name }}</p>",
+        updated="2024-01-01T00:00:00Z",
+    )
+
+    @mock_klaviyo.route("POST", r"/api/template-render")
+    def render(request, match):
+        context = json.loads(request.content)["data"]["attributes"]["context"]
+        html = template["attributes"]["html"].replace(
+            "{{ first_name }}", str(context.get("first_name"))
+        )
+        return httpx.Response(
+            201,
+            json={
+                "data": {"type": "template", "id": "T1", "attributes": {"html": html}}
+            },
+        )
+
+    cache = TemplateRenderCache(mock_app, version_ttl=0)
+    assert (
+        cache.render("T1", {"first_name": "Ann", "plan": "pro"})["data"]["attributes"][
+            "html"
+        ]
+        == "<p>Ann</p>"
+    )
+    cache.render("T1", {"plan": "pro", "first_name": "Ann"})
+    assert len(_renders(mock_klaviyo)) == 1 and cache.hits == 1
+
+    template["attributes"].update(
+        html="<h1>{{ first_name }}</h1>", updated="2024-02-01T00:00:00Z"
+    )
+    assert (
+        cache.render("T1", {"first_name": "Ann", "plan": "pro"})["data"]["attributes"][
+            "html"
+        ]
+        == "<h1>Ann</h1>"
+    )
+    assert len(_renders(mock_klaviyo)) == 2
+
+
+def test_render_many_dedupes_and_preserves_order(mock_klaviyo, mock_app):
+    mock_klaviyo.add("templates", id="T1", updated="2024-01-01T00:00:00Z")
+
+    @mock_klaviyo.route("POST", r"/api/template-render")
+    def render(request, match):
+        context = json.loads(request.content)["data"]["attributes"]["context"]
+        return httpx.Response(
+            201,
+            json={
+                "data": {
+                    "type": "template",
+                    "id": "T1",
+                    "attributes": {"text": context["name"]},
+                }
+            },
+        )
+
+    cache = TemplateRenderCache(mock_app, max_entries=2)
+    names = ["a", "b", "a", "c", "b", "a"]
+    documents = cache.render_many("T1", [{"name": name} for name in names])
+
+    assert [document["data"]["attributes"]["text"] for document in documents] == names
+    assert len(_renders(mock_klaviyo)) == 3
+    assert len(cache) == 2
+    assert (
+        len(
+            [
+                request
+                for request in mock_klaviyo.requests
+                if request.url.path == "/api/templates/T1"
+            ]
+        )
+        == 1
+    )
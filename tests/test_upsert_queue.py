@@ -0,0 +1,139 @@
+import json
+
+import httpx
+
+from universal_mcp_klaviyo.upsert_queue import ProfileUpsertQueue, merge_attributes
+
+
+def _bodies(mock_klaviyo, path):
+    return [
+        json.loads(request.content)["data"]
+        for request in mock_klaviyo.requests
+        if request.url.path == path
+    ]
+
+
+def test_merge_attributes_is_last_write_wins_per_field():
+    merged = merge_attributes(
+        {
+            "email": "a@example.com",
+            "first_name": "Ann",
+            "properties": {"plan": "free", "seats": 1},
+        },
+        {"email": "a@example.com", "first_name": "Anna", "properties": {"plan": "pro"}},
+    )
+    assert merged == {
+        "email": "a@example.com",
+        "first_name": "Anna",
+        "properties": {"plan": "pro", "seats": 1},
+    }
+
+
+def test_updates_are_coalesced_per_profile(mock_klaviyo, mock_app):
+    @mock_klaviyo.route("POST", r"/api/profile-import")
+    def upsert(request, match):
+        data = json.loads(request.content)["data"]
+        return httpx.Response(
+            200,
+            json={
+                "data": {"type": "profile", "id": data["attributes"]["email"], **data}
+            },
+        )
+
+    queue = ProfileUpsertQueue(mock_app, bulk_threshold=10)
+    queue.put({"email": "a@example.com", "first_name": "Ann"})
+    queue.put({"email": "a@example.com", "last_name": "Lee"})
+    queue.put({"email": "a@example.com", "first_name": "Anna"})
+    queue.put({"email": "b@example.com", "first_name": "Bo"})
+    assert len(queue) == 2
+
+    assert queue.flush() == {"profiles": 2, "failed": 0, "jobs": [], "dropped": []}
+    bodies = {
+        body["attributes"]["email"]: body["attributes"]
+        for body in _bodies(mock_klaviyo, "/api/profile-import")
+    }
+    assert bodies["a@example.com"] == {
+        "email": "a@example.com",
+        "first_name": "Anna",
+        "last_name": "Lee",
+    }
+    assert len(queue) == 0
+
+
+def test_updates_sharing_any_identifier_are_coalesced(mock_klaviyo, mock_app):
+    queue = ProfileUpsertQueue(mock_app)
+    queue.put({"email": "a@example.com", "first_name": "Ann"})
+    queue.put({"external_id": "X1", "last_name": "Lee"})
+    queue.put({"email": "A@Example.com", "external_id": "X1", "first_name": "Anna"})
+    queue.put({"external_id": "X1", "title": "CTO"})
+    assert len(queue) == 1
+
+    queue.flush()
+    [body] = _bodies(mock_klaviyo, "/api/profile-import")
+    assert body["attributes"] == {
+        "email": "A@Example.com",
+        "external_id": "X1",
+        "first_name": "Anna",
+        "last_name": "Lee",
+        "title": "CTO",
+    }
+
+
+def test_large_backlog_goes_through_bulk_import(mock_klaviyo, mock_app):
+    queue = ProfileUpsertQueue(mock_app, bulk_threshold=50)
+    for i in range(120):
+        queue.put({"email": f"user{i}@example.com", "properties": {"n": i}})
+
+    summary = queue.flush()
+
+    assert summary["profiles"] == 120 and len(summary["jobs"]) == 1
+    [job] = _bodies(mock_klaviyo, "/api/profile-bulk-import-jobs")
+    assert len(job["attributes"]["profiles"]["data"]) == 120
+    assert not _bodies(mock_klaviyo, "/api/profile-import")
+
+
+def test_failed_writes_are_requeued_under_newer_values(mock_klaviyo, mock_app):
+    @mock_klaviyo.route("POST", r"/api/profile-import")
+    def throttle(request, match):
+        queue.put({"email": "a@example.com", "first_name": "Newer"})
+        return httpx.Response(429, headers={"Retry-After": "0"}, json={"errors": []})
+
+    queue = ProfileUpsertQueue(mock_app)
+    queue.put({"email": "a@example.com", "first_name": "Older", "last_name": "Lee"})
+
+    assert queue.flush()["failed"] == 1
+    assert queue._pending[("email", "a@example.com")] == {
+        "email": "a@example.com",
+        "first_name": "Newer",
+        "last_name": "Lee",
+    }
+
+
+def test_rejected_and_exhausted_writes_are_dropped(mock_klaviyo, mock_app):
+    @mock_klaviyo.route("POST", r"/api/profile-import")
+    def reject(request, match):
+        email = json.loads(request.content)["data"]["attributes"]["email"]
+        if email.startswith("bad"):
+            return httpx.Response(400, json={"errors": [{"detail": "invalid"}]})
+        return httpx.Response(429, headers={"Retry-After": "0"}, json={"errors": []})
+
+    queue = ProfileUpsertQueue(mock_app, max_attempts=2)
+    queue.put({"email": "bad@example.com"})
+    queue.put({"email": "busy@example.com"})
+
+    summary = queue.flush()
+    assert (summary["failed"], summary["dropped"]) == (
+        2,
+        [("email", "bad@example.com")],
+    )
+    assert list(queue._pending) == [("email", "busy@example.com")]
+    queue.put({"email": "busy@example.com", "first_name": "Bo"})
+    assert queue.flush()["dropped"] == [("email", "busy@example.com")]
+    assert len(queue) == 0
+
+
+def test_background_thread_flushes_on_interval(mock_klaviyo, mock_app):
+    with ProfileUpsertQueue(mock_app, flush_interval=0.01, bulk_threshold=1) as queue:
+        queue.put({"external_id": "X1", "first_name": "Ann"})
+    assert len(queue) == 0
+    assert len(_bodies(mock_klaviyo, "/api/profile-bulk-import-jobs")) == 1
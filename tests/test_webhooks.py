@@ -0,0 +1,265 @@
+import asyncio
+import json
+import time
+
+from universal_mcp_klaviyo.webhooks import MAX_BODY_SIZE, WebhookReceiver, sign
+
+SECRET = "shh"
+
+
+def _headers(body: bytes, secret: str = SECRET) -> dict[str, str]:
+    timestamp = str(int(time.time()))
+    return {
+        "Klaviyo-Signature": sign(secret, body, timestamp),
+        "Klaviyo-Timestamp": timestamp,
+    }
+
+
+def _delivery(*ids: str) -> bytes:
+    return json.dumps(
+        {
+            "data": [
+                {
+                    "id": id,
+                    "type": "event",
+                    "attributes": {"topic": "event:klaviyo.opened_email"},
+                }
+                for id in ids
+            ]
+        }
+    ).encode()
+
+
+def test_receive_verifies_dedupes_and_batches():
+    batches = []
+
+    async def scenario():
+        receiver = WebhookReceiver(
+            SECRET, batches.append, batch_size=3, batch_interval=0.01, max_queue=5
+        )
+        await receiver.start(serve=False)
+        body = _delivery("E1", "E2")
+        assert await receiver.receive(body, _headers(body)) == 202
+        assert await receiver.receive(body, _headers(body)) == 202
+        assert await receiver.receive(body, _headers(body, secret="wrong")) == 401
+        assert (
+            await receiver.receive(
+                body,
+                {
+                    "Klaviyo-Signature": sign(SECRET, body, "1"),
+                    "Klaviyo-Timestamp": "1",
+                },
+            )
+            == 401
+        )
+        body = _delivery("E3", "E3", "E4", "E5", "E6", "E7")
+        assert await receiver.receive(body, _headers(body)) == 503
+        body = _delivery("E3", "E4", "E5")
+        assert await receiver.receive(body, _headers(body)) == 202
+        assert await receiver.receive(b"{", _headers(b"{")) == 400
+        await receiver.stop()
+        return receiver.stats
+
+    stats = asyncio.run(scenario())
+
+    assert [[event["id"] for event in batch] for batch in batches] == [
+        ["E1", "E2", "E3"],
+        ["E4", "E5"],
+    ]
+    assert stats == {
+        "received": 5,
+        "duplicates": 3,
+        "rejected": 2,
+        "malformed": 1,
+        "dispatched": 5,
+        "failed": 0,
+    }
+
+
+def test_dropped_batches_are_accepted_again():
+    calls = []
+
+    def flaky(batch):
+        calls.append([event["id"] for event in batch])
+        if len(calls) == 1:
+            raise RuntimeError("downstream unavailable")
+
+    async def scenario():
+        receiver = WebhookReceiver(SECRET, flaky, batch_interval=0.01, max_attempts=1)
+        await receiver.start(serve=False)
+        body = _delivery("E1")
+        assert await receiver.receive(body, _headers(body)) == 202
+        for _ in range(100):
+            if calls:
+                break
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.01)
+        # Klaviyo redelivers the dropped event; once handled it is a duplicate.
+        assert await receiver.receive(body, _headers(body)) == 202
+        await receiver.stop()
+        assert await receiver.receive(body, _headers(body)) == 202
+        return receiver.stats
+
+    stats = asyncio.run(scenario())
+
+    assert calls == [["E1"], ["E1"]]
+    assert (
+        stats["failed"] == 1 and stats["dispatched"] == 1 and stats["duplicates"] == 1
+    )
+
+
+def test_spooled_events_survive_restart(tmp_path):
+    handled = []
+
+    async def failing(batch):
+        raise RuntimeError("downstream unavailable")
+
+    async def scenario():
+        receiver = WebhookReceiver(
+            SECRET, failing, spool_path=str(tmp_path / "spool.db"), batch_interval=10
+        )
+        await receiver.start(serve=False)
+        body = _delivery("E1", "E2")
+        assert await receiver.receive(body, _headers(body)) == 202
+        await receiver.stop()
+
+        async def collect(batch):
+            handled.extend(event["id"] for event in batch)
+
+        receiver = WebhookReceiver(
+            SECRET, collect, spool_path=str(tmp_path / "spool.db"), batch_interval=0.01
+        )
+        await receiver.start(serve=False)
+        assert await receiver.receive(body, _headers(body)) == 202
+        for _ in range(100):
+            if handled:
+                break
+            await asyncio.sleep(0.01)
+        await receiver.stop()
+
+    asyncio.run(scenario())
+
+    assert handled == ["E1", "E2"]
+
+
+def test_http_round_trip():
+    batches = []
+
+    async def scenario():
+        async with WebhookReceiver(
+            SECRET, batches.append, path="/klaviyo", batch_interval=0.01
+        ) as receiver:
+            reader, writer = await asyncio.open_connection(receiver.host, receiver.port)
+            statuses = []
+            for path, body in [
+                ("/klaviyo", _delivery("E1")),
+                ("/other", _delivery("E2")),
+            ]:
+                head = "".join(
+                    f"{key}: {value}\r\n" for key, value in _headers(body).items()
+                )
+                writer.write(
+                    f"POST {path} HTTP/1.1\r\nHost: localhost\r\n"
+                    f"Content-Length: {len(body)}\r\n{head}\r\n".encode()
+                    + body
+                )
+                await writer.drain()
+                statuses.append((await reader.readuntil(b"\r\n\r\n")).split(b" ", 2)[1])
+            writer.close()
+            return statuses
+
+    assert asyncio.run(scenario()) == [b"202", b"404"]
+    assert batches == [
+        [
+            {
+                "id": "E1",
+                "type": "event",
+                "attributes": {"topic": "event:klaviyo.opened_email"},
+            }
+        ]
+    ]
+
+
+def test_http_chunked_and_malformed_requests():
+    batches = []
+
+    async def scenario():
+        async with WebhookReceiver(
+            SECRET, batches.append, batch_interval=0.01
+        ) as receiver:
+            reader, writer = await asyncio.open_connection(receiver.host, receiver.port)
+            body = _delivery("E1")
+            head = "".join(
+                f"{key}: {value}\r\n" for key, value in _headers(body).items()
+            )
+            chunks = (
+                b"".join(
+                    b"%x\r\n%s\r\n" % (len(part), part)
+                    for part in (body[:10], body[10:])
+                )
+                + b"0\r\n\r\n"
+            )
+            writer.write(
+                b"POST / HTTP/1.1\r\nHost: localhost\r\nTransfer-Encoding: chunked\r\n"
+                + f"{head}\r\n".encode()
+                + chunks
+            )
+            await writer.drain()
+            statuses = [(await reader.readuntil(b"\r\n\r\n")).split(b" ", 2)[1]]
+            writer.write(
+                b"POST / HTTP/1.1\r\nHost: localhost\r\n"
+                b"Transfer-Encoding: chunked\r\n\r\nzz\r\n"
+            )
+            await writer.drain()
+            statuses.append((await reader.readuntil(b"\r\n\r\n")).split(b" ", 2)[1])
+            await reader.read()
+            assert reader.at_eof()
+            writer.close()
+            return statuses
+
+    assert asyncio.run(scenario()) == [b"202", b"400"]
+    assert batches == [
+        [
+            {
+                "id": "E1",
+                "type": "event",
+                "attributes": {"topic": "event:klaviyo.opened_email"},
+            }
+        ]
+    ]
+
+
+def test_http_limits_and_timeouts():
+    async def status(receiver, request):
+        reader, writer = await asyncio.open_connection(receiver.host, receiver.port)
+        writer.write(request)
+        await writer.drain()
+        line = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), 5)
+        return line.split(b" ", 2)[1], reader, writer
+
+    async def scenario():
+        async with WebhookReceiver(SECRET, [].append, read_timeout=0.2) as receiver:
+            head = b"POST / HTTP/1.1\r\nHost: localhost\r\n"
+            oversized = head + b"Content-Length: %d\r\n\r\n" % (MAX_BODY_SIZE + 1)
+            slow_body = head + b"Content-Length: 10\r\n\r\n{}"
+            # A head still incomplete past the limit is refused.
+            big_head = head + b"X-Padding: " + b"x" * (20 << 10)
+            statuses = []
+            for request in (oversized, slow_body, big_head):
+                code, _, writer = await status(receiver, request)
+                statuses.append(code)
+                writer.close()
+            body = _delivery("E1")
+            headers = "".join(f"{k}: {v}\r\n" for k, v in _headers(body).items())
+            code, reader, writer = await status(
+                receiver,
+                head + f"Content-Length: {len(body)}\r\n{headers}\r\n".encode() + body,
+            )
+            statuses.append(code)
+            # The idle keep-alive connection is closed by the server.
+            await asyncio.wait_for(reader.read(), 5)
+            assert reader.at_eof()
+            writer.close()
+            return statuses
+
+    assert asyncio.run(scenario()) == [b"413", b"408", b"400", b"202"]